@@ -0,0 +1,306 @@
+"""
+Single entry point for running agents.
+
+All agent calls go through run_agent() or streamed_agent_run(), which wait for
+admission from the shared LLM limiter (see llm_limiter.py) before calling the
+Agents SDK.
+
+Every call has a deadline taken from the latency budget of the endpoint it
+serves. The budget covers queueing for a slot, the call itself and any retries;
+once it is spent the call is cancelled and LLMDeadlineExceeded is raised.
+Transient provider errors (connection errors, timeouts, 5xx and 429 responses)
+are retried with full-jitter exponential backoff while the budget allows. When
+hedging is enabled, a call still running after the agent's recent p95 latency
+gets a second, identical request, and whichever answers first is used.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import openai
+from agents import Agent, RunConfig, Runner, custom_span
+from agents.result import RunResult, RunResultStreaming
+from agents.stream_events import StreamEvent
+from agents.tracing import SpanError
+
+import metrics
+import tracing
+from event_log import log_event
+from latency_stats import LatencyTracker
+from llm_limiter import llm_limiter, LLMOverloaded, Priority
+
+# "openai", or "mock" for the local stand-in in mock_llm.py (load tests without network or cost)
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'openai').lower()
+if LLM_BACKEND == "mock":
+    from mock_llm import MockModelProvider
+    RUN_CONFIG: Optional[RunConfig] = RunConfig(model_provider=MockModelProvider.from_env())
+else:
+    RUN_CONFIG = None
+
+# Latency budgets in seconds per endpoint, covering queueing, the call and its retries
+LATENCY_BUDGETS: Dict[str, float] = {
+    "answer": float(os.environ.get('LLM_BUDGET_ANSWER', '30')),
+    "stream": float(os.environ.get('LLM_BUDGET_STREAM', '45')),
+    "end": float(os.environ.get('LLM_BUDGET_END', '60')),
+    "background": float(os.environ.get('LLM_BUDGET_BACKGROUND', '90')),
+    "batch": float(os.environ.get('LLM_BUDGET_BATCH', '120'))
+}
+
+# Budget used when the caller does not pass a deadline
+PRIORITY_BUDGETS = {
+    Priority.VOICE: "answer",
+    Priority.INTERACTIVE: "answer",
+    Priority.FINAL: "end",
+    Priority.BACKGROUND: "background",
+    Priority.BATCH: "batch"
+}
+
+# Retry settings for transient errors
+MAX_ATTEMPTS = int(os.environ.get('LLM_MAX_ATTEMPTS', '3'))
+RETRY_BASE_DELAY = float(os.environ.get('LLM_RETRY_BASE_DELAY', '0.5'))
+RETRY_MAX_DELAY = float(os.environ.get('LLM_RETRY_MAX_DELAY', '8'))
+
+# Hedged requests: off by default, since a hedge costs a second call
+HEDGING_ENABLED = os.environ.get('LLM_HEDGING', 'false').lower() == 'true'
+HEDGE_PERCENTILE = float(os.environ.get('LLM_HEDGE_PERCENTILE', '0.95'))
+HEDGE_MIN_DELAY = float(os.environ.get('LLM_HEDGE_MIN_DELAY', '1'))
+# Recent calls needed before an agent's percentile is trusted
+HEDGE_MIN_SAMPLES = 20
+
+# Recent call latencies per agent and model (time holding a slot, excluding queueing)
+call_latencies = LatencyTracker()
+
+def latency_key(agent: Agent) -> str:
+    """Key of an agent's latencies in call_latencies, e.g. "EvaluatorAgent/gpt-4o-mini"."""
+    return f"{agent.name}/{agent.model}"
+
+class LLMDeadlineExceeded(LLMOverloaded):
+    """Raised when an LLM call does not finish within its latency budget."""
+
+def deadline_for(endpoint: str) -> float:
+    """
+    Return the absolute deadline (time.monotonic() based) for a call made now.
+
+    Args:
+        endpoint: Key of the latency budget in LATENCY_BUDGETS
+
+    Returns:
+        The deadline
+    """
+    return time.monotonic() + LATENCY_BUDGETS[endpoint]
+
+def resolve_deadline(deadline: Optional[float], priority: Priority) -> float:
+    """Return the given deadline, or the default deadline for the call's priority."""
+    return deadline_for(PRIORITY_BUDGETS[priority]) if deadline is None else deadline
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an error is worth retrying: connection problems, timeouts, 5xx responses and 429s."""
+    if isinstance(error, LLMOverloaded):
+        return error.retryable
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return status_code is not None and (status_code in (408, 409) or status_code >= 500)
+
+def retry_delay(attempt: int, error: BaseException) -> float:
+    """Full-jitter exponential backoff, but at least the provider's Retry-After for a 429."""
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+    if isinstance(error, LLMOverloaded):
+        delay = max(delay, error.retry_after)
+    return delay
+
+async def _attempt(agent: Agent, prompt: str, priority: Priority, key: str, deadline: float) -> RunResult:
+    """Make one call within the deadline and record its latency."""
+    try:
+        async with llm_limiter.slot(priority, key, deadline - time.monotonic()):
+            started = time.monotonic()
+            try:
+                result = await asyncio.wait_for(
+                    Runner.run(agent, input=prompt, run_config=RUN_CONFIG), max(deadline - started, 0.0)
+                )
+            except BaseException as e:
+                # Includes cancellation, e.g. of the slower request of a hedged pair
+                metrics.observe_llm_call(agent.name, str(agent.model), time.monotonic() - started, type(e).__name__)
+                raise
+            seconds = time.monotonic() - started
+            call_latencies.record(latency_key(agent), seconds)
+            metrics.observe_llm_call(agent.name, str(agent.model), seconds, "ok", result.context_wrapper.usage)
+            return result
+    except asyncio.TimeoutError as e:
+        raise LLMDeadlineExceeded(f"{agent.name} did not respond within its latency budget") from e
+
+def _hedge_delay(agent: Agent, deadline: float) -> Optional[float]:
+    """Seconds after which a second request is sent, or None if this call should not be hedged."""
+    if not HEDGING_ENABLED:
+        return None
+    threshold = call_latencies.percentile(latency_key(agent), HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES)
+    if threshold is None:
+        return None
+    threshold = max(threshold, HEDGE_MIN_DELAY)
+    return threshold if time.monotonic() + threshold < deadline else None
+
+async def _hedged_attempt(
+    agent: Agent,
+    prompt: str,
+    priority: Priority,
+    key: str,
+    deadline: float,
+    span_data: Dict
+) -> RunResult:
+    """Make one call, adding a hedge request if it runs past the agent's recent p95."""
+    hedge_after = _hedge_delay(agent, deadline)
+    if hedge_after is None:
+        return await _attempt(agent, prompt, priority, key, deadline)
+
+    tasks = [asyncio.ensure_future(_attempt(agent, prompt, priority, key, deadline))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        # Do not add load while other calls are already waiting for a slot
+        if done or llm_limiter.queue_depth:
+            return await tasks[0]
+
+        span_data["hedged"] = True
+        tasks.append(asyncio.ensure_future(_attempt(agent, prompt, priority, key, deadline)))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    span_data["hedge_won"] = task is tasks[1]
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def run_agent(
+    agent: Agent,
+    prompt: str,
+    priority: Priority = Priority.INTERACTIVE,
+    key: str = "",
+    deadline: Optional[float] = None
+) -> RunResult:
+    """
+    Run an agent to completion once the limiter admits the call, retrying transient errors.
+
+    Args:
+        agent: The agent to run
+        prompt: The input prompt
+        priority: Queueing priority of the call
+        key: Fairness key, usually the session ID
+        deadline: Absolute time.monotonic() deadline; defaults to the budget of the priority
+
+    Returns:
+        The run result
+
+    Raises:
+        LLMDeadlineExceeded: If the call did not finish within its deadline
+        LLMOverloaded: If the call was rate limited or could not be admitted in time
+    """
+    deadline = resolve_deadline(deadline, priority)
+    span_data = {
+        "agent": agent.name,
+        "model": str(agent.model),
+        "priority": priority.name.lower(),
+        "budget_seconds": round(deadline - time.monotonic(), 3),
+        "attempts": 0,
+        "hedged": False
+    }
+    with custom_span("llm_call", data=span_data) as span, tracing.span("llm_call") as call_span:
+        try:
+            while True:
+                span_data["attempts"] += 1
+                try:
+                    result = await _hedged_attempt(agent, prompt, priority, key, deadline, span_data)
+                    span_data["outcome"] = "ok"
+                    return result
+                except Exception as e:
+                    delay = retry_delay(span_data["attempts"], e)
+                    retry = (
+                        is_transient_error(e)
+                        and span_data["attempts"] < MAX_ATTEMPTS
+                        and time.monotonic() + delay < deadline
+                    )
+                    if not retry:
+                        span_data["outcome"] = "deadline_exceeded" if isinstance(e, LLMDeadlineExceeded) else type(e).__name__
+                        span.set_error(SpanError(message=str(e) or type(e).__name__, data={"attempts": span_data["attempts"]}))
+                        raise
+                    log_event(
+                        "llm_call_retry", level=logging.WARNING, agent=agent.name, delay=round(delay, 3),
+                        error=type(e).__name__, attempt=span_data["attempts"]
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            # The SDK span's data doubles as the attributes of the sampled trace span
+            for name, value in span_data.items():
+                call_span.set_attribute(name, value)
+
+@asynccontextmanager
+async def streamed_agent_run(
+    agent: Agent,
+    prompt: str,
+    priority: Priority = Priority.INTERACTIVE,
+    key: str = "",
+    deadline: Optional[float] = None
+) -> AsyncIterator[RunResultStreaming]:
+    """
+    Start a streamed agent run once the limiter admits the call.
+
+    The limiter slot is held until the block exits, so consume the stream
+    inside the block, through stream_events() so the deadline is enforced.
+    Streamed runs are not retried or hedged, since part of the answer may
+    already have reached the client.
+
+    Raises:
+        LLMOverloaded: If the call was rate limited or could not be admitted in time
+    """
+    deadline = resolve_deadline(deadline, priority)
+    span_data = {"agent": agent.name, "model": str(agent.model), "priority": priority.name.lower()}
+    with custom_span("llm_stream", data=span_data), tracing.span("llm_stream", **span_data) as stream_span:
+        async with llm_limiter.slot(priority, key, deadline - time.monotonic()):
+            started = time.monotonic()
+            result = Runner.run_streamed(agent, input=prompt, run_config=RUN_CONFIG)
+            outcome = "ok"
+            try:
+                yield result
+            except BaseException as e:
+                outcome = type(e).__name__
+                raise
+            finally:
+                if not result.is_complete:
+                    result.cancel()
+                    if outcome == "ok":
+                        outcome = "incomplete"
+                stream_span.set_attribute("outcome", outcome)
+                metrics.observe_llm_call(
+                    agent.name, str(agent.model), time.monotonic() - started, outcome, result.context_wrapper.usage
+                )
+
+async def stream_events(result: RunResultStreaming, deadline: float) -> AsyncIterator[StreamEvent]:
+    """
+    Iterate over a streamed run's events, cancelling the run at the deadline.
+
+    Raises:
+        LLMDeadlineExceeded: If the run has not finished by the deadline
+    """
+    events = result.stream_events()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(events.__anext__(), max(deadline - time.monotonic(), 0.0))
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError as e:
+                result.cancel()
+                raise LLMDeadlineExceeded("The streamed response did not finish within its latency budget") from e
+            yield event
+    finally:
+        await events.aclose()
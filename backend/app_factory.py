@@ -0,0 +1,143 @@
+"""
+Application factory for the interview API.
+
+create_app() builds the Flask app without the expensive parts: it loads .env,
+sets up CORS, the /metrics endpoint and request tracing, and registers the API
+routes as lazy views. The views, and with them the Agents SDK and the agents
+(interview_api.py), are imported on the first request that needs them or ahead
+of time by warm_up(), so importing the app, and booting a gunicorn worker, no
+longer waits for them. The AgentOps exporter is likewise initialized on the
+trace export thread (see tracing.py) instead of at import.
+
+app.py and app_with_voice.py are the same app with voice interviews off and on.
+APP_WARM_UP chooses when the views are loaded:
+- "lazy" (the default): on the first API request
+- "background": in a thread started by create_app(); not for apps created in a
+  gunicorn master before forking (--preload), use "eager" there
+- "eager": in create_app(), as importing the app used to; gunicorn.conf.py
+  uses it when the app is preloaded in the master, so the workers share it
+"""
+
+import os
+import sys
+import threading
+import importlib
+from types import ModuleType
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+from flask import Flask
+from flask_cors import CORS
+
+VIEWS_MODULE = "interview_api"
+
+# (rule, view function in VIEWS_MODULE, methods)
+ROUTES = (
+    ('/api/companies', 'get_companies', ['GET']),
+    ('/api/start', 'start', ['POST']),
+    ('/api/answer', 'answer', ['POST']),
+    ('/api/answer/stream', 'answer_stream', ['POST']),
+    ('/api/evaluation/<session_id>/<int:question_number>', 'get_evaluation', ['GET']),
+    ('/api/end', 'end', ['POST']),
+    ('/api/evaluate/batch', 'evaluate_batch_answers', ['POST']),
+    ('/api/sessions/stats', 'get_session_stats', ['GET']),
+    ('/api/context/stats', 'get_context_stats', ['GET']),
+    ('/api/tokens/stats', 'get_token_stats', ['GET']),
+    ('/api/tracing/stats', 'get_tracing_stats', ['GET']),
+    ('/api/llm/stats', 'get_llm_stats', ['GET']),
+    ('/api/cache/stats', 'get_cache_stats', ['GET'])
+)
+
+VOICE_ROUTES = (
+    ('/api/voice/convert', 'convert_voice', ['POST']),
+)
+
+WARM_UP_MODES = ("lazy", "background", "eager")
+
+def load_views() -> ModuleType:
+    """Import the API views (a no-op once loaded; concurrent callers wait for the first)."""
+    return importlib.import_module(VIEWS_MODULE)
+
+def _load_all() -> None:
+    load_views()
+    # Every company's question bank, with its evaluation prompts compiled
+    from question_registry import registry
+    registry.preload()
+
+def warm_up(background: bool = False) -> None:
+    """
+    Load the views and the question banks ahead of the first request.
+
+    Args:
+        background: Load them in a daemon thread and return at once, e.g. from a
+            gunicorn post_worker_init hook, so the worker starts serving while they
+            load; requests that need the views wait for the import to finish
+    """
+    if background:
+        threading.Thread(target=_load_all, name="app-warm-up", daemon=True).start()
+    else:
+        _load_all()
+
+class LazyView:
+    """View function that loads the views module on its first call (Flask's lazy loading pattern)."""
+
+    def __init__(self, name: str):
+        self.__name__ = name
+        self.view = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self.view is None:
+            self.view = getattr(load_views(), self.__name__)
+        return self.view(*args, **kwargs)
+
+def active_sessions() -> int:
+    """Sessions in the session store, or 0 before the views (which create the store) are loaded."""
+    sessions = getattr(sys.modules.get(VIEWS_MODULE), "sessions", None)
+    return sessions.stats()["sessions"] if sessions is not None else 0
+
+def create_app(voice: Optional[bool] = None, warm_up_mode: Optional[str] = None) -> Flask:
+    """
+    Create the interview API app.
+
+    Args:
+        voice: Enable voice interviews: the is_voice_mode option of /api/start and
+            /api/voice/convert (defaults to VOICE_INTERVIEWS, true unless set otherwise)
+        warm_up_mode: When to load the views: "lazy", "background" or "eager"
+            (defaults to APP_WARM_UP, "lazy" unless set otherwise)
+
+    Returns:
+        The Flask app
+    """
+    # Settings in .env apply to the modules imported from here on
+    load_dotenv()
+    import metrics
+    import tracing
+
+    if voice is None:
+        voice = os.environ.get('VOICE_INTERVIEWS', 'true').lower() in ('1', 'true', 'yes')
+    warm_up_mode = (warm_up_mode or os.environ.get('APP_WARM_UP', 'lazy')).lower()
+    if warm_up_mode not in WARM_UP_MODES:
+        raise ValueError(f"Unknown warm-up mode {warm_up_mode!r} (expected one of {', '.join(WARM_UP_MODES)})")
+
+    # Set up the trace exporter (AgentOps by default); AgentOps itself starts with the first export
+    tracing.configure()
+
+    app = Flask(__name__)
+    app.secret_key = os.environ.get('SECRET_KEY', 'mock_interview_secret_key')
+    app.config["VOICE_INTERVIEWS"] = voice
+
+    # Enable CORS for all routes to allow React to communicate with the API
+    CORS(app, resources={r"/*": {"origins": "*"}})
+
+    # Request timing and the /metrics endpoint
+    metrics.init_app(app, active_sessions=active_sessions)
+
+    # Every request is the root of a (sampled) trace
+    tracing.init_app(app)
+
+    for rule, name, methods in ROUTES + (VOICE_ROUTES if voice else ()):
+        app.add_url_rule(rule, name, LazyView(name), methods=methods)
+
+    if warm_up_mode != "lazy":
+        warm_up(background=warm_up_mode == "background")
+    return app
@@ -0,0 +1,162 @@
+"""
+Shared asyncio runtime for the Flask backend.
+
+Flask handlers are synchronous, so agent coroutines are submitted to a single
+long-lived event loop running on a background thread instead of creating a new
+loop with asyncio.run() on every request. The OpenAI client used by the Agents
+SDK is created on that loop with a pooled, keep-alive HTTP client, so
+connections and TLS sessions are reused across requests.
+"""
+
+import os
+import queue
+import asyncio
+import logging
+import threading
+import concurrent.futures
+from typing import Any, AsyncIterator, Awaitable, Iterator, Optional
+
+from event_log import log_event
+
+# Connection pool settings for the shared OpenAI HTTP client
+MAX_CONNECTIONS = int(os.environ.get('OPENAI_MAX_CONNECTIONS', '100'))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '20'))
+KEEPALIVE_EXPIRY = float(os.environ.get('OPENAI_KEEPALIVE_EXPIRY', '60'))
+# Retries are done by agent_runner within each call's latency budget, not by the client
+OPENAI_MAX_RETRIES = int(os.environ.get('OPENAI_MAX_RETRIES', '0'))
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_owner_pid: Optional[int] = None
+
+def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+    """Thread target that runs the shared event loop forever."""
+    asyncio.set_event_loop(loop)
+    loop.call_soon(ready.set)
+    loop.run_forever()
+
+async def _configure_openai_client() -> None:
+    """Create one pooled AsyncOpenAI client on the shared loop and hand it to the Agents SDK."""
+    if os.environ.get('LLM_BACKEND', 'openai').lower() == 'mock':
+        # The local stand-in makes no HTTP calls (see mock_llm.py)
+        return
+    try:
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+        from agents import set_default_openai_client
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            )
+        )
+        set_default_openai_client(AsyncOpenAI(http_client=http_client, max_retries=OPENAI_MAX_RETRIES))
+    except Exception as e:
+        # Fall back to the SDK's own client (e.g. when no API key is configured yet)
+        log_event("openai_client_setup_failed", level=logging.WARNING, error=str(e))
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared event loop, starting its background thread on first use.
+
+    The loop is recreated after a fork (e.g. gunicorn workers), since threads
+    do not survive into the child process.
+
+    Returns:
+        The running background event loop
+    """
+    global _loop, _thread, _owner_pid
+    pid = os.getpid()
+    if _loop is not None and _owner_pid == pid:
+        return _loop
+
+    with _lock:
+        if _loop is None or _owner_pid != pid:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            thread = threading.Thread(
+                target=_run_loop, args=(loop, ready), name="agent-event-loop", daemon=True
+            )
+            thread.start()
+            ready.wait()
+            asyncio.run_coroutine_threadsafe(_configure_openai_client(), loop).result()
+            _loop, _thread, _owner_pid = loop, thread, pid
+    return _loop
+
+def submit(coro: Awaitable[Any]) -> "concurrent.futures.Future[Any]":
+    """
+    Schedule a coroutine on the shared loop without waiting for it.
+
+    Args:
+        coro: The coroutine to run
+
+    Returns:
+        A thread-safe future for the coroutine's result
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the shared loop and block the calling thread until it finishes.
+
+    This is the drop-in replacement for asyncio.run() in synchronous Flask handlers.
+
+    Args:
+        coro: The coroutine to run
+        timeout: Optional number of seconds to wait for the result
+
+    Returns:
+        The coroutine's result
+    """
+    if threading.current_thread() is _thread:
+        raise RuntimeError("run_async() would deadlock when called from the shared loop thread")
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+_STREAM_END = object()
+
+def iterate_async(agen: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    Consume an async iterator on the shared loop from a synchronous generator.
+
+    Items are handed over through a thread-safe queue as soon as they are
+    produced, which lets Flask stream responses (e.g. Server-Sent Events)
+    produced by agent coroutines. If the consumer stops early (client
+    disconnect), the producing coroutine is cancelled.
+
+    Args:
+        agen: The async iterator to consume
+
+    Yields:
+        Each item produced by the async iterator
+    """
+    items: "queue.Queue[Any]" = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except BaseException as e:
+            items.put(e)
+            raise
+        finally:
+            items.put(_STREAM_END)
+
+    future = submit(pump())
+    try:
+        while True:
+            item = items.get()
+            if item is _STREAM_END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        future.cancel()
@@ -0,0 +1,342 @@
+"""
+Offline bulk grading of archived interview transcripts.
+
+Re-grades a JSONL file of transcripts (for example after rubric changes in the
+question bank data files) with the same evaluate_answer() and
+generate_final_feedback() used by the API, without going through HTTP.
+
+Each input line holds one transcript:
+
+    {"id": "...", "company": "Google", "interview_type": "Technical",
+     "transcript": {"roles": "ICI...", "texts": [...]}}
+
+A "history" list of {"role": "agent" | "candidate", "text": ...} entries (the
+previous session format) is accepted instead of "transcript". Every candidate
+turn is graded against the interviewer turn before it, in order, so each
+evaluation sees the re-graded evaluations of the earlier answers.
+
+Results are appended to the output file as each transcript finishes, and the
+output doubles as the checkpoint: rerunning the same command skips transcripts
+that already have a successful result, so an interrupted job resumes where it
+stopped. When a transcript appears more than once, its last line wins.
+
+Usage:
+    python batch_grader.py transcripts.jsonl -o grades.jsonl [--concurrency 16]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import tracing
+from async_runtime import run_async
+from latency_stats import summarize_latencies
+from question_registry import registry
+from llm_limiter import Priority
+from evaluation_configs import default_evaluation_prompt
+from transcript import Role, Transcript, new_transcript
+from interview_api import EvaluationInput, FinalFeedbackInput, evaluate_answer, generate_final_feedback
+
+# How often progress is reported while grading
+PROGRESS_INTERVAL = 10.0
+
+def load_transcript(record: Dict[str, Any]) -> Transcript:
+    """Read a record's transcript from either the compact or the previous history format."""
+    if "transcript" in record:
+        return Transcript({"roles": record["transcript"]["roles"], "texts": list(record["transcript"]["texts"])})
+
+    history = Transcript(new_transcript())
+    for item in record.get("history", []):
+        if item.get("pending"):
+            continue
+        history.append(Role.CANDIDATE if item["role"] == "candidate" else Role.INTERVIEWER, item["text"])
+    return history
+
+def extract_answers(record: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """
+    Pair each candidate answer with the question it was given for.
+
+    Returns:
+        List of (question, evaluation prompt, answer) tuples in interview order
+    """
+    company = record["company"]
+    interview_type = record.get("interview_type", "General")
+
+    history = load_transcript(record)
+    answers = []
+    for position in range(1, len(history)):
+        if history.role(position) is Role.CANDIDATE and history.role(position - 1) is Role.INTERVIEWER:
+            question = history.text(position - 1)
+            evaluation_prompt = registry.get_evaluation_prompt(company, interview_type, question) or default_evaluation_prompt
+            answers.append((question, evaluation_prompt, history.text(position)))
+    return answers
+
+class BatchStats:
+    """Counters and latency samples for one grading run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.graded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.evaluations = 0
+        self.transcript_latencies: List[float] = []
+        self.evaluation_latencies: List[float] = []
+        self.feedback_latencies: List[float] = []
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "graded": self.graded,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "evaluations": self.evaluations,
+            "elapsed_seconds": elapsed,
+            "transcripts_per_second": (self.graded + self.failed) / elapsed if elapsed else 0.0,
+            "evaluations_per_second": self.evaluations / elapsed if elapsed else 0.0,
+            "transcript_latency": summarize_latencies(self.transcript_latencies),
+            "evaluation_latency": summarize_latencies(self.evaluation_latencies),
+            "feedback_latency": summarize_latencies(self.feedback_latencies)
+        }
+
+async def grade_record(record: Dict[str, Any], stats: BatchStats, with_feedback: bool, bypass_cache: bool) -> Dict[str, Any]:
+    """
+    Re-grade every answer of one transcript and, optionally, its final feedback.
+
+    Returns:
+        The result line for the transcript
+    """
+    started = time.perf_counter()
+    company = registry.canonical_company(record["company"]) or record["company"]
+    interview_type = record.get("interview_type", "General")
+
+    history = Transcript(new_transcript())
+    evaluations = []
+    for number, (question, evaluation_prompt, answer) in enumerate(extract_answers(record), 1):
+        history.append(Role.INTERVIEWER, question)
+        history.append(Role.CANDIDATE, answer)
+
+        call_started = time.perf_counter()
+        evaluation = await evaluate_answer(EvaluationInput(
+            candidate_answer=answer,
+            evaluation_prompt=evaluation_prompt,
+            conversation_history=history,
+            company=company,
+            interview_type=interview_type,
+            question=question,
+            bypass_cache=bypass_cache
+        ), Priority.BATCH, record["id"])
+        stats.evaluation_latencies.append(time.perf_counter() - call_started)
+        stats.evaluations += 1
+
+        history.append(Role.INTERVIEWER, evaluation.evaluation)
+        evaluations.append({
+            "question_number": number,
+            "question": question,
+            "evaluation": evaluation.evaluation,
+            "follow_up_questions": evaluation.follow_up_questions or []
+        })
+
+    final_feedback = None
+    if with_feedback and evaluations:
+        call_started = time.perf_counter()
+        feedback = await generate_final_feedback(FinalFeedbackInput(
+            conversation_history=history,
+            company=company,
+            interview_type=interview_type
+        ), Priority.BATCH, record["id"])
+        stats.feedback_latencies.append(time.perf_counter() - call_started)
+        final_feedback = feedback.model_dump()
+
+    latency = time.perf_counter() - started
+    stats.transcript_latencies.append(latency)
+    return {
+        "id": record["id"],
+        "status": "ok",
+        "company": company,
+        "interview_type": interview_type,
+        "evaluations": evaluations,
+        "final_feedback": final_feedback,
+        "latency_seconds": latency
+    }
+
+def iter_records(path: str) -> Iterator[Tuple[Optional[Dict[str, Any]], str]]:
+    """Yield (record, id) for each input line; the record is None if the line is not a JSON object."""
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if not isinstance(record, dict):
+                yield None, f"line-{line_number}"
+                continue
+            record["id"] = str(record.get("id") or f"line-{line_number}")
+            yield record, record["id"]
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Collect the IDs of transcripts already graded successfully in an existing output file.
+
+    A partially written last line (from a crash mid-write) is truncated away.
+    """
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+
+    with open(path, "rb+") as f:
+        offset = 0
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                if not line.endswith(b"\n"):
+                    f.truncate(offset)
+                    print(f"Truncated a partial result line at byte {offset} of {path}", file=sys.stderr)
+                    break
+            else:
+                if result.get("status") == "ok":
+                    completed.add(result["id"])
+            offset += len(line)
+    return completed
+
+async def run_batch(
+    input_path: str,
+    output_path: str,
+    concurrency: int,
+    with_feedback: bool,
+    bypass_cache: bool,
+    checkpoint_every: int
+) -> BatchStats:
+    """
+    Grade every transcript in the input file that is not already in the output file.
+
+    Args:
+        input_path: JSONL file of transcripts
+        output_path: JSONL file the results are appended to
+        concurrency: Maximum number of transcripts graded at once
+        with_feedback: Also regenerate the final feedback of each transcript
+        bypass_cache: Skip the evaluation cache
+        checkpoint_every: Sync the output file to disk after this many results
+
+    Returns:
+        The run's statistics
+    """
+    completed = load_checkpoint(output_path)
+    stats = BatchStats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+    with open(output_path, "a", encoding="utf-8") as output:
+        written = 0
+
+        def write_result(result: Dict[str, Any]) -> None:
+            nonlocal written
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            written += 1
+            if written % checkpoint_every == 0:
+                os.fsync(output.fileno())
+
+        async def produce():
+            for record, record_id in iter_records(input_path):
+                if record_id in completed:
+                    stats.skipped += 1
+                    continue
+                await queue.put((record, record_id))
+            for _ in range(concurrency):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                record, record_id = item
+                try:
+                    if record is None:
+                        raise ValueError("Not a JSON object")
+                    result = await grade_record(record, stats, with_feedback, bypass_cache)
+                    stats.graded += 1
+                except Exception as e:
+                    print(f"Error grading transcript {record_id}: {e}", file=sys.stderr)
+                    stats.failed += 1
+                    result = {"id": record_id, "status": "error", "error": str(e)}
+                write_result(result)
+
+        async def report_progress():
+            while True:
+                await asyncio.sleep(PROGRESS_INTERVAL)
+                report = stats.report()
+                print(
+                    f"graded {report['graded']}, failed {report['failed']}, skipped {report['skipped']}: "
+                    f"{report['transcripts_per_second']:.2f} transcripts/s, "
+                    f"evaluation p95 {report['evaluation_latency']['p95']:.2f}s",
+                    file=sys.stderr
+                )
+
+        progress = asyncio.ensure_future(report_progress())
+        try:
+            await asyncio.gather(produce(), *(work() for _ in range(concurrency)))
+        finally:
+            progress.cancel()
+            output.flush()
+            os.fsync(output.fileno())
+
+    return stats
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Graded {report['graded']} transcripts ({report['failed']} failed, {report['skipped']} already done) "
+          f"in {report['elapsed_seconds']:.1f}s")
+    print(f"Throughput: {report['transcripts_per_second']:.2f} transcripts/s, "
+          f"{report['evaluations_per_second']:.2f} evaluations/s")
+    for name in ("transcript_latency", "evaluation_latency", "feedback_latency"):
+        latency = report[name]
+        if latency["count"]:
+            print(f"{name.replace('_', ' ').capitalize():<20}: p50 {latency['p50']:.2f}s, "
+                  f"p95 {latency['p95']:.2f}s, p99 {latency['p99']:.2f}s, max {latency['max']:.2f}s")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Re-grade a JSONL file of interview transcripts.")
+    parser.add_argument("input", help="JSONL file with one transcript per line")
+    parser.add_argument("-o", "--output", required=True, help="JSONL file to append results to (also the checkpoint)")
+    parser.add_argument("--concurrency", type=int, default=16, help="transcripts graded at once")
+    parser.add_argument("--no-feedback", action="store_true", help="skip regenerating the final feedback")
+    parser.add_argument("--bypass-cache", action="store_true", help="do not use the evaluation cache")
+    parser.add_argument("--restart", action="store_true", help="discard existing results instead of resuming")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="sync results to disk after this many")
+    parser.add_argument("--report", help="also write the final report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.concurrency < 1 or args.checkpoint_every < 1:
+        parser.error("--concurrency and --checkpoint-every must be at least 1")
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+
+    tracing.configure()
+    try:
+        stats = run_async(run_batch(
+            args.input, args.output, args.concurrency,
+            not args.no_feedback, args.bypass_cache, args.checkpoint_every
+        ))
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume.", file=sys.stderr)
+        return 130
+
+    report = stats.report()
+    print_report(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if stats.failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: evaluation prompt lookup on the /api/answer and /api/end paths.
+
+Compares rebuilding the prompt text from evaluation_configs on every call
+(the previous behaviour) with the precompiled, memoized lookups.
+
+Usage:
+    python benchmarks/bench_evaluation_prompts.py [--iterations 100000]
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from question_registry import registry
+from evaluation_configs import (
+    build_evaluation_prompt, get_evaluation_config, get_feedback_config_text,
+    precompile_evaluation_prompts, render_evaluation_guidance
+)
+
+COMPANY = "Google"
+INTERVIEW_TYPE = "Technical"
+BASE_PROMPT = registry.get_questions(COMPANY, INTERVIEW_TYPE)[2].evaluation_prompt
+
+def uncached_evaluation_prompt():
+    config = get_evaluation_config(COMPANY, INTERVIEW_TYPE)
+    return f"{BASE_PROMPT}{render_evaluation_guidance(config)}"
+
+def uncached_feedback_text():
+    config = get_evaluation_config(COMPANY, INTERVIEW_TYPE)
+    return json.dumps(config.get('structure', {}), indent=2, default=dict), json.dumps(config.get('criteria', []), indent=2, default=dict)
+
+def report(name, func, iterations):
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5)) / iterations
+    print(f"{name:<36}: {seconds * 1e9:10.1f} ns/call")
+    return seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    count = precompile_evaluation_prompts(COMPANY)
+    print(f"Precompiled {count} evaluation prompts for {COMPANY}\n")
+
+    before = report("evaluation prompt (rebuilt)", uncached_evaluation_prompt, args.iterations)
+    after = report("evaluation prompt (precompiled)",
+                   lambda: build_evaluation_prompt(COMPANY, INTERVIEW_TYPE, BASE_PROMPT), args.iterations)
+    print(f"{'speedup':<36}: {before / after:10.1f}x\n")
+
+    before = report("feedback config JSON (rebuilt)", uncached_feedback_text, args.iterations)
+    after = report("feedback config JSON (memoized)",
+                   lambda: get_feedback_config_text(COMPANY, INTERVIEW_TYPE), args.iterations)
+    print(f"{'speedup':<36}: {before / after:10.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: per-request overhead of asyncio.run() versus the shared event loop.
+
+Simulates the request path of /api/answer against a local keep-alive HTTP
+server standing in for the OpenAI API:
+
+- "asyncio.run": a new event loop and a new AsyncClient per request, which is
+  what the handlers did before (pooled connections cannot outlive their loop)
+- "shared loop": one background loop and one pooled AsyncClient reused by
+  every request via async_runtime.run_async()
+
+Usage:
+    python benchmarks/bench_event_loop.py [--requests 500]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import async_runtime
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b'{"evaluation": "ok"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1/responses"
+
+async def _call(client: httpx.AsyncClient, url: str) -> None:
+    response = await client.post(url, json={"input": "candidate answer"})
+    response.raise_for_status()
+
+def bench_asyncio_run(url: str, n: int) -> float:
+    async def one_request():
+        async with httpx.AsyncClient() as client:
+            await _call(client, url)
+
+    start = time.perf_counter()
+    for _ in range(n):
+        asyncio.run(one_request())
+    return (time.perf_counter() - start) / n
+
+def bench_shared_loop(url: str, n: int) -> float:
+    client = async_runtime.run_async(_make_client())
+    async_runtime.run_async(_call(client, url))  # warm up the connection pool
+
+    start = time.perf_counter()
+    for _ in range(n):
+        async_runtime.run_async(_call(client, url))
+    elapsed = (time.perf_counter() - start) / n
+
+    async_runtime.run_async(client.aclose())
+    return elapsed
+
+async def _make_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    server, url = _start_server()
+    try:
+        per_run = bench_asyncio_run(url, args.requests)
+        per_shared = bench_shared_loop(url, args.requests)
+    finally:
+        server.shutdown()
+
+    print(f"asyncio.run per request : {per_run * 1e3:8.3f} ms/request")
+    print(f"shared event loop       : {per_shared * 1e3:8.3f} ms/request")
+    print(f"overhead removed        : {(per_run - per_shared) * 1e3:8.3f} ms/request "
+          f"({per_run / per_shared:.1f}x faster)")
+
+if __name__ == '__main__':
+    main()
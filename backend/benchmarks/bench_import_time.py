@@ -0,0 +1,144 @@
+"""
+Benchmark: app import time and time to the first response, with lazy and eager start-up.
+
+Each case runs in fresh interpreters, as a gunicorn worker or a cold start would:
+it imports app_with_voice and then sends one /api/companies request through the
+Flask test client. The import is what delays a worker's boot; the first request
+pays for whatever the import left out.
+
+- lazy: the default (APP_WARM_UP=lazy); the views, the Agents SDK and the
+  agents (interview_api.py) are loaded by the first API request
+- eager: APP_WARM_UP=eager loads them in create_app(), as importing the app
+  did before app_factory.py (which also initialized AgentOps at import)
+
+Times are the median of --runs interpreters. One more run per case with
+`python -X importtime` lists the slowest imports of the app and of the first
+request (importlib.import_module() is not timed itself, so what the lazy views
+import is listed at the top level). --max-import-ms makes the run fail (exit status 1) when the lazy
+import is slower than that, so it can guard start-up time in CI.
+
+Before timing, one more interpreter imports app_factory, app and app_with_voice
+with lazy start-up and checks that none of LAZY_MODULES was loaded; the run
+fails (exit status 1) if one was, whatever the timings.
+
+The children get TRACE_EXPORTER=none unless it is set, and a throwaway
+evaluation cache.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs 5] [--top 12] [--max-import-ms 500]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = ("lazy", "eager")
+
+# Modules only the first API request may load
+LAZY_MODULES = ("agents", "openai", "interview_api")
+
+CHECK_CHILD = """
+import sys, json
+import app_factory, app, app_with_voice
+print(json.dumps([name for name in %r if name in sys.modules]))
+""" % (LAZY_MODULES,)
+
+CHILD = """
+import time, json
+started = time.perf_counter()
+import app_with_voice
+imported = time.perf_counter()
+response = app_with_voice.app.test_client().get("/api/companies")
+print(json.dumps({"import": imported - started, "first_request": time.perf_counter() - imported, "status": response.status_code}))
+"""
+
+def run_child(case: str, env: Dict[str, str], importtime: bool = False) -> Tuple[Dict[str, float], str]:
+    """Run one interpreter for a case; returns its timings and its stderr (the -X importtime report)."""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    process = subprocess.run(
+        command, cwd=BACKEND_DIR, env=dict(env, APP_WARM_UP=case),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"The {case} run exited with code {process.returncode}:\n{process.stderr[-2000:]}")
+    results = json.loads(process.stdout.strip().splitlines()[-1])
+    if results["status"] != 200:
+        raise RuntimeError(f"/api/companies returned {results['status']} in the {case} run")
+    return results, process.stderr
+
+def eagerly_imported(env: Dict[str, str]) -> List[str]:
+    """Return the LAZY_MODULES that importing the apps loads with lazy start-up."""
+    process = subprocess.run(
+        [sys.executable, "-c", CHECK_CHILD], cwd=BACKEND_DIR, env=dict(env, APP_WARM_UP="lazy"),
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"The import check exited with code {process.returncode}:\n{process.stderr[-2000:]}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def slowest_imports(report: str, top: int) -> List[Tuple[float, int, str]]:
+    """
+    Parse a -X importtime report into its slowest imports near the top of the import tree.
+
+    Returns:
+        (cumulative seconds, nesting level, module) for imports at levels 0 and 1, slowest first
+    """
+    imports = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if level <= 1:
+            imports.append((int(cumulative) / 1e6, level, name.strip()))
+    imports.sort(reverse=True)
+    return imports[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="interpreters per case")
+    parser.add_argument("--top", type=int, default=12, help="slowest imports to list per case")
+    parser.add_argument("--max-import-ms", type=float, help="fail if the lazy import takes longer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, EVALUATION_CACHE_PATH=os.path.join(workdir, "evaluation_cache.sqlite3"))
+        env.setdefault("TRACE_EXPORTER", "none")
+
+        eager_modules = eagerly_imported(env)
+        if eager_modules:
+            print(f"FAIL: importing the app loaded {', '.join(eager_modules)}, which only the first API request should load")
+            sys.exit(1)
+
+        medians = {}
+        reports = {}
+        for case in CASES:
+            runs = [run_child(case, env)[0] for _ in range(args.runs)]
+            medians[case] = {key: statistics.median(run[key] for run in runs) for key in ("import", "first_request")}
+            reports[case] = run_child(case, env, importtime=True)[1]
+
+    print(f"Median of {args.runs} interpreters per case\n")
+    for case in CASES:
+        timings = medians[case]
+        print(f"{case:<5}: import {timings['import'] * 1e3:8.1f} ms  first request {timings['first_request'] * 1e3:8.1f} ms  "
+              f"to first response {(timings['import'] + timings['first_request']) * 1e3:8.1f} ms")
+
+    for case in CASES:
+        print(f"\nSlowest imports ({case}, cumulative, under -X importtime):")
+        for seconds, level, name in slowest_imports(reports[case], args.top):
+            print(f"  {seconds * 1e3:8.1f} ms  {'  ' * level}{name}")
+
+    if args.max_import_ms is not None and medians["lazy"]["import"] * 1e3 > args.max_import_ms:
+        print(f"\nFAIL: importing the app took {medians['lazy']['import'] * 1e3:.1f} ms "
+              f"(limit {args.max_import_ms:.0f} ms)")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
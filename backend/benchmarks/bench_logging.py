@@ -0,0 +1,167 @@
+"""
+Benchmark: /api/answer latency with request logging off, printed and queued.
+
+Runs interviews in-process through the Flask test client against the local mock
+LLM backend (LLM_BACKEND=mock, zero latency and no rate limit unless
+LLM_RATE_LIMIT is set, so the server's own overhead dominates) and reports
+/api/answer latency for three logging modes:
+
+- off: event logging disabled (LOG_ENABLED=false)
+- print: the previous behaviour, printing every request and response body
+  on the request thread
+- queued: structured events handed to the background writer (event_log.py)
+
+Each mode runs in a fresh subprocess whose stdout is the log sink: a file, or
+with --sink-rate a pipe drained at that many bytes per second, standing in for
+a log collector that falls behind. A slow sink stalls printing request threads,
+while queued events are dropped and counted instead.
+
+Usage:
+    python benchmarks/bench_logging.py [--interviews 40] [--threads 4] [--answer-words 300]
+    python benchmarks/bench_logging.py --sink-rate 65536
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import concurrent.futures
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from latency_stats import summarize_latencies
+
+MODES = ("off", "print", "queued")
+
+WORDS = (
+    "so I would start with the requirements and then sketch the data model and the "
+    "main services before looking at caching sharding and failure handling in detail"
+).split()
+
+def run_interviews(args, results_path):
+    """Child process: run the interviews and write the answer latencies to results_path."""
+    import app_with_voice
+    import event_log
+    from flask import request
+
+    app = app_with_voice.app
+    if args.child == "print":
+        # What the handlers logged before event_log.py
+        @app.before_request
+        def print_request():
+            if request.method == "POST":
+                print(f"Received {request.path} request:", request.get_json(silent=True))
+
+        @app.after_request
+        def print_response(response):
+            if not response.is_streamed:
+                print("Sending response:", response.get_json(silent=True))
+            return response
+
+    def interview(number):
+        rng = random.Random(number)
+        client = app.test_client()
+        started = client.post("/api/start", json={"company": "Google", "interview_type": "Technical"}).get_json()
+        latencies = []
+        for _ in range(started["total_questions"]):
+            answer = " ".join(rng.choice(WORDS) for _ in range(args.answer_words))
+            request_started = time.perf_counter()
+            response = client.post("/api/answer", json={"session_id": started["session_id"], "answer": answer})
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code != 200:
+                raise RuntimeError(f"/api/answer returned {response.status_code}: {response.get_data(as_text=True)}")
+        client.post("/api/end", json={"session_id": started["session_id"]})
+        return latencies
+
+    # Warm up imports, agents and the event loop outside the measurement
+    interview(-1)
+
+    latencies = []
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(args.threads) as executor:
+        for result in executor.map(interview, range(args.interviews)):
+            latencies.extend(result)
+    duration = time.perf_counter() - started
+
+    handler = event_log._handler
+    with open(results_path, "w") as f:
+        json.dump({
+            "latency": summarize_latencies(latencies),
+            "duration": duration,
+            "dropped": handler.dropped if handler is not None else 0
+        }, f)
+    sys.stdout.flush()
+    # Skip draining the log queue into a slow sink at exit
+    os._exit(0)
+
+def drain(pipe, rate):
+    """Read a pipe at no more than `rate` bytes per second."""
+    chunk = max(1, rate // 20)
+    while pipe.read(chunk):
+        time.sleep(chunk / rate)
+
+def run_mode(args, mode, workdir):
+    """Run one logging mode in a subprocess and return its results."""
+    results_path = os.path.join(workdir, f"{mode}.json")
+    env = dict(
+        os.environ,
+        LLM_BACKEND="mock",
+        LLM_MOCK_LATENCY="fixed:0",
+        OPENAI_AGENTS_DISABLE_TRACING="1",
+        LOG_ENABLED="true" if mode == "queued" else "false",
+        # Every answer is evaluated rather than served from an earlier run's cache
+        EVALUATION_CACHE_PATH=os.path.join(workdir, f"{mode}_cache.sqlite3"),
+        SESSION_STORE_PATH=os.path.join(workdir, f"{mode}_sessions.sqlite3")
+    )
+    # Measure the server's own overhead rather than the LLM limiter's throttling
+    env.setdefault("LLM_RATE_LIMIT", "100000")
+    env.setdefault("LLM_BURST", "100000")
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", mode, "--results", results_path,
+        "--interviews", str(args.interviews), "--threads", str(args.threads), "--answer-words", str(args.answer_words)
+    ]
+    if args.sink_rate:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        reader = threading.Thread(target=drain, args=(process.stdout, args.sink_rate), daemon=True)
+        reader.start()
+        process.wait()
+    else:
+        with open(os.path.join(workdir, f"{mode}.log"), "w") as sink:
+            process = subprocess.run(command, cwd=BACKEND_DIR, env=env, stdout=sink, stderr=subprocess.DEVNULL)
+    if process.returncode != 0:
+        raise RuntimeError(f"The {mode} run exited with code {process.returncode}")
+    with open(results_path) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interviews", type=int, default=40, help="interviews per mode")
+    parser.add_argument("--threads", type=int, default=4, help="concurrent interviews")
+    parser.add_argument("--answer-words", type=int, default=300, help="words per answer")
+    parser.add_argument("--sink-rate", type=int, default=0, help="drain stdout through a pipe at this many bytes/s")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--results", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_interviews(args, args.results)
+        return
+
+    sink = f"pipe at {args.sink_rate} B/s" if args.sink_rate else "file"
+    print(f"{args.interviews} interviews, answers of {args.answer_words} words, "
+          f"{args.threads} threads, stdout to {sink}\n")
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            results = run_mode(args, mode, workdir)
+            latency = results["latency"]
+            print(f"{mode:<7}: p50 {latency['p50'] * 1e3:7.2f} ms  p95 {latency['p95'] * 1e3:7.2f} ms  "
+                  f"p99 {latency['p99'] * 1e3:7.2f} ms  max {latency['max'] * 1e3:7.2f} ms  "
+                  f"({results['duration']:.2f}s, {results['dropped']} events dropped)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Memory benchmark: resident size of many concurrent interview sessions.
+
+Compares the previous session layout (a copy of the question bank plus one
+dict per history turn) with the compact layout (a reference to the shared
+question bank plus a parallel-array transcript), both held in the in-memory
+session store. Also reports the serialized size used by the SQLite store.
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sessions 100000] [--answers 3]
+"""
+
+import os
+import gc
+import sys
+import json
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from question_registry import registry
+from session_store import InMemorySessionStore
+from transcript import Role, Transcript, new_transcript
+
+COMPANY = "Google"
+BANK_KEY = "technical"
+
+def legacy_session(number, answers):
+    question_bank = registry.get_questions(COMPANY, BANK_KEY)
+    history = [{"role": "agent", "text": question_bank[0].question}]
+    for index in range(answers):
+        history.append({"role": "candidate", "text": f"Answer {index} of session {number}"})
+        history.append({"role": "agent", "text": f"Evaluation {index} of session {number}"})
+        history.append({"role": "agent", "text": question_bank[index + 1].question})
+    return {
+        "company": COMPANY,
+        "interview_type": "Technical",
+        "question_bank": question_bank,
+        "current_index": answers,
+        "history": history,
+        "is_voice_mode": False,
+        "context_summary": "",
+        "summarized_turns": 0,
+        "evaluations": {}
+    }
+
+def compact_session(number, answers):
+    question_bank = registry.get_questions(COMPANY, BANK_KEY)
+    history = Transcript(new_transcript())
+    history.append(Role.INTERVIEWER, question_bank[0].question)
+    for index in range(answers):
+        history.append(Role.CANDIDATE, f"Answer {index} of session {number}")
+        history.append(Role.INTERVIEWER, f"Evaluation {index} of session {number}")
+        history.append(Role.INTERVIEWER, question_bank[index + 1].question)
+    return {
+        "company": COMPANY,
+        "interview_type": "Technical",
+        "bank": [COMPANY, BANK_KEY, registry.get_company(COMPANY).versions[BANK_KEY]],
+        "current_index": answers,
+        "transcript": history.data,
+        "is_voice_mode": False,
+        "context_summary": "",
+        "summarized_turns": 0,
+        "evaluations": {}
+    }
+
+def measure(name, factory, sessions, answers):
+    gc.collect()
+    tracemalloc.start()
+    store = InMemorySessionStore(max_sessions=sessions, max_bytes=1 << 40)
+    for number in range(sessions):
+        store.create(f"session-{number}", factory(number, answers))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    serialized = len(json.dumps(factory(0, answers)))
+    print(f"{name:<10}: {current / 2**20:8.1f} MiB resident ({current / sessions:7.0f} B/session), "
+          f"peak {peak / 2**20:8.1f} MiB, {serialized} B serialized/session")
+    del store
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--answers", type=int, default=3, help="answered questions per session")
+    args = parser.parse_args()
+
+    questions = len(registry.get_questions(COMPANY, BANK_KEY))
+    if not 0 <= args.answers < questions:
+        parser.error(f"--answers must be between 0 and {questions - 1}")
+
+    print(f"{args.sessions} sessions, {args.answers} answered questions each\n")
+    before = measure("legacy", legacy_session, args.sessions, args.answers)
+    after = measure("compact", compact_session, args.sessions, args.answers)
+    print(f"{'reduction':<10}: {before / after:8.1f}x")
+
+if __name__ == '__main__':
+    main()
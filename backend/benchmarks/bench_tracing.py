@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: tracing overhead on the request thread.
+
+Times the spans of one /api/answer request (request root, evaluate_answer, the
+Agents SDK trace and llm_call) with tracing off, with sampled traces exported
+in batches from the background thread (tracing.py), and with every trace
+exported inline when it ends, as the AgentOps spans did. The exporter stands in
+for a network exporter and takes --export-ms per call.
+
+Usage:
+    python benchmarks/bench_tracing.py [--requests 2000] [--export-ms 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents import set_trace_processors
+
+import tracing
+from latency_stats import summarize_latencies
+
+class SlowExporter:
+    """Exporter taking a fixed time per call, like a network round trip."""
+    name = "slow"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def export(self, traces):
+        time.sleep(self.seconds)
+
+class InlineProcessor(tracing.BatchSpanProcessor):
+    """Exports each trace on the thread that ends it."""
+
+    def end_span(self, span):
+        span.duration = time.perf_counter() - span.started
+        trace_ = span.trace
+        with self.lock:
+            trace_.spans.append(span)
+            self.counters["spans_recorded"] += 1
+            trace_.open -= 1
+            if trace_.open:
+                return
+        self._export([trace_])
+
+def request():
+    with tracing.span("POST /api/answer", route="/api/answer"):
+        with tracing.span("evaluate_answer", company="Google", interview_type="Technical") as span:
+            span.set_attribute("cache_hit", False)
+            with tracing.sdk_trace("Evaluate candidate answer"):
+                with tracing.span("llm_call", agent="EvaluatorAgent", model="gpt-4o-mini") as call:
+                    call.set_attribute("outcome", "ok")
+
+def run(processor, rate, requests):
+    tracing._processor = processor
+    tracing.TRACE_SAMPLE_RATE = rate
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        request()
+        latencies.append(time.perf_counter() - started)
+    if processor is not None:
+        processor.shutdown(timeout=60)
+    return summarize_latencies(latencies), processor.stats() if processor is not None else {}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--export-ms", type=float, default=2.0, help="time per exporter call")
+    args = parser.parse_args()
+
+    # Keep the SDK from exporting its own traces; only their creation is measured
+    set_trace_processors([])
+    exporter = SlowExporter(args.export_ms / 1000)
+    modes = [
+        ("no exporter", None, 1.0),
+        ("batched, 0% sampled", tracing.BatchSpanProcessor(exporter), 0.0),
+        ("batched, 10% sampled", tracing.BatchSpanProcessor(exporter), 0.1),
+        ("batched, 100% sampled", tracing.BatchSpanProcessor(exporter), 1.0),
+        ("inline, 100% sampled", InlineProcessor(exporter), 1.0)
+    ]
+    print(f"{args.requests} requests of 4 spans, exporter call {args.export_ms} ms\n")
+    for label, processor, rate in modes:
+        latency, stats = run(processor, rate, args.requests)
+        line = f"{label:<22}: mean {latency['mean'] * 1e6:8.1f} us  p99 {latency['p99'] * 1e6:8.1f} us"
+        if stats:
+            line += (f"  ({stats['traces_exported']} traces in {stats['batches']} exports, "
+                     f"{stats['traces_dropped']} dropped, {stats['export_seconds']:.2f}s exporting)")
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Micro-benchmark: prompt construction over long voice-interview transcripts.
+
+Replays the transcript work of an interview turn by turn, as the API does it:
+on each answer the evaluator context is built from the history (with its token
+statistics), and at the end the whole transcript is formatted for the feedback
+prompt. Compares re-formatting and re-counting the history on every call (the
+previous behaviour) with the transcript's incrementally maintained prompt
+index (formatted text and per-turn token counts), cached per process by session
+ID. Also reports the size of the stored transcript and of the worker-local index.
+
+Usage:
+    python benchmarks/bench_transcript.py [--turns 200] [--answer-words 150] [--repeat 5]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from conversation_context import build_context
+from transcript import Role, Transcript, estimate_tokens, new_transcript
+
+# A fresh session ID per replayed interview, so runs do not share cached indexes
+session_ids = (f"bench-{number}" for number in itertools.count())
+
+WORDS = (
+    "so I think the main thing here is that we would want to make sure the system "
+    "can handle the load and um we would probably start by looking at the data model "
+    "and then you know figure out where the bottlenecks are and scale those parts"
+).split()
+
+# The evaluator's verbatim window when context management is on (default_context_config)
+RECENT_TURNS = 9
+
+def spoken_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def build_turns(turns, answer_words, seed=0):
+    """Question, answer and evaluation turns of a voice interview, as (role, text) pairs."""
+    rng = random.Random(seed)
+    script = []
+    while len(script) < turns:
+        script.append((Role.INTERVIEWER, spoken_text(rng, 25)))
+        script.append((Role.CANDIDATE, spoken_text(rng, answer_words)))
+        script.append((Role.INTERVIEWER, spoken_text(rng, 100)))
+    return script[:turns]
+
+def legacy_format(history):
+    formatted = ""
+    for role, text in history:
+        if role is Role.INTERVIEWER:
+            formatted += f"Interviewer: {text}\n\n"
+        elif role is Role.CANDIDATE:
+            formatted += f"Candidate: {text}\n\n"
+    return formatted
+
+def legacy_build_context(history, summary, summarized_turns):
+    recent_text = legacy_format(history[summarized_turns:])
+    if summary and summarized_turns:
+        context = f"Summary of earlier conversation:\n{summary}\n\nRecent conversation:\n{recent_text}"
+        full_tokens = estimate_tokens(legacy_format(history))
+    else:
+        context = recent_text
+        full_tokens = None
+    prompt_tokens = estimate_tokens(context)
+    return context, {"full_tokens": prompt_tokens if full_tokens is None else full_tokens, "prompt_tokens": prompt_tokens}
+
+def append_turn(data, role, text):
+    data["roles"] += role.value
+    data["texts"].append(text)
+
+def replay(script, context, summarized):
+    """
+    Run the transcript work of one interview.
+
+    Returns:
+        (seconds for the whole interview, seconds for the last answer's context)
+    """
+    data = new_transcript()
+    session_id = next(session_ids)
+    summary = "Summary of the earlier answers. " * 20 if summarized else ""
+    started = time.perf_counter()
+    last = 0.0
+    for role, text in script:
+        if role is Role.CANDIDATE:
+            answer_started = time.perf_counter()
+            # The evaluator input holds a copy of the history with the new answer (build_evaluation_input)
+            history = Transcript(data, key=session_id)[:]
+            append_turn(history.data, role, text)
+            summarized_turns = max(0, len(history) - RECENT_TURNS) if summarized else 0
+            context(history, summary, summarized_turns)
+            last = time.perf_counter() - answer_started
+        append_turn(data, role, text)
+
+    # Final feedback prompt
+    if context is build_context:
+        Transcript(data, key=session_id).formatted_text()
+    else:
+        legacy_format(Transcript(data))
+    return time.perf_counter() - started, last
+
+def session_size(script):
+    """Resident and serialized bytes of one stored transcript, and resident bytes of its prompt index."""
+    gc.collect()
+    tracemalloc.start()
+    data = new_transcript()
+    for role, text in script:
+        # A fresh copy, as session texts arrive in requests rather than being shared
+        append_turn(data, role, text.encode().decode())
+    resident, _ = tracemalloc.get_traced_memory()
+    Transcript(data, key=next(session_ids)).formatted_text()
+    indexed, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resident, len(json.dumps(data)), indexed - resident
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200, help="transcript turns per interview")
+    parser.add_argument("--answer-words", type=int, default=150, help="words per spoken answer")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    script = build_turns(args.turns, args.answer_words)
+    answers = sum(role is Role.CANDIDATE for role, _ in script)
+    transcript = Transcript(new_transcript())
+    for role, text in script:
+        transcript.append(role, text)
+    print(f"{args.turns} turns, {answers} answers of {args.answer_words} words, "
+          f"{transcript.token_count()} transcript tokens\n")
+
+    for summarized in (False, True):
+        label = f"recent {RECENT_TURNS} turns + summary" if summarized else "full history"
+        results = []
+        for context in (legacy_build_context, build_context):
+            runs = [replay(script, context, summarized) for _ in range(args.repeat)]
+            results.append((min(run[0] for run in runs), min(run[1] for run in runs)))
+        (before_total, before_last), (after_total, after_last) = results
+        print(f"{label}:")
+        print(f"  {'whole interview':<16}: {before_total * 1e3:8.2f} ms -> {after_total * 1e3:8.2f} ms ({before_total / after_total:5.1f}x)")
+        print(f"  {'last answer':<16}: {before_last * 1e6:8.1f} us -> {after_last * 1e6:8.1f} us ({before_last / after_last:5.1f}x)")
+
+    resident, serialized, index = session_size(script)
+    print(f"\ntranscript size : {resident / 1024:8.1f} KiB resident, {serialized / 1024:8.1f} KiB serialized in the session")
+    print(f"prompt index    : {index / 1024:8.1f} KiB resident per worker (not stored)")
+
+if __name__ == '__main__':
+    main()
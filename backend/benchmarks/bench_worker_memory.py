@@ -0,0 +1,186 @@
+"""
+Benchmark: unique memory (USS) per gunicorn worker, with and without preload.
+
+Starts gunicorn (with gunicorn.conf.py) on the local mock LLM backend in three
+modes, loading the app eagerly (APP_WARM_UP=eager):
+
+- per-worker: each worker loads the app, the Agents SDK and the question banks
+- preload: the master loads them once before forking (GUNICORN_PRELOAD=true,
+  GC_FREEZE=false)
+- preload+freeze: the same, followed by gc.freeze() before forking (the
+  default with GUNICORN_PRELOAD)
+
+For every worker it reads /proc/<pid>/smaps_rollup at three points: once the
+workers have loaded the app ("booted"), after --interviews interviews
+("loaded") and after each worker has run a full garbage collection
+("collected"), as long-running workers eventually do. The collection is
+triggered with SIGUSR2, through a hook that the benchmark adds to
+gunicorn.conf.py. Reported are USS (pages only that worker uses, the memory
+it adds), PSS (its share of all its pages) and RSS. Total PSS, the master's
+included, is what the server as a whole occupies. Linux only.
+
+Usage:
+    python benchmarks/bench_worker_memory.py [--workers 4] [--interviews 40] [--modes preload+freeze]
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+import concurrent.futures
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "per-worker": {"GUNICORN_PRELOAD": "false"},
+    "preload": {"GUNICORN_PRELOAD": "true", "GC_FREEZE": "false"},
+    "preload+freeze": {"GUNICORN_PRELOAD": "true", "GC_FREEZE": "true"}
+}
+
+MIB = 2 ** 20
+
+# gunicorn.conf.py plus a hook that makes workers run a full collection on SIGUSR2
+CONFIG = """
+import gc
+import signal
+
+exec(open({path!r}).read())
+
+def post_worker_init(worker):
+    signal.signal(signal.SIGUSR2, lambda signum, frame: gc.collect())
+"""
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def memory(pid: int) -> Dict[str, int]:
+    """USS, PSS and RSS of a process in bytes, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    return {
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+        "pss": fields["Pss"],
+        "rss": fields["Rss"]
+    }
+
+def workers_of(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return sorted(int(child) for child in f.read().split())
+
+def request(url: str, path: str, body: Dict = None) -> Dict:
+    data = json.dumps(body).encode() if body is not None else None
+    headers = {"Content-Type": "application/json"} if data is not None else {}
+    with urllib.request.urlopen(urllib.request.Request(url + path, data=data, headers=headers), timeout=60) as response:
+        return json.load(response)
+
+def interview(url: str) -> None:
+    started = request(url, "/api/start", {"company": "Google", "interview_type": "Technical"})
+    for number in range(started["total_questions"]):
+        request(url, "/api/answer", {"session_id": started["session_id"], "answer": f"Answer {number}: I would start with the requirements."})
+    request(url, "/api/end", {"session_id": started["session_id"]})
+
+def wait_until_loaded(process: subprocess.Popen, url: str, workers: int, timeout: float) -> List[int]:
+    """Wait for the server to answer and for every worker's memory to stop growing; returns the worker pids."""
+    deadline = time.monotonic() + timeout
+    previous = None
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        time.sleep(0.5)
+        try:
+            request(url, "/api/companies")
+            pids = workers_of(process.pid)
+            sizes = [memory(pid)["rss"] for pid in pids]
+        except OSError:
+            continue
+        if len(pids) == workers and previous == (pids, sizes):
+            return pids
+        previous = (pids, sizes)
+    raise RuntimeError("The workers did not finish loading in time")
+
+def summarize(master: int, pids: List[int]) -> Dict[str, float]:
+    samples = [memory(pid) for pid in pids]
+    return {
+        "uss": sum(sample["uss"] for sample in samples) / len(samples),
+        "pss": sum(sample["pss"] for sample in samples) / len(samples),
+        "rss": sum(sample["rss"] for sample in samples) / len(samples),
+        "total_pss": sum(sample["pss"] for sample in samples) + memory(master)["pss"]
+    }
+
+def run_mode(args: argparse.Namespace, mode: str, workdir: str) -> Dict[str, Dict[str, float]]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        LLM_BACKEND="mock",
+        LLM_MOCK_LATENCY="fixed:0",
+        OPENAI_AGENTS_DISABLE_TRACING="1",
+        APP_WARM_UP="eager",
+        SESSION_STORE="sqlite",
+        SESSION_STORE_PATH=os.path.join(workdir, f"{mode}_sessions.sqlite3"),
+        EVALUATION_CACHE_PATH=os.path.join(workdir, f"{mode}_cache.sqlite3"),
+        **MODES[mode]
+    )
+    env.setdefault("TRACE_EXPORTER", "none")
+    env.setdefault("LOG_ENABLED", "false")
+    env.setdefault("LLM_RATE_LIMIT", "100000")
+    env.setdefault("LLM_BURST", "100000")
+    config_path = os.path.join(workdir, "gunicorn.conf.py")
+    with open(config_path, "w") as f:
+        f.write(CONFIG.format(path=os.path.join(BACKEND_DIR, "gunicorn.conf.py")))
+    command = [
+        sys.executable, "-m", "gunicorn", "-c", config_path, "-w", str(args.workers), "--threads", str(args.threads),
+        "-b", f"127.0.0.1:{port}", "--timeout", "120", "app_with_voice:app"
+    ]
+    with open(os.path.join(workdir, f"{mode}.log"), "w") as log:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    try:
+        pids = wait_until_loaded(process, url, args.workers, args.startup_timeout)
+        booted = summarize(process.pid, pids)
+        with concurrent.futures.ThreadPoolExecutor(args.workers * args.threads) as executor:
+            list(executor.map(lambda _: interview(url), range(args.interviews)))
+        loaded = summarize(process.pid, pids)
+        for pid in pids:
+            os.kill(pid, signal.SIGUSR2)
+        time.sleep(args.collect_wait)
+        if workers_of(process.pid) != pids:
+            raise RuntimeError("A worker was restarted during the run")
+        return {"booted": booted, "loaded": loaded, "collected": summarize(process.pid, pids)}
+    finally:
+        process.terminate()
+        process.wait(30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--interviews", type=int, default=40, help="interviews run once the workers have booted")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--collect-wait", type=float, default=3.0, help="seconds allowed for the full collections")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.interviews} interviews; MiB per worker unless noted\n")
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in args.modes:
+            results = run_mode(args, mode, workdir)
+            for stage in ("booted", "loaded", "collected"):
+                result = results[stage]
+                print(f"{mode:<15} {stage:<9}: USS {result['uss'] / MIB:6.1f}  PSS {result['pss'] / MIB:6.1f}  "
+                      f"RSS {result['rss'] / MIB:6.1f}  total PSS {result['total_pss'] / MIB:7.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Model comparison harness: latency, token cost and output agreement between models.
+
+Replays recorded transcripts (the JSONL format read by batch_grader.py) through
+the evaluator agent, or with --role feedback through the feedback agent, once
+per model. Every model sees exactly the same prompts. The first model is the
+baseline. The others are scored on how closely their output agrees with it:
+word-level similarity of the evaluation text and, for feedback, whether the
+overall rating matches.
+
+Prices are USD per million input/output tokens; pass --prices with a JSON file
+of {"model": [input, output]} to override the built-in table.
+
+Usage:
+    python benchmarks/compare_models.py transcripts.jsonl --models gpt-4o gpt-4o-mini [--limit 50]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import difflib
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from dotenv import load_dotenv
+load_dotenv()
+
+import tracing
+from async_runtime import run_async
+from agent_runner import run_agent
+from batch_grader import iter_records, load_transcript
+from evaluation_configs import default_evaluation_prompt
+from latency_stats import summarize_latencies
+from llm_limiter import Priority
+from model_router import model_router
+from question_registry import registry
+from transcript import Role
+from interview_api import (
+    EvaluationInput, EvaluationOutput, FinalFeedbackInput, FinalFeedbackOutput,
+    build_evaluator_prompt, build_feedback_prompt, evaluator_agent, feedback_agent
+)
+
+# USD per million tokens (input, output)
+PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40)
+}
+
+def build_prompts(records: List[Dict[str, Any]], role: str) -> List[str]:
+    """Build the prompts every model is given, in the same way the API builds them."""
+    prompts = []
+    for record in records:
+        company = registry.canonical_company(record["company"]) or record["company"]
+        interview_type = record.get("interview_type", "General")
+        history = load_transcript(record)
+
+        if role == "feedback":
+            prompts.append(build_feedback_prompt(FinalFeedbackInput(
+                conversation_history=history,
+                company=company,
+                interview_type=interview_type
+            )))
+            continue
+
+        # One prompt per answer, with the recorded conversation up to that answer
+        for position in range(1, len(history)):
+            if history.role(position) is Role.CANDIDATE and history.role(position - 1) is Role.INTERVIEWER:
+                question = history.text(position - 1)
+                prompts.append(build_evaluator_prompt(EvaluationInput(
+                    candidate_answer=history.text(position),
+                    evaluation_prompt=registry.get_evaluation_prompt(company, interview_type, question) or default_evaluation_prompt,
+                    conversation_history=history[:position + 1],
+                    company=company,
+                    interview_type=interview_type,
+                    question=question
+                )))
+    return prompts
+
+async def run_model(model: str, role: str, prompts: List[str], concurrency: int) -> List[Dict[str, Any]]:
+    """Run every prompt through the role's agent with the given model."""
+    base_agent = feedback_agent if role == "feedback" else evaluator_agent
+    output_type = FinalFeedbackOutput if role == "feedback" else EvaluationOutput
+    agent = model_router.with_model(base_agent, model)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, prompt: str) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                result = await run_agent(agent, prompt, Priority.BATCH, f"compare:{model}:{index}")
+            except Exception as e:
+                print(f"{model} failed on prompt {index}: {e}", file=sys.stderr)
+                return {"error": str(e)}
+            latency = time.perf_counter() - started
+        usage = result.context_wrapper.usage
+        return {
+            "output": result.final_output_as(output_type),
+            "latency": latency,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens
+        }
+
+    return await asyncio.gather(*(run_one(index, prompt) for index, prompt in enumerate(prompts)))
+
+def output_text(output: Any) -> str:
+    return output.feedback if isinstance(output, FinalFeedbackOutput) else output.evaluation
+
+def similarity(a: str, b: str) -> float:
+    """Word-level similarity of two texts, from 0 (disjoint) to 1 (identical)."""
+    return difflib.SequenceMatcher(None, a.split(), b.split()).ratio()
+
+def summarize_model(
+    model: str,
+    runs: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    prices: Dict[str, Tuple[float, float]]
+) -> Dict[str, Any]:
+    """Latency, tokens, cost and agreement with the baseline for one model."""
+    succeeded = [run for run in runs if "error" not in run]
+    input_tokens = sum(run["input_tokens"] for run in succeeded)
+    output_tokens = sum(run["output_tokens"] for run in succeeded)
+    input_price, output_price = prices.get(model, (0.0, 0.0))
+
+    pairs = [(run, base) for run, base in zip(runs, baseline) if "error" not in run and "error" not in base]
+    similarities = [similarity(output_text(run["output"]), output_text(base["output"])) for run, base in pairs]
+    report = {
+        "model": model,
+        "calls": len(runs),
+        "errors": len(runs) - len(succeeded),
+        "latency": summarize_latencies([run["latency"] for run in succeeded]),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": (input_tokens * input_price + output_tokens * output_price) / 1e6 if model in prices else None,
+        "text_similarity": sum(similarities) / len(similarities) if similarities else None
+    }
+    if pairs and isinstance(pairs[0][0]["output"], FinalFeedbackOutput):
+        matches = [run["output"].overall_rating == base["output"].overall_rating for run, base in pairs]
+        report["rating_agreement"] = sum(matches) / len(matches)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="JSONL file of recorded transcripts")
+    parser.add_argument("--models", nargs="+", required=True, help="models to compare; the first is the baseline")
+    parser.add_argument("--role", choices=("evaluator", "feedback"), default="evaluator")
+    parser.add_argument("--limit", type=int, default=50, help="maximum number of transcripts")
+    parser.add_argument("--concurrency", type=int, default=8, help="calls in flight per model")
+    parser.add_argument("--prices", help="JSON file of {model: [input, output]} USD per million tokens")
+    parser.add_argument("--output", help="also write the report as JSON to this file")
+    args = parser.parse_args()
+
+    prices = dict(PRICES)
+    if args.prices:
+        with open(args.prices, encoding="utf-8") as f:
+            prices.update({model: tuple(price) for model, price in json.load(f).items()})
+
+    records = [record for record, _ in iter_records(args.input) if record is not None][:args.limit]
+    prompts = build_prompts(records, args.role)
+    if not prompts:
+        parser.error("no answers to compare in the input file")
+    print(f"{len(records)} transcripts, {len(prompts)} {args.role} prompts per model\n")
+
+    tracing.configure()
+    runs = {model: run_async(run_model(model, args.role, prompts, args.concurrency)) for model in args.models}
+    baseline = runs[args.models[0]]
+    reports = [summarize_model(model, runs[model], baseline, prices) for model in args.models]
+
+    for report in reports:
+        latency = report["latency"]
+        cost = f"${report['cost_usd']:.4f}" if report["cost_usd"] is not None else "n/a"
+        agreement = f"{report['text_similarity']:.2f}" if report["text_similarity"] is not None else "n/a"
+        if "rating_agreement" in report:
+            agreement += f", rating {report['rating_agreement']:.0%}"
+        print(f"{report['model']:<16}: p50 {latency['p50']:6.2f}s, p95 {latency['p95']:6.2f}s, "
+              f"{report['input_tokens']} in / {report['output_tokens']} out tokens, cost {cost}, "
+              f"agreement {agreement}, {report['errors']} errors")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"role": args.role, "prompts": len(prompts), "models": reports}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+"""
+End-to-end load test: concurrent virtual candidates against the API.
+
+Starts the app under the Flask dev server or gunicorn with the local mock LLM
+backend (LLM_BACKEND=mock, see mock_llm.py), then drives N concurrent virtual
+candidates through /api/start, one /api/answer per question (/api/answer/stream
+with --stream) and /api/end. Reports throughput, p50/p95/p99 latency and error
+rate per route, plus the growth of the server's resident memory and of its
+session store. Results can be saved as JSON and compared with an earlier run
+(--baseline) to spot regressions between releases.
+
+The server gets a fresh evaluation cache and session database in a temporary
+directory, and otherwise inherits the environment, so the LLM limiter settings
+(LLM_RATE_LIMIT, LLM_MAX_IN_FLIGHT, ...) apply. Raise them to measure the
+server's own overhead rather than the limiter's throttling.
+
+Usage:
+    python benchmarks/load_test.py --server dev --candidates 50 [--output dev.json]
+    python benchmarks/load_test.py --server gunicorn --workers 4 --threads 8 --candidates 200
+    python benchmarks/load_test.py --url http://localhost:5000 --candidates 20
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from latency_stats import summarize_latencies
+
+# Interviews the virtual candidates take, in turn
+INTERVIEWS = [
+    ("Google", "Technical"),
+    ("Amazon", "Behavioral"),
+    ("Microsoft", "General"),
+    ("Facebook", "System Design")
+]
+
+class RouteStats:
+    """Latencies and outcomes of the requests to one route."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def record(self, latency: float, status: Any, ok: bool) -> None:
+        self.latencies.append(latency)
+        self.statuses[str(status)] += 1
+        if not ok:
+            self.errors += 1
+
+    def report(self) -> Dict[str, Any]:
+        count = len(self.latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "statuses": dict(self.statuses),
+            "latency": summarize_latencies(self.latencies)
+        }
+
+class LoadTest:
+    """Runs the virtual candidates against one server and collects the results."""
+
+    def __init__(self, base_url: str, args: argparse.Namespace):
+        self.base_url = base_url
+        self.args = args
+        self.routes: Dict[str, RouteStats] = {}
+        self.completed = 0
+
+    def stats(self, route: str) -> RouteStats:
+        return self.routes.setdefault(route, RouteStats())
+
+    async def post(self, client: httpx.AsyncClient, route: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST to a route and record the outcome; returns the JSON body of a successful response."""
+        started = time.perf_counter()
+        try:
+            response = await client.post(route, json=payload)
+        except httpx.HTTPError as e:
+            self.stats(route).record(time.perf_counter() - started, type(e).__name__, False)
+            return None
+        ok = response.status_code < 400
+        self.stats(route).record(time.perf_counter() - started, response.status_code, ok)
+        return response.json() if ok else None
+
+    async def post_stream(self, client: httpx.AsyncClient, route: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """POST to a server-sent events route; records the time to the first event and to the last."""
+        started = time.perf_counter()
+        first_event = None
+        done = None
+        status: Any = None
+        try:
+            async with client.stream("POST", route, json=payload) as response:
+                status = response.status_code
+                event = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event:"):
+                        event = line[6:].strip()
+                        if first_event is None:
+                            first_event = time.perf_counter() - started
+                    elif line.startswith("data:") and event == "done":
+                        done = json.loads(line[5:])
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        latency = time.perf_counter() - started
+        ok = done is not None
+        self.stats(route).record(latency, status, ok)
+        if first_event is not None:
+            self.stats(f"{route} (first event)").record(first_event, status, ok)
+        return done
+
+    async def candidate(self, client: httpx.AsyncClient, number: int) -> None:
+        """One virtual candidate taking its interviews one after another."""
+        for interview in range(self.args.interviews):
+            company, interview_type = INTERVIEWS[(number + interview) % len(INTERVIEWS)]
+            started = await self.post(client, "/api/start", {"company": company, "interview_type": interview_type})
+            if started is None:
+                continue
+            session_id = started["session_id"]
+            questions = started.get("total_questions", 1)
+            if self.args.answers:
+                questions = min(questions, self.args.answers)
+
+            for question in range(questions):
+                await asyncio.sleep(self.args.think_time)
+                payload = {
+                    "session_id": session_id,
+                    "answer": f"Candidate {number}, interview {interview}, answer {question}: "
+                              "I would start from the requirements and weigh the tradeoffs."
+                }
+                if self.args.stream:
+                    result = await self.post_stream(client, "/api/answer/stream", payload)
+                else:
+                    result = await self.post(client, "/api/answer", payload)
+                if result is None:
+                    break
+
+            if await self.post(client, "/api/end", {"session_id": session_id}) is not None:
+                self.completed += 1
+
+    async def run(self) -> float:
+        """Run every candidate concurrently; returns the elapsed time."""
+        limits = httpx.Limits(max_connections=self.args.candidates, max_keepalive_connections=self.args.candidates)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits, timeout=self.args.timeout) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(self.candidate(client, number) for number in range(self.args.candidates)))
+            return time.perf_counter() - started
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """Resident memory in bytes of a process and all its descendants (Linux only)."""
+    total = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as f:
+                    pending.extend(int(child) for child in f.read().split())
+    except (OSError, ValueError):
+        return None if total == 0 else total
+    return total
+
+def start_server(args: argparse.Namespace, port: int, workdir: str) -> subprocess.Popen:
+    """Start the app with the mock LLM backend and wait until it answers."""
+    env = dict(
+        os.environ,
+        LLM_BACKEND="mock",
+        LLM_MOCK_LATENCY=args.mock_latency,
+        LLM_MOCK_ERROR_RATE=str(args.mock_error_rate),
+        OPENAI_AGENTS_DISABLE_TRACING="1",
+        # Answers must not be served from the cache of an earlier run
+        EVALUATION_CACHE_PATH=os.path.join(workdir, "evaluation_cache.sqlite3"),
+        SESSION_STORE_PATH=os.path.join(workdir, "sessions.sqlite3")
+    )
+    if args.server == "gunicorn":
+        if args.workers > 1:
+            # Sessions must be shared between workers
+            env.setdefault("SESSION_STORE", "sqlite")
+        command = [
+            sys.executable, "-m", "gunicorn",
+            "-w", str(args.workers), "--threads", str(args.threads),
+            "-b", f"127.0.0.1:{port}", "--timeout", "120",
+            f"{args.app}:app"
+        ]
+    else:
+        command = [sys.executable, "-m", "flask", "--app", args.app, "run", "--port", str(port)]
+
+    log_path = os.path.join(workdir, "server.log")
+    log = open(log_path, "w")
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + args.startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}; see {log_path}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/companies", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server did not start within {args.startup_timeout}s; see {log_path}")
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def session_stats(base_url: str) -> Optional[Dict[str, Any]]:
+    """The session store statistics of one worker, if the app reports them."""
+    try:
+        response = httpx.get(f"{base_url}/api/sessions/stats", timeout=5)
+        return response.json() if response.status_code == 200 else None
+    except (httpx.HTTPError, ValueError):
+        return None
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    print(f"{results['interviews_completed']} interviews, {results['requests']} requests "
+          f"in {results['duration_seconds']:.1f}s ({results['throughput_rps']:.1f} req/s)\n")
+    for route, report in results["routes"].items():
+        latency = report["latency"]
+        line = (f"{route:<32} n={report['count']:<6} p50 {latency['p50'] * 1000:8.1f}ms  "
+                f"p95 {latency['p95'] * 1000:8.1f}ms  p99 {latency['p99'] * 1000:8.1f}ms  "
+                f"errors {report['error_rate']:.1%}")
+        previous = (baseline or {}).get("routes", {}).get(route)
+        if previous and previous["latency"]["p95"]:
+            line += f"  p95 vs baseline {latency['p95'] / previous['latency']['p95'] - 1:+.0%}"
+        print(line)
+
+    memory = results["memory"]
+    if memory["rss_before"] is not None and memory["rss_after"] is not None:
+        print(f"\nServer RSS: {memory['rss_before'] / 2**20:.1f} MiB -> {memory['rss_after'] / 2**20:.1f} MiB "
+              f"({memory['rss_growth'] / 2**20:+.1f} MiB)")
+    sessions = results["sessions"]
+    if sessions["before"] and sessions["after"]:
+        print(f"Session store (one worker): {sessions['before'].get('sessions')} -> {sessions['after'].get('sessions')} "
+              f"sessions, {sessions['after'].get('approximate_bytes', 0) / 2**20:.1f} MiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--server", choices=("dev", "gunicorn"), default="dev", help="how to run the app")
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--app", choices=("app_with_voice", "app"), default="app_with_voice")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--candidates", type=int, default=20, help="concurrent virtual candidates")
+    parser.add_argument("--interviews", type=int, default=1, help="interviews per candidate")
+    parser.add_argument("--answers", type=int, default=0, help="answers per interview (default: every question)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="seconds a candidate waits before answering")
+    parser.add_argument("--stream", action="store_true", help="answer through /api/answer/stream")
+    parser.add_argument("--mock-latency", default="lognormal:0.8,0.5", help="LLM_MOCK_LATENCY of the server")
+    parser.add_argument("--mock-error-rate", type=float, default=0.0, help="LLM_MOCK_ERROR_RATE of the server")
+    parser.add_argument("--timeout", type=float, default=120.0, help="request timeout in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare p95 latencies with")
+    args = parser.parse_args()
+
+    if args.candidates < 1 or args.interviews < 1:
+        parser.error("--candidates and --interviews must be at least 1")
+
+    process = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        workdir = tempfile.mkdtemp(prefix="load_test_")
+        process = start_server(args, port, workdir)
+        print(f"Started {args.server} server for {args.app} on {base_url} (log: {workdir}/server.log)")
+
+    try:
+        rss_before = process_tree_rss(process.pid) if process else None
+        sessions_before = session_stats(base_url)
+        test = LoadTest(base_url, args)
+        elapsed = asyncio.run(test.run())
+        rss_after = process_tree_rss(process.pid) if process else None
+        sessions_after = session_stats(base_url)
+    finally:
+        if process:
+            stop_server(process)
+
+    requests = sum(len(stats.latencies) for route, stats in test.routes.items() if "(first event)" not in route)
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "duration_seconds": elapsed,
+        "interviews_completed": test.completed,
+        "requests": requests,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "routes": {route: stats.report() for route, stats in test.routes.items()},
+        "memory": {
+            "rss_before": rss_before,
+            "rss_after": rss_after,
+            "rss_growth": rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        },
+        "sessions": {"before": sessions_before, "after": sessions_after}
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
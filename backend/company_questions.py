@@ -1,362 +0,0 @@
-question_banks = {
-    "Google": {
-        "technical": [
-            {
-                "question": "Explain the concept of MapReduce.",
-                "evaluation_prompt": "Evaluate the answer based on clarity and technical depth expected at Google. Look for understanding of distributed computing concepts, the map and reduce functions, and practical applications of the framework."
-            },
-            {
-                "question": "What are the key differences between synchronous and asynchronous programming in distributed systems?",
-                "evaluation_prompt": "Evaluate for clarity, depth, and understanding of concurrent processing and inter-node communication."
-            },
-            {
-                "question": "How does Google's BigTable architecture work?",
-                "evaluation_prompt": "Assess for understanding of distributed databases, scalability, data consistency, and fault tolerance."
-            },
-            {
-                "question": "Describe the role of Kubernetes in managing containerized applications.",
-                "evaluation_prompt": "Evaluate for technical depth and relevance to cloud-native deployments, orchestration, and automation."
-            },
-            {
-                "question": "What are the benefits and challenges of implementing serverless architectures?",
-                "evaluation_prompt": "Assess for understanding of scalability, cost optimization, and trade-offs such as vendor lock-in and performance considerations."
-            }
-        ],
-        "general": [
-            {
-                "question": "How would you improve Google Search?",
-                "evaluation_prompt": "Evaluate based on innovation, user experience improvement, and technical feasibility."
-            },
-            {
-                "question": "What is your perspective on the future of artificial intelligence and its impact on society?",
-                "evaluation_prompt": "Assess for thoughtfulness, vision, and understanding of AI trends and ethical implications."
-            },
-            {
-                "question": "Describe a project where you used cutting-edge technology to solve a complex problem.",
-                "evaluation_prompt": "Evaluate for innovation, technical execution, and problem-solving approach."
-            },
-            {
-                "question": "How do you stay updated with the latest developments in technology?",
-                "evaluation_prompt": "Assess for continuous learning, engagement with the tech community, and resourcefulness."
-            },
-            {
-                "question": "Discuss the importance of data privacy in modern software systems.",
-                "evaluation_prompt": "Evaluate for awareness of data protection, ethical considerations, and regulatory compliance."
-            }
-        ],
-        "behavioral": [
-            {
-                "question": "Describe a time when you faced a technical challenge and how you overcame it.",
-                "evaluation_prompt": "Evaluate using the STAR method, focusing on problem-solving, resilience, and clear communication."
-            },
-            {
-                "question": "Tell me about a situation where you had to work under tight deadlines.",
-                "evaluation_prompt": "Assess for time management, prioritization, and ability to perform under pressure."
-            },
-            {
-                "question": "How do you handle feedback, both positive and negative?",
-                "evaluation_prompt": "Evaluate for self-awareness, growth mindset, and effective communication skills."
-            },
-            {
-                "question": "Give an example of a time when you had to collaborate with a difficult team member.",
-                "evaluation_prompt": "Assess for interpersonal skills, conflict resolution, and teamwork."
-            },
-            {
-                "question": "Describe a situation where you had to learn a new technology quickly.",
-                "evaluation_prompt": "Evaluate for adaptability, learning agility, and initiative in problem-solving."
-            }
-        ],
-        "systems_design": [
-            {
-                "question": "Design a system that can handle millions of concurrent users for a social media platform.",
-                "evaluation_prompt": "Evaluate for scalability, data partitioning, caching strategies, and load balancing."
-            },
-            {
-                "question": "How would you architect a global content delivery network (CDN)?",
-                "evaluation_prompt": "Assess for understanding of network distribution, caching, and reliability on a global scale."
-            },
-            {
-                "question": "Design a fault-tolerant distributed storage system.",
-                "evaluation_prompt": "Evaluate for system reliability, data consistency, replication strategies, and recovery mechanisms."
-            },
-            {
-                "question": "How would you build a real-time analytics platform for processing streaming data?",
-                "evaluation_prompt": "Assess for scalability, low-latency processing, and effective data pipeline architecture."
-            },
-            {
-                "question": "Design an API gateway for managing microservices in a large-scale environment.",
-                "evaluation_prompt": "Evaluate for understanding of routing, security, rate limiting, and load balancing in microservices architectures."
-            }
-        ]
-    },
-    "Facebook": {
-        "technical": [
-            {
-                "question": "How would you design a scalable news feed system?",
-                "evaluation_prompt": "Evaluate for innovation, scalability, and real-time delivery mechanisms."
-            },
-            {
-                "question": "Explain how GraphQL differs from REST APIs.",
-                "evaluation_prompt": "Assess for technical clarity, understanding of API design, and trade-offs between approaches."
-            },
-            {
-                "question": "What are the core principles behind Facebook's React framework?",
-                "evaluation_prompt": "Evaluate for understanding of component-based design, performance optimization, and user interface development."
-            },
-            {
-                "question": "Describe the role of machine learning in content personalization.",
-                "evaluation_prompt": "Assess for understanding of algorithms, model training, and practical applications in enhancing user experience."
-            },
-            {
-                "question": "How would you ensure high availability in a distributed social media backend?",
-                "evaluation_prompt": "Evaluate for strategies on redundancy, failover, and overall system resilience."
-            }
-        ],
-        "general": [
-            {
-                "question": "Discuss the future trends in social media and their potential societal impacts.",
-                "evaluation_prompt": "Evaluate for a broad perspective, industry trends, and potential ethical implications."
-            },
-            {
-                "question": "How would you improve Facebook's user interface for better engagement?",
-                "evaluation_prompt": "Assess for creativity, user-centric design, and feasibility of implementation."
-            },
-            {
-                "question": "What is your opinion on data privacy and its effect on social media platforms?",
-                "evaluation_prompt": "Evaluate for insight into ethical, legal, and technical challenges surrounding data privacy."
-            },
-            {
-                "question": "Describe a project where you implemented innovative features for a web application.",
-                "evaluation_prompt": "Assess for innovation, technical execution, and impact on user experience."
-            },
-            {
-                "question": "How do you balance performance and usability in software design?",
-                "evaluation_prompt": "Evaluate for strategic thinking, technical insight, and a focus on end-user satisfaction."
-            }
-        ],
-        "behavioral": [
-            {
-                "question": "Explain a project where you had to make difficult technical trade-offs.",
-                "evaluation_prompt": "Evaluate for pragmatic decision-making, prioritization, and clear communication of trade-offs."
-            },
-            {
-                "question": "Describe a time when you disagreed with a team decision and how you handled it.",
-                "evaluation_prompt": "Assess for conflict resolution, assertiveness, and effective communication."
-            },
-            {
-                "question": "Tell me about a time when you had to manage multiple competing priorities.",
-                "evaluation_prompt": "Evaluate for time management, organizational skills, and stress handling."
-            },
-            {
-                "question": "How do you incorporate feedback into your work process?",
-                "evaluation_prompt": "Assess for openness to feedback, adaptability, and commitment to continuous improvement."
-            },
-            {
-                "question": "Give an example of a situation where you led a project or initiative.",
-                "evaluation_prompt": "Evaluate for leadership, initiative, and the ability to drive impactful results."
-            }
-        ],
-        "systems_design": [
-            {
-                "question": "How would you detect fake accounts at scale?",
-                "evaluation_prompt": "Evaluate for understanding of machine learning approaches, behavioral analysis, and graph-based detection methods."
-            },
-            {
-                "question": "Design a recommendation engine for Facebook Marketplace.",
-                "evaluation_prompt": "Assess for system design principles, algorithm selection, and data-driven decision making."
-            },
-            {
-                "question": "How would you architect a real-time messaging system?",
-                "evaluation_prompt": "Evaluate for scalability, latency management, and overall reliability in communication."
-            },
-            {
-                "question": "Design a scalable advertising platform for targeted campaigns.",
-                "evaluation_prompt": "Assess for integration with data analytics, system scalability, and performance optimization."
-            },
-            {
-                "question": "How would you design an infrastructure to support live video streaming?",
-                "evaluation_prompt": "Evaluate for technical complexity, performance optimization, and network bandwidth management."
-            }
-        ]
-    },
-    "Amazon": {
-        "technical": [
-            {
-                "question": "How would you design Amazon's recommendation system?",
-                "evaluation_prompt": "Evaluate for algorithmic understanding, scalability, and integration with customer data."
-            },
-            {
-                "question": "Describe how you would architect a distributed inventory management system.",
-                "evaluation_prompt": "Assess for understanding of distributed systems, consistency models, and fault tolerance."
-            },
-            {
-                "question": "What are the benefits of using serverless architectures in e-commerce?",
-                "evaluation_prompt": "Evaluate for technical insight, cost-benefit analysis, and scalability considerations."
-            },
-            {
-                "question": "Explain the concept of eventual consistency and its trade-offs.",
-                "evaluation_prompt": "Assess for clarity, technical depth, and practical implications in distributed systems."
-            },
-            {
-                "question": "How does AWS Lambda work and what are its key advantages?",
-                "evaluation_prompt": "Evaluate for understanding of serverless computing, use cases, and limitations."
-            }
-        ],
-        "general": [
-            {
-                "question": "Discuss the impact of cloud computing on modern business models.",
-                "evaluation_prompt": "Evaluate for breadth of understanding and market awareness."
-            },
-            {
-                "question": "How do you balance customer obsession with operational excellence?",
-                "evaluation_prompt": "Assess for alignment with Amazon's leadership principles and practical examples."
-            },
-            {
-                "question": "What trends do you see in the future of e-commerce?",
-                "evaluation_prompt": "Evaluate for market insight, innovative thinking, and strategic vision."
-            },
-            {
-                "question": "How would you improve the online shopping experience?",
-                "evaluation_prompt": "Assess for creativity, user experience design, and technical feasibility."
-            },
-            {
-                "question": "Describe your perspective on the role of AI in retail.",
-                "evaluation_prompt": "Evaluate for understanding of AI applications, business impact, and technical challenges."
-            }
-        ],
-        "behavioral": [
-            {
-                "question": "Tell me about a time when you had to make a decision with incomplete information.",
-                "evaluation_prompt": "Evaluate for decisiveness, risk-taking, and alignment with leadership principles."
-            },
-            {
-                "question": "Describe a situation where you received tough feedback and how you handled it.",
-                "evaluation_prompt": "Assess for self-awareness, resilience, and commitment to continuous improvement."
-            },
-            {
-                "question": "Give an example of a time when you had to work collaboratively under pressure.",
-                "evaluation_prompt": "Evaluate for teamwork, stress management, and effective communication."
-            },
-            {
-                "question": "How do you prioritize tasks when faced with tight deadlines?",
-                "evaluation_prompt": "Assess for time management, organizational skills, and balancing competing priorities."
-            },
-            {
-                "question": "Describe an instance where you identified a process improvement opportunity.",
-                "evaluation_prompt": "Evaluate for initiative, analytical thinking, and impact on operational efficiency."
-            }
-        ],
-        "systems_design": [
-            {
-                "question": "How would you optimize Amazon's delivery route planning?",
-                "evaluation_prompt": "Evaluate for algorithmic thinking, optimization techniques, and handling real-world constraints."
-            },
-            {
-                "question": "Design a high-availability order processing system.",
-                "evaluation_prompt": "Assess for understanding of distributed systems, failover mechanisms, and data integrity."
-            },
-            {
-                "question": "How would you architect a scalable recommendation platform?",
-                "evaluation_prompt": "Evaluate for system design, performance, and integration of data analysis."
-            },
-            {
-                "question": "Design an end-to-end solution for managing warehouse logistics.",
-                "evaluation_prompt": "Assess for operational excellence, automation, and scalability in a logistics context."
-            },
-            {
-                "question": "How would you design a secure payment processing system?",
-                "evaluation_prompt": "Evaluate for security principles, scalability, and ensuring user trust when handling sensitive data."
-            }
-        ]
-    },
-    "Microsoft": {
-        "technical": [
-            {
-                "question": "How would you design a collaborative document editing system like Microsoft Word Online?",
-                "evaluation_prompt": "Evaluate for technical depth, real-time synchronization, and conflict resolution strategies."
-            },
-            {
-                "question": "Explain the principles behind Microsoft's .NET framework.",
-                "evaluation_prompt": "Assess for understanding of framework features, language interoperability, and application scenarios."
-            },
-            {
-                "question": "Describe how Azure's cloud services support enterprise applications.",
-                "evaluation_prompt": "Evaluate for technical understanding of scalability, integration, and service offerings."
-            },
-            {
-                "question": "What are the key differences between SQL and NoSQL databases?",
-                "evaluation_prompt": "Assess for clarity, technical insight, and understanding of data management trade-offs."
-            },
-            {
-                "question": "How would you implement secure coding practices in software development?",
-                "evaluation_prompt": "Evaluate for awareness of security protocols, best practices, and risk mitigation strategies."
-            }
-        ],
-        "general": [
-            {
-                "question": "How would you improve Microsoft Teams?",
-                "evaluation_prompt": "Evaluate for product thinking, usability improvements, and innovative feature suggestions."
-            },
-            {
-                "question": "Discuss the future of cloud computing and its impact on enterprise software.",
-                "evaluation_prompt": "Assess for strategic vision, market trends, and technical implications."
-            },
-            {
-                "question": "What is your perspective on the role of AI in business productivity?",
-                "evaluation_prompt": "Evaluate for innovative thinking, practical applications, and potential impact on efficiency."
-            },
-            {
-                "question": "Describe a project where you integrated multiple technologies to create a seamless user experience.",
-                "evaluation_prompt": "Assess for innovation, technical breadth, and a strong focus on user-centric design."
-            },
-            {
-                "question": "How do you balance legacy systems with modern technological advancements?",
-                "evaluation_prompt": "Evaluate for strategic decision-making, technical insight, and adaptability to change."
-            }
-        ],
-        "behavioral": [
-            {
-                "question": "Describe a time when you had to work across teams to deliver a project.",
-                "evaluation_prompt": "Assess for collaboration, effective communication, and managing cross-functional projects."
-            },
-            {
-                "question": "Tell me about a situation where you had to learn a new technology quickly.",
-                "evaluation_prompt": "Evaluate for adaptability, learning agility, and initiative in overcoming technical challenges."
-            },
-            {
-                "question": "How do you handle constructive criticism in your work?",
-                "evaluation_prompt": "Assess for self-awareness, openness to feedback, and commitment to continuous improvement."
-            },
-            {
-                "question": "Give an example of a time when you had to step up and lead a project.",
-                "evaluation_prompt": "Evaluate for leadership qualities, initiative, and accountability."
-            },
-            {
-                "question": "Describe a scenario where you faced a significant challenge and how you overcame it.",
-                "evaluation_prompt": "Assess for problem-solving skills, resilience, and effective decision-making under pressure."
-            }
-        ],
-        "systems_design": [
-            {
-                "question": "Explain how you would design a cloud-based authentication system.",
-                "evaluation_prompt": "Evaluate for understanding of security protocols, scalability, and practical implementation in a cloud environment."
-            },
-            {
-                "question": "Design a robust and scalable microservices architecture for a large enterprise.",
-                "evaluation_prompt": "Assess for system design principles, service decoupling, and effective integration strategies."
-            },
-            {
-                "question": "How would you architect a real-time collaboration platform?",
-                "evaluation_prompt": "Evaluate for scalability, latency management, and ensuring a seamless user experience."
-            },
-            {
-                "question": "Design a secure and scalable data storage solution for enterprise applications.",
-                "evaluation_prompt": "Assess for understanding of storage architectures, redundancy, and performance optimization."
-            },
-            {
-                "question": "How would you build a platform to support IoT devices and data processing?",
-                "evaluation_prompt": "Evaluate for system scalability, real-time data ingestion, and processing capabilities."
-            }
-        ]
-    }
-}
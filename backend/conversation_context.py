@@ -0,0 +1,120 @@
+"""
+Context management for evaluator prompts.
+
+The evaluator sees the most recent turns of the conversation verbatim, while
+older turns are folded into a rolling summary stored on the session. This keeps
+prompt size bounded as an interview grows instead of resending the whole
+transcript, including every earlier evaluation, on each answer.
+"""
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from transcript import Transcript, estimate_tokens
+
+def format_conversation_history(history: Transcript) -> str:
+    """Format conversation history into a readable text format (kept up to date by the transcript)"""
+    return history.formatted_text()
+
+def select_summary_boundary(history: Transcript, summarized_turns: int, recent_turns: int) -> int:
+    """
+    Find how far the summary can be extended while keeping recent turns verbatim.
+
+    The boundary never moves past a pending (deferred) evaluation, so the
+    summary only ever covers a finished prefix of the history.
+
+    Args:
+        history: The conversation history
+        summarized_turns: Number of leading history entries already in the summary
+        recent_turns: Number of trailing history entries to keep verbatim
+
+    Returns:
+        Index of the first history entry that should stay out of the summary
+    """
+    boundary = max(len(history) - recent_turns, summarized_turns)
+    return max(min(boundary, history.finished_length()), summarized_turns)
+
+def build_context(
+    history: Transcript,
+    summary: str,
+    summarized_turns: int,
+    max_recent_turns: Optional[int] = None
+) -> Tuple[str, Dict[str, int]]:
+    """
+    Build the conversation context for a prompt from the summary and the unsummarized turns.
+
+    Args:
+        history: The conversation history
+        summary: Rolling summary of the first `summarized_turns` history entries
+        summarized_turns: Number of leading history entries covered by the summary
+        max_recent_turns: If set, unsummarized entries before the last `max_recent_turns`
+            are left out (used to trim prompts of sessions low on tokens)
+
+    Returns:
+        The formatted context and token statistics comparing it with the full history
+    """
+    start = summarized_turns
+    if max_recent_turns is not None:
+        start = max(start, len(history) - max_recent_turns)
+    recent = history[start:]
+
+    header = ""
+    if start > summarized_turns:
+        header = f"({start - summarized_turns} earlier turns omitted)\n\n"
+    if summary and summarized_turns:
+        header = f"Summary of earlier conversation:\n{summary}\n\nRecent conversation:\n{header}"
+
+    # Turn token counts are cached on the transcript, so only the header is counted here
+    return header + recent.formatted_text(), {
+        "full_tokens": history.token_count(),
+        "prompt_tokens": estimate_tokens(header) + recent.token_count()
+    }
+
+class ContextMetrics:
+    """Thread-safe counters for the tokens saved by context management, per company and interview type."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_interview: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def record_prompt(self, company: str, interview_type: str, stats: Dict[str, int]) -> None:
+        """Record the token statistics of one evaluator prompt."""
+        with self.lock:
+            counters = self._counters(company, interview_type)
+            counters["prompts"] += 1
+            counters["full_tokens"] += stats["full_tokens"]
+            counters["prompt_tokens"] += stats["prompt_tokens"]
+
+    def record_summary(self, company: str, interview_type: str, folded_turns: int, summary_tokens: int) -> None:
+        """Record one summarization pass and the prompt tokens it cost."""
+        with self.lock:
+            counters = self._counters(company, interview_type)
+            counters["summaries"] += 1
+            counters["folded_turns"] += folded_turns
+            counters["summary_tokens"] += summary_tokens
+
+    def _counters(self, company: str, interview_type: str) -> Dict[str, int]:
+        key = (company, interview_type.lower())
+        if key not in self.by_interview:
+            self.by_interview[key] = {"prompts": 0, "full_tokens": 0, "prompt_tokens": 0, "summaries": 0, "folded_turns": 0, "summary_tokens": 0}
+        return self.by_interview[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the totals and per-interview breakdown, including estimated net tokens saved."""
+        with self.lock:
+            breakdown = []
+            totals = {"prompts": 0, "full_tokens": 0, "prompt_tokens": 0, "summaries": 0, "folded_turns": 0, "summary_tokens": 0}
+            for (company, interview_type), counters in sorted(self.by_interview.items()):
+                breakdown.append({
+                    "company": company,
+                    "interview_type": interview_type,
+                    **counters,
+                    "tokens_saved": counters["full_tokens"] - counters["prompt_tokens"] - counters["summary_tokens"]
+                })
+                for name, value in counters.items():
+                    totals[name] += value
+
+        totals["tokens_saved"] = totals["full_tokens"] - totals["prompt_tokens"] - totals["summary_tokens"]
+        return {"totals": totals, "by_interview": breakdown}
+
+context_metrics = ContextMetrics()
@@ -0,0 +1,197 @@
+"""
+Evaluation result cache shared by all workers on a host.
+
+Practice users often resubmit the same (or nearly the same) answer to the same
+question. Evaluations are cached in a local SQLite database in WAL mode, so every
+gunicorn worker process reads and writes the same cache. Entries expire after a
+TTL and the least recently used entries are evicted beyond a size cap.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+from event_log import log_event
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'evaluation_cache.sqlite3')
+
+# Evict over-size entries every this many stores rather than on each one
+EVICTION_INTERVAL = 64
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer so trivially different submissions share a cache entry.
+
+    Unicode is NFKC-normalized and case-folded, punctuation is dropped and
+    whitespace is collapsed.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+def make_cache_key(
+    model: str,
+    company: str,
+    interview_type: str,
+    question: str,
+    evaluation_prompt: str,
+    answer: str,
+    previous_answers: Iterable[str]
+) -> str:
+    """
+    Build the cache key for one evaluation.
+
+    The key covers the evaluator model, the full evaluation prompt (so rubric
+    changes in evaluation_configs invalidate old entries), the question, the
+    normalized answer and the candidate's normalized earlier answers in the
+    session, which shape the conversation the evaluator sees.
+
+    Returns:
+        A hex digest identifying the evaluation
+    """
+    material = json.dumps([
+        model,
+        company,
+        interview_type.lower(),
+        question,
+        evaluation_prompt,
+        normalize_answer(answer),
+        [normalize_answer(previous) for previous in previous_answers]
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+class EvaluationCache:
+    """SQLite-backed LRU/TTL cache of evaluation outputs."""
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl_seconds: float = 7 * 24 * 3600, enabled: bool = True):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the database on first use."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None or getattr(self.local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=0.5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS evaluations_last_access ON evaluations (last_access)")
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached evaluation.
+
+        Args:
+            key: The cache key from make_cache_key()
+
+        Returns:
+            The cached evaluation output, or None on a miss
+        """
+        now = time.time()
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                "SELECT value FROM evaluations WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is not None:
+                connection.execute("UPDATE evaluations SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            # A busy or broken cache must never fail the request
+            log_event("evaluation_cache_lookup_failed", level=logging.WARNING, error=str(e))
+            self._count("errors")
+            return None
+
+        self._count("hits" if row is not None else "misses")
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an evaluation output.
+
+        Args:
+            key: The cache key from make_cache_key()
+            value: The JSON-serializable evaluation output
+        """
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO evaluations (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            with self.lock:
+                self.counters["stores"] += 1
+                evict = self.counters["stores"] % EVICTION_INTERVAL == 0
+            if evict:
+                self.evict()
+        except sqlite3.Error as e:
+            log_event("evaluation_cache_store_failed", level=logging.WARNING, error=str(e))
+            self._count("errors")
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and the least recently used entries beyond the size cap.
+
+        Returns:
+            The number of removed entries
+        """
+        connection = self._connection()
+        removed = connection.execute(
+            "DELETE FROM evaluations WHERE created_at <= ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        removed += connection.execute(
+            "DELETE FROM evaluations WHERE key IN ("
+            "SELECT key FROM evaluations ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        self._count("evictions", removed)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return this worker's hit-rate counters and the shared cache size."""
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        try:
+            entries = self._connection().execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "enabled": self.enabled
+        }
+
+evaluation_cache = EvaluationCache(
+    path=os.environ.get('EVALUATION_CACHE_PATH', DEFAULT_CACHE_PATH),
+    max_entries=int(os.environ.get('EVALUATION_CACHE_MAX_ENTRIES', '10000')),
+    ttl_seconds=float(os.environ.get('EVALUATION_CACHE_TTL_SECONDS', str(7 * 24 * 3600))),
+    enabled=os.environ.get('EVALUATION_CACHE', 'true').lower() in ('1', 'true', 'yes')
+)
@@ -1,264 +1,21 @@
 """
 Company-specific evaluation configurations for different interview types.
+
+Per-company configurations are defined in the question bank data files and
+served by question_registry; this module holds the defaults and the memoized
+prompt text derived from them. Configurations are frozen (read-only mappings
+and tuples, see question_registry.freeze()).
 """
 
-from typing import Dict, List, Any
+import json
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 
-# Define evaluation configurations by company and interview type
-evaluation_configs = {
-    "Google": {
-        "general": {
-            "structure": {
-                "sections": ["Strengths", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "1-5 scale where 5 is exceptional",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Communication Clarity",
-                    "description": "Ability to articulate thoughts in a clear, concise manner",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Problem-Solving Approach",
-                    "description": "Structured thinking and methodical approach to problems",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Culture Fit",
-                    "description": "Alignment with Google's collaborative and innovative culture",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Impact Focus",
-                    "description": "Emphasis on measurable results and impact in examples",
-                    "weight": 0.25
-                }
-            ],
-            "evaluation_prompt_suffix": "Focus on providing actionable feedback with specific examples from the candidate's responses. For Google general interviews, emphasize the importance of data-driven decisions and user-centric thinking."
-        },
-        "technical": {
-            "structure": {
-                "sections": ["Technical Accuracy", "Problem-Solving Approach", "Communication", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "1-5 scale where 5 is exceptional",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Technical Knowledge",
-                    "description": "Depth and accuracy of technical knowledge",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Algorithm Efficiency",
-                    "description": "Ability to optimize solutions and understand complexity",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Code Quality",
-                    "description": "Clean, maintainable code with good practices",
-                    "weight": 0.2
-                },
-                {
-                    "name": "System Design",
-                    "description": "Understanding of scalable architecture and design patterns",
-                    "weight": 0.2
-                }
-            ],
-            "evaluation_prompt_suffix": "Evaluate the candidate's technical depth and ability to handle edge cases. For Google technical interviews, emphasize scalability considerations and optimization techniques."
-        },
-        "system_design": {
-            "structure": {
-                "sections": ["Requirements Analysis", "Architecture Design", "Component Breakdown", "Scalability Considerations", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "1-5 scale where 5 is exceptional",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Requirements Gathering",
-                    "description": "Ability to clarify and define system requirements",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Architectural Thinking",
-                    "description": "High-level design and component interactions",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Scalability Focus",
-                    "description": "Consideration for system growth and scaling challenges",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Trade-off Analysis",
-                    "description": "Understanding of design trade-offs and their implications",
-                    "weight": 0.2
-                }
-            ],
-            "evaluation_prompt_suffix": "Assess the candidate's ability to design large-scale systems. For Google system design interviews, emphasize distributed systems principles and Google-scale considerations."
-        },
-        "behavioral": {
-            "structure": {
-                "sections": ["Leadership", "Teamwork", "Problem Resolution", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "1-5 scale where 5 is exceptional",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "STAR Format",
-                    "description": "Clear articulation of Situation, Task, Action, Result",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Leadership",
-                    "description": "Demonstration of initiative and leadership qualities",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Collaboration",
-                    "description": "Ability to work effectively with diverse teams",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Adaptability",
-                    "description": "Flexibility in challenging situations and learning from failures",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Impact",
-                    "description": "Evidence of measurable impact in previous roles",
-                    "weight": 0.2
-                }
-            ],
-            "evaluation_prompt_suffix": "Evaluate the candidate's behavioral responses using the STAR method. For Google behavioral interviews, look for examples of innovation, teamwork, and handling ambiguity."
-        }
-    },
-    "Amazon": {
-        "general": {
-            "structure": {
-                "sections": ["Leadership Principles Alignment", "Strengths", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "Does Not Meet, Meets, Exceeds, Strongly Exceeds",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Customer Obsession",
-                    "description": "Focus on understanding and solving customer needs",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Ownership",
-                    "description": "Taking responsibility and thinking long-term",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Bias for Action",
-                    "description": "Speed in decision-making and execution",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Dive Deep",
-                    "description": "Getting to the root of problems with data",
-                    "weight": 0.25
-                }
-            ],
-            "evaluation_prompt_suffix": "Evaluate the candidate against Amazon's Leadership Principles. For each response, identify which principles are demonstrated and which are missing."
-        },
-        "technical": {
-            "structure": {
-                "sections": ["Technical Proficiency", "Leadership Principles", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "Does Not Meet, Meets, Exceeds, Strongly Exceeds",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Technical Depth",
-                    "description": "Deep understanding of technical concepts",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Problem-Solving",
-                    "description": "Logical approach to technical challenges",
-                    "weight": 0.3
-                },
-                {
-                    "name": "Operational Excellence",
-                    "description": "Focus on scalability, reliability, and performance",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Leadership Principles",
-                    "description": "Alignment with Amazon's leadership principles in technical context",
-                    "weight": 0.2
-                }
-            ],
-            "evaluation_prompt_suffix": "For Amazon technical interviews, evaluate both technical skills and alignment with Leadership Principles, especially 'Dive Deep' and 'Invent and Simplify'."
-        },
-        "system_design": {
-            "structure": {
-                "sections": ["Requirements Understanding", "Architecture", "Scalability", "Leadership Principles", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "Does Not Meet, Meets, Exceeds, Strongly Exceeds",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Customer Focus",
-                    "description": "Design decisions centered around customer needs",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Scalability",
-                    "description": "Architecture that can handle Amazon-scale growth",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Operational Excellence",
-                    "description": "Consideration for monitoring, deployment, and reliability",
-                    "weight": 0.25
-                },
-                {
-                    "name": "Cost Optimization",
-                    "description": "Efficient use of resources and awareness of trade-offs",
-                    "weight": 0.25
-                }
-            ],
-            "evaluation_prompt_suffix": "For Amazon system design interviews, assess the candidate's ability to design cost-effective, scalable systems that prioritize customer experience. Look for 'Frugality' and 'Invent and Simplify' principles."
-        },
-        "behavioral": {
-            "structure": {
-                "sections": ["Situation/Task", "Action", "Result", "Leadership Principles Demonstrated", "Areas for Improvement", "Overall Assessment"],
-                "rating_scale": "Does Not Meet, Meets, Exceeds, Strongly Exceeds",
-                "include_score": True
-            },
-            "criteria": [
-                {
-                    "name": "Leadership Principles",
-                    "description": "Alignment with Amazon's 16 leadership principles",
-                    "weight": 0.4
-                },
-                {
-                    "name": "STAR Format",
-                    "description": "Clear articulation of Situation, Task, Action, Result",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Data-Driven",
-                    "description": "Use of metrics and data to demonstrate impact",
-                    "weight": 0.2
-                },
-                {
-                    "name": "Ownership",
-                    "description": "Taking responsibility for outcomes and learnings",
-                    "weight": 0.2
-                }
-            ],
-            "evaluation_prompt_suffix": "For Amazon behavioral interviews, analyze responses against the 16 Leadership Principles. Each answer should demonstrate at least one principle, with specific examples and measurable results."
-        }
-    }
-}
+from question_registry import registry, canonical_interview_type, freeze
 
 # Default configuration for companies without specific configurations
-default_eval_config = {
+default_eval_config = freeze({
     "structure": {
         "sections": ["Strengths", "Areas for Improvement", "Overall Assessment"],
         "rating_scale": "1-5 scale where 5 is exceptional",
@@ -287,12 +44,29 @@ default_eval_config = {
         }
     ],
     "evaluation_prompt_suffix": "Provide balanced feedback with specific examples from the candidate's responses. Highlight both strengths and concrete areas for improvement."
+})
+
+# Evaluation prompt for questions that are not in the company's question bank
+default_evaluation_prompt = "Evaluate the answer for correctness, technical depth and clarity."
+
+# Default context management settings for evaluator prompts.
+# History entries beyond the most recent `recent_turns` are folded into a rolling
+# summary, `summary_batch_turns` entries at a time. Override per company and
+# interview type with a "context" key in the evaluation configuration.
+default_context_config = {
+    "enabled": True,
+    "recent_turns": 9,
+    "summary_batch_turns": 3,
+    "summary_max_words": 250
 }
 
-def get_evaluation_config(company: str, interview_type: str) -> Dict[str, Any]:
+def get_evaluation_config(company: str, interview_type: str) -> Mapping[str, Any]:
     """
     Get the evaluation configuration for a specific company and interview type.
     
+    Interview type aliases (e.g. "System Design", "coding") are resolved by the
+    registry; types without their own configuration use the company's general one.
+    
     Args:
         company: The company name
         interview_type: The interview type
@@ -300,38 +74,22 @@ def get_evaluation_config(company: str, interview_type: str) -> Dict[str, Any]:
     Returns:
         The evaluation configuration
     """
-    company_config = evaluation_configs.get(company)
-    if not company_config:
-        return default_eval_config
-        
-    interview_type = interview_type.lower()
-    interview_config = company_config.get(interview_type)
-    if not interview_config:
-        # Try to find a close match
-        if interview_type in ['system_design', 'system design', 'systems design']:
-            interview_config = company_config.get('system_design')
-        elif interview_type in ['tech', 'technical', 'coding']:
-            interview_config = company_config.get('technical')
-        elif interview_type in ['behavior', 'behavioral', 'leadership']:
-            interview_config = company_config.get('behavioral')
-        else:
-            interview_config = company_config.get('general')
-            
-    return interview_config or default_eval_config
+    return (
+        registry.get_evaluation_config(company, interview_type)
+        or registry.get_evaluation_config(company, "general")
+        or default_eval_config
+    )
 
-def build_evaluation_prompt(company: str, interview_type: str, base_prompt: str) -> str:
+def render_evaluation_guidance(config: Mapping[str, Any]) -> str:
     """
-    Build an evaluation prompt by appending company-specific guidance.
+    Render the criteria, structure and suffix text that is appended to every evaluation prompt.
     
     Args:
-        company: The company name
-        interview_type: The interview type
-        base_prompt: The base evaluation prompt
+        config: An evaluation configuration
     
     Returns:
-        The enhanced evaluation prompt
+        The guidance text for the configuration
     """
-    config = get_evaluation_config(company, interview_type)
     suffix = config.get('evaluation_prompt_suffix', '')
     
     criteria_text = "\n\nEvaluation Criteria:\n"
@@ -346,5 +104,150 @@ def build_evaluation_prompt(company: str, interview_type: str, base_prompt: str)
     if structure.get('include_score', False):
         structure_text += f"\nPlease include a rating using this scale: {structure.get('rating_scale', '1-5')}"
     
-    enhanced_prompt = f"{base_prompt}{criteria_text}{structure_text}\n\n{suffix}"
-    return enhanced_prompt
\ No newline at end of file
+    return f"{criteria_text}{structure_text}\n\n{suffix}"
+
+# Memoized prompt text, keyed by canonical company and interview type. Everything
+# derived from a company's configuration is computed once and dropped when the
+# registry reloads that company's data file. Text is built outside the lock (a
+# build may itself reload a data file) and only stored if no invalidation
+# happened meanwhile, so a build racing a reload never stores stale text.
+_cache_lock = threading.Lock()
+# Invalidation counts, of all companies and by company
+_cache_generation = 0
+_company_generations: Dict[str, int] = {}
+_guidance_cache: Dict[Tuple[str, str], str] = {}
+_feedback_text_cache: Dict[Tuple[str, str], Tuple[str, str]] = {}
+_compiled_prompts: Dict[str, Mapping[Tuple[str, str], str]] = {}
+_NO_PROMPTS: Mapping[Tuple[str, str], str] = MappingProxyType({})
+
+def _cache_key(company: str, interview_type: str) -> Tuple[str, str]:
+    # Sessions carry the registry's company name, so only the interview type needs resolving
+    return company, canonical_interview_type(interview_type)
+
+def _generation(company: str) -> Tuple[int, int]:
+    return _cache_generation, _company_generations.get(company, 0)
+
+def _store_if_current(cache: Dict[Any, Any], key: Any, value: Any, company: str, generation: Tuple[int, int]) -> None:
+    """Store a built value unless the company's cached text was invalidated since `generation` was read."""
+    with _cache_lock:
+        if generation == _generation(company):
+            cache[key] = value
+
+def _get_evaluation_guidance(company: str, interview_type: str) -> str:
+    """Return the memoized guidance text for a company and interview type."""
+    key = _cache_key(company, interview_type)
+    guidance = _guidance_cache.get(key)
+    if guidance is None:
+        generation = _generation(key[0])
+        guidance = render_evaluation_guidance(get_evaluation_config(company, interview_type))
+        _store_if_current(_guidance_cache, key, guidance, key[0], generation)
+    return guidance
+
+def build_evaluation_prompt(company: str, interview_type: str, base_prompt: str) -> str:
+    """
+    Build an evaluation prompt by appending company-specific guidance.
+    
+    Prompts for questions in the company's question bank are served from an
+    immutable per-company cache; anything else is built from the memoized
+    guidance text.
+    
+    Args:
+        company: The company name
+        interview_type: The interview type
+        base_prompt: The base evaluation prompt
+    
+    Returns:
+        The enhanced evaluation prompt
+    """
+    company_key, type_key = _cache_key(company, interview_type)
+    enhanced_prompt = _compiled_prompts.get(company_key, _NO_PROMPTS).get((type_key, base_prompt))
+    if enhanced_prompt is None:
+        enhanced_prompt = f"{base_prompt}{_get_evaluation_guidance(company, interview_type)}"
+    return enhanced_prompt
+
+def get_feedback_config_text(company: str, interview_type: str) -> Tuple[str, str]:
+    """
+    Get the JSON-rendered structure and criteria used in the final feedback prompt.
+    
+    Args:
+        company: The company name
+        interview_type: The interview type
+    
+    Returns:
+        Tuple of (structure JSON, criteria JSON)
+    """
+    key = _cache_key(company, interview_type)
+    texts = _feedback_text_cache.get(key)
+    if texts is None:
+        generation = _generation(key[0])
+        config = get_evaluation_config(company, interview_type)
+        # default=dict renders the frozen mappings as JSON objects
+        texts = (
+            json.dumps(config.get('structure', {}), indent=2, default=dict),
+            json.dumps(config.get('criteria', []), indent=2, default=dict)
+        )
+        _store_if_current(_feedback_text_cache, key, texts, key[0], generation)
+    return texts
+
+def precompile_evaluation_prompts(company: str) -> int:
+    """
+    Precompile the evaluation prompt of every question in a company's question bank.
+    
+    Called by the registry whenever it loads or reloads the company's data file.
+    
+    Args:
+        company: The company name
+    
+    Returns:
+        The number of compiled prompts
+    """
+    invalidate_prompt_cache(company)
+    generation = _generation(company)
+    bank = registry.get_company(company)
+    compiled = {}
+    if bank is not None:
+        for interview_type, questions in bank.questions.items():
+            guidance = _get_evaluation_guidance(bank.name, interview_type)
+            for question in questions:
+                compiled[(interview_type, question.evaluation_prompt)] = f"{question.evaluation_prompt}{guidance}"
+    
+    _store_if_current(_compiled_prompts, company, MappingProxyType(compiled), company, generation)
+    return len(compiled)
+
+def invalidate_prompt_cache(company: Optional[str] = None) -> None:
+    """
+    Drop memoized prompt text after evaluation configurations or question banks change.
+    
+    Args:
+        company: Only drop the text derived from this company's configuration
+    """
+    global _cache_generation
+    with _cache_lock:
+        if company is None:
+            _cache_generation += 1
+            _guidance_cache.clear()
+            _feedback_text_cache.clear()
+            _compiled_prompts.clear()
+            return
+        _company_generations[company] = _company_generations.get(company, 0) + 1
+        for cache in (_guidance_cache, _feedback_text_cache):
+            for key in list(cache):
+                if key[0] == company:
+                    cache.pop(key, None)
+        _compiled_prompts.pop(company, None)
+
+registry.add_listener(precompile_evaluation_prompts)
+
+def get_context_config(company: str, interview_type: str) -> Dict[str, Any]:
+    """
+    Get the context management settings for a specific company and interview type.
+    
+    Args:
+        company: The company name
+        interview_type: The interview type
+    
+    Returns:
+        The default context settings merged with any configured overrides
+    """
+    config = get_evaluation_config(company, interview_type)
+    return {**default_context_config, **config.get('context', {})}
\ No newline at end of file
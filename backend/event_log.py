@@ -0,0 +1,188 @@
+"""
+Structured, non-blocking event logging for the request paths.
+
+log_event() records one event as a JSON line on stdout, with the route and
+session ID it belongs to:
+
+    {"ts": "2025-01-01T12:00:00.123Z", "level": "info", "event": "answer_evaluated",
+     "route": "/api/answer", "session_id": "...", "question_number": 2, ...}
+
+The request thread only puts the record on a bounded in-memory queue; a
+background thread (logging.handlers.QueueListener) serializes and writes it.
+When the writer falls behind and the queue is full, events are dropped and
+counted instead of blocking the request, and the writer reports how many were
+lost. Records are serialized on the writer thread, so pass values that are not
+modified after logging.
+
+Large values are kept in check in two ways: every string is truncated to
+LOG_MAX_FIELD_CHARS characters, and full request and response payloads (the
+`payload` argument) are only included for a LOG_PAYLOAD_SAMPLE_RATE share of
+events. Set LOG_ENABLED=false to turn event logging off.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+import logging.handlers
+from typing import Any, Optional
+
+from flask import has_request_context, request
+
+LOG_ENABLED = os.environ.get('LOG_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_MAX_FIELD_CHARS = int(os.environ.get('LOG_MAX_FIELD_CHARS', '200'))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.environ.get('LOG_PAYLOAD_SAMPLE_RATE', '0.05'))
+LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE', '10000'))
+
+# Containers in payloads are cut to this many items
+MAX_ITEMS = 20
+
+logger = logging.getLogger("interview.events")
+logger.propagate = False
+logger.setLevel(LOG_LEVEL if LOG_ENABLED else logging.CRITICAL + 1)
+
+def truncate(value: Any, max_chars: int = LOG_MAX_FIELD_CHARS) -> Any:
+    """Return a copy of a JSON-like value with long strings and containers cut short."""
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"{value[:max_chars]}...(+{len(value) - max_chars} chars)"
+    if isinstance(value, dict):
+        items = list(value.items())
+        truncated = {str(key): truncate(item, max_chars) for key, item in items[:MAX_ITEMS]}
+        if len(items) > MAX_ITEMS:
+            truncated["..."] = f"+{len(items) - MAX_ITEMS} keys"
+        return truncated
+    if isinstance(value, (list, tuple)):
+        truncated = [truncate(item, max_chars) for item in value[:MAX_ITEMS]]
+        if len(value) > MAX_ITEMS:
+            truncated.append(f"...(+{len(value) - MAX_ITEMS} items)")
+        return truncated
+    return value
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats event records as single JSON lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname.lower(),
+            "event": record.getMessage()
+        }
+        line.update(truncate(getattr(record, "fields", {})))
+        if record.exc_text:
+            line["traceback"] = record.exc_text
+        return json.dumps(line, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records when the queue is full instead of blocking."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting happens on the writer thread; only tracebacks must be rendered
+        # here, while the frames they refer to still exist
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonLinesHandler(logging.StreamHandler):
+    """Writes event records, reporting events dropped since the previous write."""
+
+    def __init__(self, queue_handler: DroppingQueueHandler):
+        super().__init__(sys.stdout)
+        self.setFormatter(JsonLinesFormatter())
+        self.queue_handler = queue_handler
+        self.reported_drops = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        dropped = self.queue_handler.dropped
+        if dropped > self.reported_drops:
+            notice = logger.makeRecord(logger.name, logging.WARNING, __file__, 0, "log_events_dropped", None, None)
+            notice.fields = {"count": dropped - self.reported_drops}
+            self.reported_drops = dropped
+            super().emit(notice)
+        super().emit(record)
+
+_lock = threading.Lock()
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_owner_pid: Optional[int] = None
+
+def _start() -> None:
+    """Start the writer thread for this process (again, in forked workers)."""
+    global _handler, _listener, _owner_pid
+    with _lock:
+        if _owner_pid == os.getpid():
+            return
+        if _handler is not None:
+            logger.removeHandler(_handler)
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        _handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, JsonLinesHandler(_handler))
+        _listener.start()
+        logger.addHandler(_handler)
+        _owner_pid = os.getpid()
+
+def flush() -> None:
+    """Write out all queued events and stop the writer (called at exit)."""
+    global _owner_pid
+    with _lock:
+        if _listener is not None and _owner_pid == os.getpid():
+            try:
+                _listener.stop()
+            except queue.Full:
+                # No room for the stop marker; the daemon writer ends with the process
+                pass
+            _owner_pid = None
+
+atexit.register(flush)
+
+def log_event(
+    event: str,
+    session_id: Optional[str] = None,
+    level: int = logging.INFO,
+    payload: Any = None,
+    exc_info: bool = False,
+    **fields: Any
+) -> None:
+    """
+    Log one event without blocking the calling thread.
+
+    Args:
+        event: Event name (e.g. "answer_received")
+        session_id: The interview session the event belongs to
+        level: Logging level of the event
+        payload: Full request or response body; only logged for a sample of events
+        exc_info: Include the traceback of the exception being handled
+        **fields: Further JSON-serializable fields of the event
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _owner_pid != os.getpid():
+        _start()
+
+    context = {}
+    if has_request_context():
+        context["route"] = request.url_rule.rule if request.url_rule is not None else request.path
+    if session_id is not None:
+        context["session_id"] = session_id
+    context.update(fields)
+    if payload is not None and random.random() < LOG_PAYLOAD_SAMPLE_RATE:
+        context["payload"] = payload
+    logger.log(level, event, exc_info=exc_info, extra={"fields": context})
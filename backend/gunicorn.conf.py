@@ -0,0 +1,44 @@
+"""
+Gunicorn settings for the interview API, read from the current directory:
+
+    gunicorn -w 4 -b 0.0.0.0:5000 app_with_voice:app
+
+GUNICORN_PRELOAD=true loads the app once in the master process before the
+workers are forked: the views, the Agents SDK and every question bank (frozen,
+see question_registry.py). gc.freeze() then moves everything allocated so far
+out of reach of the garbage collector, whose full collections would otherwise
+write to every tracked object and so copy the pages holding them into each
+worker. The workers share these pages instead of each loading its own copy.
+GC_FREEZE=false preloads without freezing. Set GUNICORN_PRELOAD rather than
+passing --preload, so the app is loaded eagerly in the master.
+
+Without preload, each worker loads the app in the background once it has booted
+(APP_WARM_UP, see app_factory.py).
+
+With PROMETHEUS_MULTIPROC_DIR set, the metrics of exited workers are dropped.
+"""
+
+import gc
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+GC_FREEZE = os.environ.get('GC_FREEZE', 'true').lower() in ('1', 'true', 'yes')
+
+# Applies where the app is created: in the master with preload, in each worker otherwise
+os.environ.setdefault('APP_WARM_UP', 'eager' if preload_app else 'background')
+
+if preload_app and GC_FREEZE:
+    # Collections in the master before the freeze would only free objects and leave holes in shared pages
+    gc.disable()
+
+def pre_fork(server, worker):
+    if server.cfg.preload_app and GC_FREEZE:
+        gc.freeze()
+
+def post_fork(server, worker):
+    gc.enable()
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,1470 @@
+"""
+Interview API views and agent calls, shared by app.py and app_with_voice.py.
+
+The views are registered by app_factory.create_app(), which imports this module
+on the first request that needs it (or in a warm-up hook), so that importing the
+app does not load the Agents SDK or build the agents. Voice interviews are
+enabled per app with the VOICE_INTERVIEWS config flag.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import concurrent.futures
+
+from flask import current_app, request, session, jsonify, Response, stream_with_context
+import uuid
+from typing import List, Optional, Dict, Any, Tuple, Union, AsyncIterator
+from pydantic import BaseModel, ConfigDict, Field
+
+from agents import Agent
+from openai.types.responses import ResponseTextDeltaEvent
+
+import tracing
+# Shared event loop for running agent coroutines from Flask handlers
+from async_runtime import run_async, iterate_async, submit
+# Admission control in front of every agent call
+from agent_runner import run_agent, streamed_agent_run, stream_events, deadline_for, resolve_deadline, call_latencies
+from model_router import model_router, DEFAULT_MODELS
+from llm_limiter import llm_limiter, Priority, LLMOverloaded
+from streaming import format_sse, JsonStringFieldExtractor
+import metrics
+from event_log import log_event
+
+# Import our company-specific question banks and evaluation configurations
+from question_registry import registry, canonical_interview_type, BankQuestion, QuestionBankChanged
+from evaluation_configs import (
+    build_evaluation_prompt, get_feedback_config_text, get_context_config, default_evaluation_prompt
+)
+from evaluation_cache import evaluation_cache, make_cache_key
+from session_store import create_session_store, SessionConflict, SessionNotFound
+from conversation_context import (
+    format_conversation_history, build_context, select_summary_boundary,
+    estimate_tokens, context_metrics
+)
+from transcript import Role, Transcript, new_transcript
+from token_budget import (
+    TokenAccount, BudgetLevel, TokenBudgetExceeded, add_token_usage, new_token_usage,
+    budget_level_for_call, record_usage, token_metrics
+)
+
+# Session storage (in-memory by default, SQLite to share sessions across workers)
+sessions = create_session_store()
+
+# How often idle sessions are expired by the background sweeper
+SESSION_SWEEP_INTERVAL = float(os.environ.get('SESSION_SWEEP_INTERVAL', '60'))
+
+# Define Pydantic models for structured data
+class Question(BaseModel):
+    question: str
+    evaluation_prompt: str
+
+class InterviewSession(BaseModel):
+    session_id: str
+    company: str
+    interview_type: str
+    bank: List[str]
+    current_index: int
+    transcript: Dict[str, Any]
+    is_voice_mode: bool = False
+
+class InterviewRequest(BaseModel):
+    company: str
+    interview_type: str
+    is_voice_mode: bool = False
+
+class EvaluationInput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    candidate_answer: str
+    evaluation_prompt: str
+    conversation_history: Transcript
+    company: str
+    interview_type: str
+    context_summary: str = ""
+    summarized_turns: int = 0
+    question: str = ""
+    bypass_cache: bool = False
+    max_recent_turns: Optional[int] = None
+
+class EvaluationOutput(BaseModel):
+    evaluation: str = Field(..., description="The feedback on the candidate's answer.")
+    follow_up_questions: Optional[List[str]] = Field(None, description="Optional follow-up questions to ask the candidate.")
+
+class ConversationSummary(BaseModel):
+    summary: str = Field(..., description="Condensed summary of the earlier interview conversation.")
+
+class FinalFeedbackOutput(BaseModel):
+    feedback: str = Field(..., description="Comprehensive feedback on the candidate's overall interview performance.")
+    strengths: List[str] = Field(..., description="List of the candidate's key strengths.")
+    areas_for_improvement: List[str] = Field(..., description="List of areas where the candidate can improve.")
+    overall_rating: Optional[str] = Field(None, description="Overall rating of the candidate's performance.")
+
+class FinalFeedbackInput(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+    
+    conversation_history: Transcript
+    company: str
+    interview_type: str
+    draft: Optional[FinalFeedbackOutput] = None
+    draft_turns: int = 0
+
+# Create specialized agents
+evaluator_agent = Agent(
+    name="EvaluatorAgent",
+    instructions="""You are an expert interviewer evaluating a candidate's response. 
+    Provide constructive feedback based on the company's criteria. Be specific, 
+    highlight strengths, and suggest improvements. Your feedback should be 
+    professional and helpful, focusing on both content and delivery.
+    
+    If appropriate, include 1-3 follow-up questions that could be asked to the candidate
+    to explore areas that need more depth or clarification.
+    
+    Structure your evaluation according to the provided evaluation criteria and structure.
+    """,
+    model=DEFAULT_MODELS["evaluator"],
+    output_type=EvaluationOutput
+)
+
+feedback_agent = Agent(
+    name="FeedbackAgent",
+    instructions="""You are an expert interviewer providing a final evaluation for 
+    an interview. Summarize the candidate's performance based on the company's 
+    evaluation criteria, highlighting strengths and areas for improvement. 
+    Your feedback should be comprehensive, specific, and constructive, helping 
+    the candidate understand their performance and how to improve.
+    
+    Structure your feedback according to the provided evaluation structure, and include:
+    1. A comprehensive written assessment
+    2. A bullet-point list of key strengths
+    3. A bullet-point list of specific areas for improvement
+    4. An overall rating if requested in the evaluation structure
+    """,
+    model=DEFAULT_MODELS["feedback"],
+    output_type=FinalFeedbackOutput
+)
+
+summarizer_agent = Agent(
+    name="SummarizerAgent",
+    instructions="""You condense the earlier part of a mock interview so later evaluations 
+    can refer to it without the full transcript. Keep the questions asked, the key points 
+    of each candidate answer, and the main strengths and weaknesses noted by the interviewer. 
+    Be factual and concise; do not add new judgements.
+    """,
+    model=DEFAULT_MODELS["summarizer"],
+    output_type=ConversationSummary
+)
+
+def build_evaluator_prompt(input_data: EvaluationInput) -> str:
+    """
+    Builds the evaluator agent's prompt for a candidate's answer.
+    
+    Args:
+        input_data: Contains the candidate's answer, evaluation prompt, and conversation history
+    
+    Returns:
+        str: The prompt to send to the evaluator agent
+    """
+    # Enhance the evaluation prompt with company-specific configuration
+    enhanced_prompt = build_evaluation_prompt(
+        input_data.company, 
+        input_data.interview_type,
+        input_data.evaluation_prompt
+    )
+    
+    # Recent turns verbatim, older turns through the rolling summary
+    conversation_context, context_stats = build_context(
+        input_data.conversation_history,
+        input_data.context_summary,
+        input_data.summarized_turns,
+        input_data.max_recent_turns
+    )
+    context_metrics.record_prompt(input_data.company, input_data.interview_type, context_stats)
+    
+    return f"""
+        Company: {input_data.company}
+        Interview Type: {input_data.interview_type}
+        
+        Conversation History:
+        {conversation_context}
+        
+        Candidate's Answer: 
+        "{input_data.candidate_answer}"
+        
+        Evaluation Criteria:
+        {enhanced_prompt}
+        
+        Please evaluate the candidate's answer based on the provided criteria.
+        If appropriate, include 1-3 follow-up questions that could be asked to explore areas that need more depth or clarification.
+        """
+
+def get_evaluation_cache_key(input_data: EvaluationInput, model: str) -> Optional[str]:
+    """Return the evaluation cache key for an answer graded by a model, or None if the cache should be bypassed."""
+    if not evaluation_cache.enabled or input_data.bypass_cache:
+        return None
+    
+    # Everything before the current answer (the last history entry)
+    previous_answers = input_data.conversation_history[:-1].candidate_answers()
+    return make_cache_key(
+        model,
+        input_data.company,
+        input_data.interview_type,
+        input_data.question,
+        build_evaluation_prompt(input_data.company, input_data.interview_type, input_data.evaluation_prompt),
+        input_data.candidate_answer,
+        previous_answers
+    )
+
+def apply_token_budget(input_data: EvaluationInput, account: Optional[TokenAccount]) -> Tuple[EvaluationInput, bool]:
+    """
+    Adapt an answer evaluation to the tokens its session has left.
+    
+    Returns:
+        The input, with fewer verbatim turns once the session is past its trim level,
+        and whether the call should use the fallback model
+    """
+    level = budget_level_for_call(account)
+    if level >= BudgetLevel.TRIM:
+        input_data = input_data.model_copy(update={"max_recent_turns": account.trimmed_recent_turns})
+    return input_data, level >= BudgetLevel.FALLBACK
+
+async def evaluate_answer(
+    input_data: EvaluationInput,
+    priority: Priority = Priority.INTERACTIVE,
+    key: str = "",
+    deadline: Optional[float] = None,
+    account: Optional[TokenAccount] = None
+) -> EvaluationOutput:
+    """
+    Evaluates the candidate's answer using the OpenAI Agents SDK.
+    
+    Args:
+        input_data: Contains the candidate's answer, evaluation prompt, and conversation history
+        priority: Queueing priority of the agent call
+        key: Fairness key for queueing, usually the session ID
+        deadline: time.monotonic() deadline of the call; defaults to the budget of the priority
+        account: The session's token account; the call's tokens are added to it, and a
+            session low on tokens gets a trimmed prompt or the fallback model
+    
+    Returns:
+        EvaluationOutput: Evaluation feedback and optional follow-up questions
+    """
+    with tracing.span("evaluate_answer", company=input_data.company, interview_type=input_data.interview_type) as span:
+        # Serve repeated answers from the evaluation cache
+        model = model_router.model_for("evaluator", input_data.company, input_data.interview_type)
+        cache_key = get_evaluation_cache_key(input_data, model)
+        cached = evaluation_cache.get(cache_key) if cache_key else None
+        span.set_attribute("cache_hit", cached is not None)
+        if cached is not None:
+            return EvaluationOutput(**cached)
+        
+        # Construct prompt for the evaluator agent
+        input_data, over_budget = apply_token_budget(input_data, account)
+        prompt = build_evaluator_prompt(input_data)
+        deadline = resolve_deadline(deadline, priority)
+        agent = model_router.route(evaluator_agent, "evaluator", input_data.company, input_data.interview_type, deadline, over_budget)
+        
+        # Use tracing to help with debugging (SDK traces are sampled with the request)
+        with tracing.sdk_trace("Evaluate candidate answer"):
+            # Run the evaluator agent
+            result = await run_agent(agent, prompt, priority, key, deadline)
+            record_usage(result.context_wrapper.usage, "evaluator", input_data.company, input_data.interview_type, account)
+            evaluation = result.final_output_as(EvaluationOutput)
+            
+            # Evaluations from a fallback model are not cached under the configured model
+            if cache_key and agent.model == model:
+                evaluation_cache.set(cache_key, evaluation.model_dump())
+            return evaluation
+
+async def stream_evaluation(
+    input_data: EvaluationInput,
+    priority: Priority = Priority.INTERACTIVE,
+    key: str = "",
+    deadline: Optional[float] = None,
+    account: Optional[TokenAccount] = None
+) -> AsyncIterator[Union[str, EvaluationOutput]]:
+    """
+    Streams the evaluation of the candidate's answer as it is generated.
+    
+    Args:
+        input_data: Contains the candidate's answer, evaluation prompt, and conversation history
+        priority: Queueing priority of the agent call
+        key: Fairness key for queueing, usually the session ID
+        deadline: time.monotonic() deadline of the whole stream; defaults to the budget of the priority
+        account: The session's token account (see evaluate_answer)
+    
+    Yields:
+        str chunks of the evaluation text, followed by the parsed EvaluationOutput
+    """
+    with tracing.span("stream_evaluation", company=input_data.company, interview_type=input_data.interview_type) as span:
+        model = model_router.model_for("evaluator", input_data.company, input_data.interview_type)
+        cache_key = get_evaluation_cache_key(input_data, model)
+        cached = evaluation_cache.get(cache_key) if cache_key else None
+        span.set_attribute("cache_hit", cached is not None)
+        if cached is not None:
+            evaluation = EvaluationOutput(**cached)
+            yield evaluation.evaluation
+            yield evaluation
+            return
+        
+        input_data, over_budget = apply_token_budget(input_data, account)
+        prompt = build_evaluator_prompt(input_data)
+        deadline = resolve_deadline(deadline, priority)
+        agent = model_router.route(evaluator_agent, "evaluator", input_data.company, input_data.interview_type, deadline, over_budget)
+        
+        with tracing.sdk_trace("Stream candidate answer evaluation"):
+            async with streamed_agent_run(agent, prompt, priority, key, deadline) as result:
+                extractor = JsonStringFieldExtractor("evaluation")
+                
+                # The structured output arrives as JSON text deltas; surface the evaluation field as it streams
+                async for event in stream_events(result, deadline):
+                    if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        text = extractor.feed(event.data.delta)
+                        if text:
+                            yield text
+            
+            record_usage(result.context_wrapper.usage, "evaluator", input_data.company, input_data.interview_type, account)
+            evaluation = result.final_output_as(EvaluationOutput)
+            if cache_key and agent.model == model:
+                evaluation_cache.set(cache_key, evaluation.model_dump())
+            yield evaluation
+
+def build_feedback_prompt(input_data: FinalFeedbackInput) -> str:
+    """
+    Builds the feedback agent's prompt for a finished (or partly finished) interview.
+    
+    Args:
+        input_data: Contains the conversation history, company name, interview type and optional draft
+    
+    Returns:
+        str: The prompt to send to the feedback agent
+    """
+    # Get the (memoized) evaluation configuration text
+    structure_text, criteria_text = get_feedback_config_text(input_data.company, input_data.interview_type)
+    
+    # With a draft, only the turns it does not cover yet need to be sent
+    if input_data.draft is not None:
+        conversation_section = f"""Draft Assessment (covering the earlier part of the interview):
+        {input_data.draft.model_dump_json(indent=2)}
+        
+        Interview Conversation Since the Draft:
+        {format_conversation_history(input_data.conversation_history[input_data.draft_turns:])}
+        
+        Update the draft assessment to account for the newer conversation, then"""
+    else:
+        conversation_section = f"""Complete Interview Conversation:
+        {format_conversation_history(input_data.conversation_history)}
+        
+        Based on the above conversation,"""
+    
+    return f"""
+        Company: {input_data.company}
+        Interview Type: {input_data.interview_type}
+        
+        {conversation_section} provide a comprehensive performance summary and
+        suggest improvements tailored to the interview standards of {input_data.company}.
+        
+        Evaluation Structure:
+        {structure_text}
+        
+        Evaluation Criteria:
+        {criteria_text}
+        
+        Please include:
+        1. A comprehensive written assessment
+        2. A bullet-point list of key strengths (at least 3)
+        3. A bullet-point list of specific areas for improvement (at least 3)
+        4. An overall rating (if requested in the evaluation structure)
+        """
+
+async def generate_final_feedback(
+    input_data: FinalFeedbackInput,
+    priority: Priority = Priority.FINAL,
+    key: str = "",
+    deadline: Optional[float] = None,
+    account: Optional[TokenAccount] = None
+) -> FinalFeedbackOutput:
+    """
+    Generates final comprehensive feedback for the entire interview using the Agents SDK.
+    
+    Args:
+        input_data: Contains the conversation history, company name, and interview type
+        priority: Queueing priority of the agent call
+        key: Fairness key for queueing, usually the session ID
+        deadline: time.monotonic() deadline of the call; defaults to the budget of the priority
+        account: The session's token account; a session low on tokens gets the fallback model.
+            Speculative drafts (Priority.BACKGROUND) count as background tokens, outside the budget
+    
+    Returns:
+        FinalFeedbackOutput: Final feedback with strengths and areas for improvement
+    """
+    with tracing.span("generate_final_feedback", company=input_data.company, interview_type=input_data.interview_type) as span:
+        span.set_attribute("from_draft", input_data.draft is not None)
+        
+        # Construct prompt for the feedback agent
+        prompt = build_feedback_prompt(input_data)
+        
+        # Use tracing to help with debugging (SDK traces are sampled with the request)
+        with tracing.sdk_trace("Generate final feedback"):
+            # Run the feedback agent
+            deadline = resolve_deadline(deadline, priority)
+            over_budget = budget_level_for_call(account) >= BudgetLevel.FALLBACK
+            agent = model_router.route(feedback_agent, "feedback", input_data.company, input_data.interview_type, deadline, over_budget)
+            result = await run_agent(agent, prompt, priority, key, deadline)
+            # Speculative drafts are background work, kept out of the session's budget
+            record_usage(
+                result.context_wrapper.usage, "feedback", input_data.company, input_data.interview_type,
+                account, background=priority is Priority.BACKGROUND
+            )
+            feedback = result.final_output_as(FinalFeedbackOutput)
+            
+            return feedback
+
+CLOSING_MESSAGE = "That concludes our interview questions. Would you like to end the interview and receive your final feedback?"
+
+OVERLOADED_MESSAGE = "The interviewer is busy right now. Please try again in a moment."
+
+TOKEN_BUDGET_MESSAGE = "This interview has reached its usage limit. Please end the interview to get your feedback."
+
+INTERVIEW_COMPLETE_MESSAGE = "All questions have been answered. Please end the interview to get your feedback."
+
+QUESTION_BANK_CHANGED_MESSAGE = "The questions for this interview have changed. Please end the interview or start a new one."
+
+class InterviewComplete(Exception):
+    """Raised by session updates for an answer that arrives after the last question."""
+
+def session_priority(session_data: Dict[str, Any]) -> Priority:
+    """Queueing priority for a session's answer evaluations (voice mode is the most latency-sensitive)."""
+    return Priority.VOICE if session_data.get("is_voice_mode") else Priority.INTERACTIVE
+
+def overloaded_response(error: LLMOverloaded):
+    """Build the 503 response for a request that hit the LLM rate limits."""
+    metrics.record_error("overloaded", error)
+    response = jsonify({"error": OVERLOADED_MESSAGE, "retry_after": error.retry_after})
+    response.headers["Retry-After"] = str(max(1, round(error.retry_after)))
+    return response, 503
+
+def token_budget_response(account: TokenAccount):
+    """Build the 429 response for an answer to a session that has used up its token budget."""
+    token_metrics.record_budget_action(account.company, account.interview_type, BudgetLevel.EXHAUSTED)
+    return jsonify({"error": TOKEN_BUDGET_MESSAGE, "token_usage": account.status()}), 429
+
+def interview_complete_response(session_id: str):
+    """Build the 400 response for an answer to a session whose questions have all been answered."""
+    log_event("answer_after_last_question", session_id, logging.WARNING)
+    return jsonify({"error": INTERVIEW_COMPLETE_MESSAGE}), 400
+
+def question_bank_changed_response(session_id: str, error: QuestionBankChanged):
+    """Build the 409 response for a session whose pinned question bank version this worker does not have."""
+    log_event("question_bank_changed", session_id, logging.WARNING, error=str(error))
+    return jsonify({"error": QUESTION_BANK_CHANGED_MESSAGE}), 409
+
+def add_session_tokens(session_data: Dict[str, Any], account: TokenAccount) -> None:
+    """Add the token usage of the agent calls made through an account to the session's totals."""
+    add_token_usage(session_data.setdefault("tokens", new_token_usage()), account.usage)
+    if account.background_usage["requests"]:
+        add_token_usage(session_data.setdefault("background_tokens", new_token_usage()), account.background_usage)
+
+def get_question_bank(session_data: Dict[str, Any]) -> Tuple[BankQuestion, ...]:
+    """
+    Return the shared question bank a session refers to (sessions store only its key).
+    
+    Sessions keep the version of the bank they started with, even after its file is edited.
+    
+    Raises:
+        QuestionBankChanged: If this worker does not have the session's version
+    """
+    company, bank_key, *version = session_data["bank"]
+    if not version:
+        # Sessions started before banks were versioned follow the current file
+        return registry.get_questions(company, bank_key)
+    return registry.get_questions_version(company, bank_key, version[0])
+
+def has_current_question(session_data: Dict[str, Any]) -> bool:
+    """Whether the session's current question is still to be answered (false past the last question)."""
+    return session_data["current_index"] < len(get_question_bank(session_data))
+
+def answer_rejection(session_id: str, session_data: Optional[Dict[str, Any]]):
+    """Return the error response for an answer the session cannot take, or None if it can."""
+    if session_data is None:
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    try:
+        if not has_current_question(session_data):
+            return interview_complete_response(session_id)
+    except QuestionBankChanged as e:
+        return question_bank_changed_response(session_id, e)
+    return None
+
+def get_next_question(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describe the question that follows the current one, or the closing message.
+    
+    Args:
+        session_data: The interview session
+    
+    Returns:
+        Dict with the next question and its position in the interview
+    """
+    question_bank = get_question_bank(session_data)
+    next_index = session_data["current_index"] + 1
+    
+    if next_index < len(question_bank):
+        return {
+            "question": question_bank[next_index].question,
+            "question_number": next_index + 1,
+            "total_questions": len(question_bank),
+            "is_last": next_index == len(question_bank) - 1,
+            "is_voice_mode": session_data["is_voice_mode"]
+        }
+    
+    # No more questions
+    return {
+        "question": CLOSING_MESSAGE,
+        "question_number": next_index,
+        "total_questions": len(question_bank),
+        "is_last": True,
+        "is_voice_mode": session_data["is_voice_mode"]
+    }
+
+def advance_session(session_data: Dict[str, Any], evaluation: str, role: Role = Role.INTERVIEWER) -> None:
+    """
+    Record the evaluation of the current answer and move to the next question.
+    
+    Args:
+        session_data: The interview session
+        evaluation: The evaluation text for the current answer
+        role: Role.PENDING to record a placeholder for a deferred evaluation
+    """
+    history = Transcript(session_data["transcript"])
+    question_bank = get_question_bank(session_data)
+    
+    # Add evaluation to history
+    history.append(role, evaluation)
+    
+    # Move to next question
+    session_data["current_index"] += 1
+    current_index = session_data["current_index"]
+    
+    # Add next question to history
+    if current_index < len(question_bank):
+        history.append(Role.INTERVIEWER, question_bank[current_index].question)
+
+def record_evaluated_answer(
+    session_id: str,
+    current_index: int,
+    candidate_answer: str,
+    evaluation: str,
+    account: Optional[TokenAccount] = None
+) -> Dict[str, Any]:
+    """
+    Atomically add an answer and its evaluation to the session and move to the next question.
+    
+    Args:
+        session_id: The interview session ID
+        current_index: The question index the answer was given for
+        candidate_answer: The candidate's answer
+        evaluation: The evaluation text for the answer
+        account: The token account the answer was evaluated with
+    
+    Returns:
+        The next question, as returned by get_next_question()
+    
+    Raises:
+        SessionConflict: If the question was answered concurrently by another request
+    """
+    def record(session_data):
+        if session_data["current_index"] != current_index:
+            raise SessionConflict(f"Question {current_index + 1} was already answered")
+        Transcript(session_data["transcript"]).append(Role.CANDIDATE, candidate_answer)
+        next_question = get_next_question(session_data)
+        advance_session(session_data, evaluation)
+        if account is not None:
+            add_session_tokens(session_data, account)
+        return next_question
+    
+    return sessions.update(session_id, record)
+
+def session_transcript(session_id: str, session_data: Dict[str, Any]) -> Transcript:
+    """View over a session's transcript that shares this worker's prompt index of the session."""
+    return Transcript(session_data["transcript"], key=session_id)
+
+def build_evaluation_input(session_id: str, session_data: Dict[str, Any], candidate_answer: str, bypass_cache: bool) -> EvaluationInput:
+    """Create the evaluator input for an answer to the session's current question."""
+    question = get_question_bank(session_data)[session_data["current_index"]]
+    history = session_transcript(session_id, session_data)[:]
+    history.append(Role.CANDIDATE, candidate_answer)
+    return EvaluationInput(
+        candidate_answer=candidate_answer,
+        evaluation_prompt=question.evaluation_prompt,
+        conversation_history=history,
+        company=session_data["company"],
+        interview_type=session_data["interview_type"],
+        context_summary=session_data["context_summary"],
+        summarized_turns=session_data["summarized_turns"],
+        question=question.question,
+        bypass_cache=bypass_cache
+    )
+
+def schedule_background_work(session_id: str) -> None:
+    """Start the background jobs that follow an answered question."""
+    session_data = sessions.get(session_id)
+    if session_data is not None:
+        schedule_summarization(session_id, session_data)
+        schedule_feedback_draft(session_id, session_data)
+
+# Keep a draft of the final feedback up to date in the background after each answer,
+# so /api/end only has to finalize it
+SPECULATIVE_FEEDBACK = os.environ.get('SPECULATIVE_FEEDBACK', 'true').lower() in ('1', 'true', 'yes')
+
+# Upper bound on how long a client may long-poll for a deferred evaluation
+MAX_EVALUATION_WAIT_SECONDS = 30.0
+
+# How long to wait for deferred evaluations that may be running in another worker
+DEFERRED_EVALUATION_TIMEOUT = float(os.environ.get('DEFERRED_EVALUATION_TIMEOUT', '120'))
+SESSION_POLL_INTERVAL = 0.1
+
+# Background evaluations started in deferred mode by this worker, keyed by session ID then question number
+pending_evaluations: Dict[str, Dict[int, concurrent.futures.Future]] = {}
+pending_evaluations_lock = threading.Lock()
+
+async def run_deferred_evaluation(
+    session_id: str,
+    question_number: int,
+    previous: Optional[concurrent.futures.Future],
+    bypass_cache: bool = False
+) -> None:
+    """
+    Evaluates an answer in the background and fills in its placeholder history entry.
+    
+    Evaluations of the same session run one after another, so each one sees the
+    previous evaluations in its conversation history, exactly as in synchronous mode.
+    
+    Args:
+        session_id: The interview session ID
+        question_number: 1-based number of the answered question
+        previous: The session's previously scheduled evaluation in this worker, if any
+        bypass_cache: Skip the evaluation cache for this answer
+    """
+    if previous is not None:
+        await asyncio.wait([asyncio.wrap_future(previous)])
+    
+    # Earlier evaluations scheduled by other workers are only visible through the store
+    deadline = time.monotonic() + DEFERRED_EVALUATION_TIMEOUT
+    while True:
+        session_data = sessions.get(session_id)
+        if session_data is None:
+            return
+        history = session_transcript(session_id, session_data)
+        position = history.find_pending(question_number)
+        if position is None:
+            return
+        if history.finished_length() >= position or time.monotonic() > deadline:
+            break
+        await asyncio.sleep(SESSION_POLL_INTERVAL)
+    
+    account = TokenAccount.for_session(session_data)
+    try:
+        question = get_question_bank(session_data)[question_number - 1]
+        eval_input = EvaluationInput(
+            candidate_answer=history.text(position - 1),
+            evaluation_prompt=question.evaluation_prompt,
+            conversation_history=history[:position],
+            company=session_data["company"],
+            interview_type=session_data["interview_type"],
+            context_summary=session_data["context_summary"],
+            summarized_turns=min(session_data["summarized_turns"], position),
+            question=question.question,
+            bypass_cache=bypass_cache
+        )
+        evaluation_output = await evaluate_answer(eval_input, session_priority(session_data), session_id, account=account)
+        result = {
+            "status": "done",
+            "evaluation": evaluation_output.evaluation,
+            "follow_up_questions": evaluation_output.follow_up_questions or []
+        }
+    except Exception as e:
+        log_event("deferred_evaluation_failed", session_id, logging.ERROR, exc_info=True, question_number=question_number, error=str(e))
+        metrics.record_error("deferred_evaluation", e)
+        evaluation_output = None
+        result = {
+            "status": "error",
+            "error": "There was an error evaluating this answer."
+        }
+    
+    def record(session_data):
+        add_session_tokens(session_data, account)
+        history = Transcript(session_data["transcript"])
+        position = history.find_pending(question_number)
+        if position is None:
+            return
+        if evaluation_output is not None:
+            history.replace(position, Role.INTERVIEWER, evaluation_output.evaluation)
+        else:
+            # Drop the placeholder from prompts; the turn stays so later positions do not shift
+            history.replace(position, Role.DROPPED, "")
+        session_data["evaluations"][str(question_number)] = result
+    
+    try:
+        sessions.update(session_id, record)
+    except SessionNotFound:
+        return
+    schedule_background_work(session_id)
+
+def schedule_deferred_evaluation(session_id: str, question_number: int, bypass_cache: bool = False) -> None:
+    """Start the background evaluation of an answer after any earlier ones in the session."""
+    with pending_evaluations_lock:
+        session_pending = pending_evaluations.setdefault(session_id, {})
+        previous = session_pending[max(session_pending)] if session_pending else None
+        future = submit(run_deferred_evaluation(session_id, question_number, previous, bypass_cache))
+        session_pending[question_number] = future
+    
+    def forget(_):
+        with pending_evaluations_lock:
+            session_pending.pop(question_number, None)
+            if not session_pending and pending_evaluations.get(session_id) is session_pending:
+                del pending_evaluations[session_id]
+    
+    future.add_done_callback(forget)
+
+def wait_for_pending_evaluations(session_id: str, timeout: float = DEFERRED_EVALUATION_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Block until all deferred evaluations of a session have completed.
+    
+    Returns:
+        The session data once no evaluations are pending (or the timeout expired),
+        or None if the session no longer exists
+    """
+    deadline = time.monotonic() + timeout
+    with pending_evaluations_lock:
+        futures = list(pending_evaluations.get(session_id, {}).values())
+    if futures:
+        concurrent.futures.wait(futures, timeout=timeout)
+    
+    # Evaluations scheduled by other workers finish in the shared store
+    while True:
+        session_data = sessions.get(session_id)
+        if session_data is None or time.monotonic() > deadline:
+            return session_data
+        history = Transcript(session_data["transcript"])
+        if history.finished_length() == len(history):
+            return session_data
+        time.sleep(SESSION_POLL_INTERVAL)
+
+# Sessions with a summarization pass in flight in this worker
+summarizing_sessions = set()
+summarizing_sessions_lock = threading.Lock()
+
+async def summarize_conversation(
+    previous_summary: str,
+    turns: Transcript,
+    company: str,
+    interview_type: str,
+    max_words: int,
+    key: str = "",
+    account: Optional[TokenAccount] = None
+) -> str:
+    """
+    Folds conversation turns into the rolling summary using the summarizer agent.
+    
+    Args:
+        previous_summary: The summary so far (may be empty)
+        turns: The history entries to fold into the summary
+        company: The company name
+        interview_type: The interview type
+        max_words: Target maximum length of the summary
+        key: Fairness key for queueing, usually the session ID
+        account: The session's token account; a session low on tokens gets the fallback model.
+            The summary counts as background tokens, outside the budget
+    
+    Returns:
+        str: The updated summary
+    """
+    prompt = f"""
+    Company: {company}
+    Interview Type: {interview_type}
+    
+    Summary so far:
+    {previous_summary or "(none)"}
+    
+    New conversation to add to the summary:
+    {format_conversation_history(turns)}
+    
+    Rewrite the summary so it covers both, in at most {max_words} words.
+    """
+    
+    with tracing.span("summarize_conversation", company=company, interview_type=interview_type):
+        with tracing.sdk_trace("Summarize interview conversation"):
+            over_budget = budget_level_for_call(account) >= BudgetLevel.FALLBACK
+            agent = model_router.route(summarizer_agent, "summarizer", company, interview_type, over_budget=over_budget)
+            result = await run_agent(agent, prompt, Priority.BACKGROUND, key)
+            record_usage(result.context_wrapper.usage, "summarizer", company, interview_type, account, background=True)
+            return result.final_output_as(ConversationSummary).summary
+
+async def run_summarization(session_id: str, session_data: Dict[str, Any], start: int, end: int, max_words: int) -> None:
+    """Extends the session's rolling summary over history[start:end] in the background."""
+    company = session_data["company"]
+    interview_type = session_data["interview_type"]
+    account = TokenAccount.for_session(session_data)
+    try:
+        previous_summary = session_data["context_summary"]
+        turns = session_transcript(session_id, session_data)[start:end]
+        summary = await summarize_conversation(previous_summary, turns, company, interview_type, max_words, session_id, account)
+        
+        # Update both fields together so prompts never pair a summary with the wrong boundary
+        def record(session_data):
+            add_session_tokens(session_data, account)
+            if session_data["summarized_turns"] == start:
+                session_data.update({"context_summary": summary, "summarized_turns": end})
+        
+        sessions.update(session_id, record)
+        context_metrics.record_summary(
+            company, interview_type, end - start,
+            estimate_tokens(previous_summary) + turns.token_count()
+        )
+    except Exception as e:
+        # The evaluator keeps seeing the unsummarized turns verbatim, so this is not fatal
+        log_event("summarization_failed", session_id, logging.WARNING, error=str(e))
+        metrics.record_error("summarization", e)
+    finally:
+        with summarizing_sessions_lock:
+            summarizing_sessions.discard(session_id)
+
+def schedule_summarization(session_id: str, session_data: Dict[str, Any]) -> None:
+    """Fold older turns into the session's summary once they fall out of the verbatim window."""
+    config = get_context_config(session_data["company"], session_data["interview_type"])
+    if not config["enabled"] or TokenAccount.for_session(session_data).level is BudgetLevel.EXHAUSTED:
+        return
+    
+    start = session_data["summarized_turns"]
+    end = select_summary_boundary(Transcript(session_data["transcript"]), start, config["recent_turns"])
+    if end - start < config["summary_batch_turns"]:
+        return
+    
+    with summarizing_sessions_lock:
+        if session_id in summarizing_sessions:
+            return
+        summarizing_sessions.add(session_id)
+    submit(run_summarization(session_id, session_data, start, end, config["summary_max_words"]))
+
+# In-flight speculative feedback drafts in this worker, keyed by session ID
+feedback_draft_jobs: Dict[str, concurrent.futures.Future] = {}
+feedback_draft_jobs_lock = threading.Lock()
+
+def build_feedback_input(session_id: str, session_data: Dict[str, Any], turns: int) -> FinalFeedbackInput:
+    """Create the feedback input for history[:turns], reusing the session's draft when it covers a prefix."""
+    draft = session_data.get("feedback_draft")
+    draft_turns = session_data.get("feedback_draft_turns", 0)
+    use_draft = draft is not None and 0 < draft_turns <= turns
+    
+    return FinalFeedbackInput(
+        conversation_history=session_transcript(session_id, session_data)[:turns],
+        company=session_data["company"],
+        interview_type=session_data["interview_type"],
+        draft=FinalFeedbackOutput(**draft) if use_draft else None,
+        draft_turns=draft_turns if use_draft else 0
+    )
+
+async def run_feedback_draft(session_id: str, session_data: Dict[str, Any], turns: int) -> None:
+    """Updates the session's feedback draft to cover history[:turns] in the background."""
+    account = TokenAccount.for_session(session_data)
+    try:
+        feedback_output = await generate_final_feedback(
+            build_feedback_input(session_id, session_data, turns), Priority.BACKGROUND, session_id, account=account
+        )
+        
+        def record(session_data):
+            add_session_tokens(session_data, account)
+            if turns > session_data.get("feedback_draft_turns", 0):
+                session_data.update({"feedback_draft": feedback_output.model_dump(), "feedback_draft_turns": turns})
+        
+        sessions.update(session_id, record)
+    except Exception as e:
+        # /api/end falls back to generating the feedback itself
+        log_event("feedback_draft_failed", session_id, logging.WARNING, error=str(e))
+        metrics.record_error("feedback_draft", e)
+    finally:
+        with feedback_draft_jobs_lock:
+            feedback_draft_jobs.pop(session_id, None)
+    
+    # Catch up with answers that arrived while this draft was being written
+    latest = sessions.get(session_id)
+    if latest is not None:
+        schedule_feedback_draft(session_id, latest)
+
+def schedule_feedback_draft(session_id: str, session_data: Dict[str, Any]) -> None:
+    """Start a speculative feedback draft if the transcript has moved past the current one."""
+    if not SPECULATIVE_FEEDBACK or session_data.get("finalizing"):
+        return
+    
+    # Drafts are an optimization, so they are the first thing dropped for a session low on tokens
+    if TokenAccount.for_session(session_data).level >= BudgetLevel.TRIM:
+        return
+    
+    turns = Transcript(session_data["transcript"]).finished_length()
+    if turns <= session_data.get("feedback_draft_turns", 0):
+        return
+    
+    with feedback_draft_jobs_lock:
+        if session_id in feedback_draft_jobs:
+            return
+        feedback_draft_jobs[session_id] = submit(run_feedback_draft(session_id, session_data, turns))
+
+# Limits for /api/evaluate/batch
+BATCH_EVALUATION_CONCURRENCY = int(os.environ.get('BATCH_EVALUATION_CONCURRENCY', '8'))
+BATCH_EVALUATION_MAX_ITEMS = int(os.environ.get('BATCH_EVALUATION_MAX_ITEMS', '500'))
+
+def build_batch_evaluation_input(item: Dict[str, Any], bypass_cache: bool) -> EvaluationInput:
+    """Create the evaluator input for one standalone batch item (no session or earlier turns)."""
+    if not isinstance(item, dict) or not all(isinstance(item.get(field), str) for field in ("company", "question", "answer")):
+        raise ValueError("Each item needs company, question and answer strings.")
+    
+    company = registry.canonical_company(item["company"]) or item["company"]
+    interview_type = item.get("interview_type") or "General"
+    evaluation_prompt = (
+        registry.get_evaluation_prompt(company, interview_type, item["question"])
+        or item.get("evaluation_prompt")
+        or default_evaluation_prompt
+    )
+    
+    history = Transcript(new_transcript())
+    history.append(Role.INTERVIEWER, item["question"])
+    history.append(Role.CANDIDATE, item["answer"])
+    return EvaluationInput(
+        candidate_answer=item["answer"],
+        evaluation_prompt=evaluation_prompt,
+        conversation_history=history,
+        company=company,
+        interview_type=interview_type,
+        question=item["question"],
+        bypass_cache=bypass_cache
+    )
+
+async def evaluate_batch(items: List[Dict[str, Any]], concurrency: int, bypass_cache: bool, key: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Evaluates batch items concurrently and yields each result as soon as it completes.
+    
+    Args:
+        items: The batch items from the request
+        concurrency: Maximum number of evaluations running at once
+        bypass_cache: Skip the evaluation cache
+        key: Fairness key for queueing this batch's agent calls
+    
+    Yields:
+        One result per item, in completion order, carrying the item's index in the request
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def evaluate_item(index, item):
+        item_id = item.get("id") if isinstance(item, dict) else None
+        try:
+            eval_input = build_batch_evaluation_input(item, bypass_cache)
+        except ValueError as e:
+            return {"index": index, "id": item_id, "status": "error", "error": str(e)}
+        
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                evaluation_output = await evaluate_answer(eval_input, Priority.BATCH, key)
+            except LLMOverloaded:
+                return {"index": index, "id": item_id, "status": "error", "error": "The evaluator is busy. Please retry this item later."}
+            except Exception as e:
+                log_event("batch_item_failed", level=logging.ERROR, index=index, id=item_id, error=str(e))
+                metrics.record_error("batch_evaluation", e)
+                return {"index": index, "id": item_id, "status": "error", "error": "There was an error evaluating this answer."}
+            return {
+                "index": index,
+                "id": item_id,
+                "status": "ok",
+                "evaluation": evaluation_output.evaluation,
+                "follow_up_questions": evaluation_output.follow_up_questions or [],
+                "latency_seconds": time.perf_counter() - started
+            }
+    
+    tasks = [asyncio.ensure_future(evaluate_item(index, item)) for index, item in enumerate(items)]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Stop outstanding evaluations if the client disconnects
+        for task in tasks:
+            task.cancel()
+
+def get_companies():
+    """Return a list of available companies."""
+    companies = registry.companies()
+    return jsonify(companies)
+
+def start():
+    """Initialize a new interview session with the selected company."""
+    data = request.get_json()
+    company = data.get("company")
+    interview_type = data.get("interview_type", "General")
+    is_voice_mode = bool(data.get("is_voice_mode", False)) and current_app.config["VOICE_INTERVIEWS"]
+    log_event("start_received", company=company, interview_type=interview_type, is_voice_mode=is_voice_mode)
+    
+    # Generate a unique session ID
+    session_id = str(uuid.uuid4())
+    
+    # Load company question bank
+    company_bank = registry.get_company(company or "")
+    if company_bank is None:
+        log_event("question_bank_not_found", level=logging.WARNING, company=company)
+        return jsonify({"error": f"No question bank available for {company}."}), 400
+    company = company_bank.name
+    
+    # Get questions for the specified interview type (aliases such as "System Design" are resolved)
+    interview_type_key = canonical_interview_type(interview_type)
+    type_questions = company_bank.questions.get(interview_type_key, ())
+    if not type_questions:
+        log_event("question_bank_not_found", level=logging.WARNING, company=company, interview_type=interview_type)
+        return jsonify({"error": f"No question bank available for {company} ({interview_type} interview)."}), 400
+    
+    # Make sure this worker expires abandoned sessions
+    sessions.start_sweeper(SESSION_SWEEP_INTERVAL)
+    
+    # Get the first question
+    first_question = type_questions[0].question
+    
+    # Initialize session data, recording the first question in the conversation history.
+    # The session refers to the shared question bank by key instead of holding a copy,
+    # and pins its version so that edits to the bank only apply to new interviews.
+    history = Transcript(new_transcript())
+    history.append(Role.INTERVIEWER, first_question)
+    sessions.create(session_id, {
+        "company": company,
+        "interview_type": interview_type,
+        "bank": [company, interview_type_key, company_bank.versions[interview_type_key]],
+        "current_index": 0,
+        "transcript": history.data,
+        "is_voice_mode": is_voice_mode,
+        "context_summary": "",
+        "summarized_turns": 0,
+        "evaluations": {},
+        "tokens": new_token_usage()
+    })
+    
+    # Store session ID in Flask session
+    session['session_id'] = session_id
+    
+    # Return the first question
+    response = {
+        "session_id": session_id, 
+        "question": first_question,
+        "company": company,
+        "total_questions": len(type_questions),
+        "is_voice_mode": is_voice_mode
+    }
+    log_event("session_started", session_id, total_questions=len(type_questions), payload=response)
+    return jsonify(response)
+
+def answer():
+    """Handle the candidate's answer, evaluate it, and provide the next question."""
+    data = request.get_json()
+    candidate_answer = data.get("answer")
+    session_id = data.get("session_id") or session.get('session_id')
+    bypass_cache = bool(data.get("bypass_cache"))
+    log_event(
+        "answer_received", session_id, answer_chars=len(candidate_answer or ""),
+        deferred=bool(data.get("deferred")), bypass_cache=bypass_cache, payload=data
+    )
+    
+    if not session_id or session_id not in sessions:
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    
+    if data.get("deferred"):
+        # Deferred mode: return the next question now and evaluate in the background
+        def record_deferred(session_data):
+            account = TokenAccount.for_session(session_data)
+            if account.level is BudgetLevel.EXHAUSTED:
+                raise TokenBudgetExceeded(account)
+            if not has_current_question(session_data):
+                raise InterviewComplete()
+            question_number = session_data["current_index"] + 1
+            Transcript(session_data["transcript"]).append(Role.CANDIDATE, candidate_answer)
+            next_question = get_next_question(session_data)
+            advance_session(session_data, str(question_number), Role.PENDING)
+            session_data["evaluations"][str(question_number)] = {"status": "pending"}
+            return question_number, next_question, account
+        
+        try:
+            question_number, next_question, account = sessions.update(session_id, record_deferred)
+        except TokenBudgetExceeded as e:
+            log_event("token_budget_exhausted", session_id, logging.WARNING, **e.account.status())
+            return token_budget_response(e.account)
+        except InterviewComplete:
+            return interview_complete_response(session_id)
+        except QuestionBankChanged as e:
+            return question_bank_changed_response(session_id, e)
+        except SessionNotFound:
+            # Expired or ended since the check above
+            log_event("session_not_found", session_id, logging.WARNING)
+            return jsonify({"error": "Session not found. Please start a new interview."}), 400
+        schedule_deferred_evaluation(session_id, question_number, bypass_cache)
+        
+        response = {
+            "evaluation": None,
+            "evaluation_status": "pending",
+            "evaluation_question_number": question_number,
+            "follow_up_questions": [],
+            **next_question,
+            "token_usage": account.status()
+        }
+        log_event("answer_deferred", session_id, question_number=question_number, payload=response)
+        return jsonify(response)
+    
+    # Earlier deferred evaluations must land in the history before this one is evaluated
+    session_data = wait_for_pending_evaluations(session_id)
+    rejection = answer_rejection(session_id, session_data)
+    if rejection is not None:
+        return rejection
+    current_index = session_data["current_index"]
+    
+    account = TokenAccount.for_session(session_data)
+    if account.level is BudgetLevel.EXHAUSTED:
+        log_event("token_budget_exhausted", session_id, logging.WARNING, **account.status())
+        return token_budget_response(account)
+    
+    try:
+        # Create evaluation input
+        eval_input = build_evaluation_input(session_id, session_data, candidate_answer, bypass_cache)
+        
+        # Evaluate candidate's answer using the evaluator agent
+        # Runs on the shared background event loop (see async_runtime.py)
+        evaluation_output = run_async(evaluate_answer(eval_input, session_priority(session_data), session_id, deadline_for("answer"), account))
+        evaluation = evaluation_output.evaluation
+        follow_up_questions = evaluation_output.follow_up_questions or []
+        
+        # Record the answer and evaluation and move to the next question
+        next_question = record_evaluated_answer(session_id, current_index, candidate_answer, evaluation, account)
+        schedule_background_work(session_id)
+        
+        response = {
+            "evaluation": evaluation,
+            "follow_up_questions": follow_up_questions,
+            **next_question,
+            "token_usage": account.status()
+        }
+        
+        log_event(
+            "answer_evaluated", session_id, question_number=current_index + 1,
+            evaluation_chars=len(evaluation), total_tokens=response["token_usage"]["total_tokens"], payload=response
+        )
+        return jsonify(response)
+    
+    except SessionConflict as e:
+        log_event("answer_conflict", session_id, logging.WARNING, error=str(e))
+        return jsonify({"error": "This question has already been answered."}), 409
+    
+    except QuestionBankChanged as e:
+        return question_bank_changed_response(session_id, e)
+    
+    except LLMOverloaded as e:
+        log_event("evaluator_overloaded", session_id, logging.WARNING, retry_after=e.retry_after)
+        return overloaded_response(e)
+    
+    except Exception as e:
+        log_event("answer_failed", session_id, logging.ERROR, exc_info=True, error=str(e))
+        metrics.record_error("answer", e)
+        return jsonify({"error": "There was an error processing your answer. Please try again."}), 500
+
+def answer_stream():
+    """
+    Streaming variant of /api/answer using Server-Sent Events.
+    
+    Events, in order:
+    - question: the next question, sent before evaluation starts
+    - evaluation: partial evaluation text as it is generated ({"text": ...})
+    - done: the full evaluation and structured follow-up questions
+    - error: sent instead of done if the evaluation fails
+    """
+    data = request.get_json()
+    candidate_answer = data.get("answer")
+    session_id = data.get("session_id") or session.get('session_id')
+    log_event("answer_received", session_id, answer_chars=len(candidate_answer or ""), streamed=True, payload=data)
+    
+    if not session_id or session_id not in sessions:
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    
+    # Earlier deferred evaluations must land in the history before this one is evaluated
+    session_data = wait_for_pending_evaluations(session_id)
+    rejection = answer_rejection(session_id, session_data)
+    if rejection is not None:
+        return rejection
+    current_index = session_data["current_index"]
+    eval_input = build_evaluation_input(session_id, session_data, candidate_answer, bool(data.get("bypass_cache")))
+    
+    account = TokenAccount.for_session(session_data)
+    if account.level is BudgetLevel.EXHAUSTED:
+        log_event("token_budget_exhausted", session_id, logging.WARNING, **account.status())
+        return token_budget_response(account)
+    
+    def generate():
+        # The next question is known up front, so send it before the LLM call starts
+        next_question = get_next_question(session_data)
+        yield format_sse("question", next_question)
+        
+        try:
+            evaluation_output = None
+            for item in iterate_async(stream_evaluation(eval_input, session_priority(session_data), session_id, deadline_for("stream"), account)):
+                if isinstance(item, EvaluationOutput):
+                    evaluation_output = item
+                else:
+                    yield format_sse("evaluation", {"text": item})
+            
+            # Only advance the session once the evaluation is complete
+            record_evaluated_answer(session_id, current_index, candidate_answer, evaluation_output.evaluation, account)
+            schedule_background_work(session_id)
+            
+            response = {
+                "evaluation": evaluation_output.evaluation,
+                "follow_up_questions": evaluation_output.follow_up_questions or [],
+                "token_usage": account.status()
+            }
+            log_event(
+                "answer_evaluated", session_id, question_number=current_index + 1, streamed=True,
+                evaluation_chars=len(evaluation_output.evaluation), total_tokens=response["token_usage"]["total_tokens"], payload=response
+            )
+            yield format_sse("done", response)
+        
+        except SessionConflict as e:
+            log_event("answer_conflict", session_id, logging.WARNING, error=str(e))
+            yield format_sse("error", {"error": "This question has already been answered."})
+        
+        except LLMOverloaded as e:
+            log_event("evaluator_overloaded", session_id, logging.WARNING, retry_after=e.retry_after)
+            yield format_sse("error", {"error": OVERLOADED_MESSAGE, "retry_after": e.retry_after})
+        
+        except Exception as e:
+            log_event("answer_failed", session_id, logging.ERROR, exc_info=True, streamed=True, error=str(e))
+            metrics.record_error("answer_stream", e)
+            yield format_sse("error", {"error": "There was an error processing your answer. Please try again."})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def get_evaluation(session_id, question_number):
+    """
+    Return the result of a deferred evaluation.
+    
+    Pass ?wait=<seconds> to block until the evaluation completes (long polling)
+    instead of returning a pending status straight away.
+    """
+    session_data = sessions.get(session_id)
+    if session_data is None:
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    
+    key = str(question_number)
+    if key not in session_data["evaluations"]:
+        return jsonify({"error": f"No evaluation scheduled for question {question_number}."}), 404
+    
+    wait = min(request.args.get("wait", 0, type=float), MAX_EVALUATION_WAIT_SECONDS)
+    deadline = time.monotonic() + wait
+    with pending_evaluations_lock:
+        future = pending_evaluations.get(session_id, {}).get(question_number)
+    if future is not None and wait > 0:
+        concurrent.futures.wait([future], timeout=wait)
+    
+    # The evaluation may be running in another worker; poll the shared store
+    while True:
+        session_data = sessions.get(session_id)
+        if session_data is None:
+            # Expired or evicted while waiting
+            log_event("session_not_found", session_id, logging.WARNING)
+            return jsonify({"error": "Session not found. Please start a new interview."}), 400
+        evaluation = session_data["evaluations"][key]
+        if evaluation["status"] != "pending" or time.monotonic() >= deadline:
+            break
+        time.sleep(SESSION_POLL_INTERVAL)
+    
+    return jsonify({"question_number": question_number, **evaluation})
+
+def end():
+    """End the interview and generate a comprehensive evaluation."""
+    data = request.get_json()
+    session_id = data.get("session_id") or session.get('session_id')
+    log_event("end_received", session_id)
+    
+    session_data = sessions.get(session_id) if session_id else None
+    if session_data is None:
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    
+    # Get session data
+    company = session_data["company"]
+    is_voice_mode = session_data["is_voice_mode"]
+    
+    # Repeat calls are served from the stored result while the transcript is unchanged
+    final_feedback = session_data.get("final_feedback")
+    if final_feedback is not None and session_data.get("final_feedback_turns") == len(session_data["transcript"]["roles"]):
+        response = {
+            **final_feedback,
+            "company": company,
+            "is_voice_mode": is_voice_mode,
+            "token_usage": TokenAccount.for_session(session_data).status()
+        }
+        log_event("feedback_sent", session_id, stored=True, payload=response)
+        return jsonify(response)
+    
+    # The whole request shares one latency budget: waiting for background work may use
+    # up to half of it, and the rest is left for generating the feedback
+    started = time.monotonic()
+    deadline = deadline_for("end")
+    wait_until = started + (deadline - started) / 2
+    
+    # Stop new speculative drafts, then give any in-flight draft a chance to finish so it
+    # can be reused; a draft still running at wait_until is ignored
+    try:
+        sessions.update(session_id, lambda session_data: session_data.update({"finalizing": True}))
+    except SessionNotFound:
+        # Expired since the check above
+        log_event("session_not_found", session_id, logging.WARNING)
+        return jsonify({"error": "Session not found. Please start a new interview."}), 400
+    with feedback_draft_jobs_lock:
+        draft_job = feedback_draft_jobs.get(session_id)
+    if draft_job is not None:
+        concurrent.futures.wait([draft_job], timeout=max(0.0, wait_until - time.monotonic()))
+    
+    try:
+        # The final feedback needs the deferred evaluations in the transcript; those still
+        # pending at wait_until are left out of the prompt
+        session_data = wait_for_pending_evaluations(session_id, max(0.0, wait_until - time.monotonic()))
+        if session_data is None:
+            log_event("session_not_found", session_id, logging.WARNING)
+            return jsonify({"error": "Session not found. Please start a new interview."}), 400
+        
+        turns = len(session_data["transcript"]["roles"])
+        # Ending is never refused for the token budget, so the candidate always gets feedback
+        account = TokenAccount.for_session(session_data)
+        if session_data.get("feedback_draft") is not None and session_data.get("feedback_draft_turns") == turns:
+            # Nothing changed since the last draft, so it is the final feedback
+            feedback_output = FinalFeedbackOutput(**session_data["feedback_draft"])
+        else:
+            # Finalize the draft (or start from scratch without one) using the shared background event loop
+            feedback_output = run_async(generate_final_feedback(
+                build_feedback_input(session_id, session_data, turns), Priority.FINAL, session_id, deadline, account
+            ))
+        
+        # Add final feedback to history and keep it for repeat calls
+        def record_feedback(session_data):
+            add_session_tokens(session_data, account)
+            history = Transcript(session_data["transcript"])
+            history.append(Role.INTERVIEWER, feedback_output.feedback)
+            session_data.update({
+                "final_feedback": feedback_output.model_dump(),
+                "final_feedback_turns": len(history)
+            })
+        
+        sessions.update(session_id, record_feedback)
+        token_metrics.record_session(company, session_data["interview_type"], account.total_tokens + account.background_tokens)
+        
+        response = {
+            "feedback": feedback_output.feedback,
+            "strengths": feedback_output.strengths,
+            "areas_for_improvement": feedback_output.areas_for_improvement,
+            "overall_rating": feedback_output.overall_rating,
+            "company": company,
+            "is_voice_mode": is_voice_mode,
+            "token_usage": account.status()
+        }
+        log_event(
+            "feedback_sent", session_id, stored=False, overall_rating=feedback_output.overall_rating,
+            total_tokens=account.total_tokens, payload=response
+        )
+        return jsonify(response)
+    
+    except LLMOverloaded as e:
+        log_event("feedback_overloaded", session_id, logging.WARNING, retry_after=e.retry_after)
+        return overloaded_response(e)
+    
+    except Exception as e:
+        log_event("feedback_failed", session_id, logging.ERROR, exc_info=True, error=str(e))
+        metrics.record_error("final_feedback", e)
+        return jsonify({"error": "There was an error generating the final feedback. Please try again."}), 500
+    
+    finally:
+        if session_id in sessions:
+            sessions.update(session_id, lambda session_data: session_data.update({"finalizing": False}))
+
+def evaluate_batch_answers():
+    """
+    Evaluate many standalone answers at once, without creating or advancing sessions.
+    
+    Expects {"items": [{"company", "interview_type", "question", "answer", "id"}, ...]}
+    with optional "concurrency" and "bypass_cache". Results are streamed as
+    newline-delimited JSON in completion order, one line per item.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Provide a non-empty list of items to evaluate."}), 400
+    if len(items) > BATCH_EVALUATION_MAX_ITEMS:
+        return jsonify({"error": f"A batch can contain at most {BATCH_EVALUATION_MAX_ITEMS} items."}), 400
+    
+    try:
+        concurrency = int(data.get("concurrency") or BATCH_EVALUATION_CONCURRENCY)
+    except (TypeError, ValueError):
+        return jsonify({"error": "concurrency must be an integer."}), 400
+    concurrency = min(max(concurrency, 1), BATCH_EVALUATION_CONCURRENCY)
+    bypass_cache = bool(data.get("bypass_cache"))
+    log_event("batch_received", items=len(items), concurrency=concurrency, bypass_cache=bypass_cache)
+    
+    def generate():
+        batch_key = f"batch:{uuid.uuid4()}"
+        for result in iterate_async(evaluate_batch(items, concurrency, bypass_cache, batch_key)):
+            yield json.dumps(result) + "\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def get_session_stats():
+    """Return the live session count, approximate memory use and eviction counters."""
+    return jsonify(sessions.stats())
+
+def get_context_stats():
+    """Return prompt token statistics for evaluator context management."""
+    return jsonify(context_metrics.snapshot())
+
+def get_token_stats():
+    """Return token usage per company, interview type and agent role, and the budget actions taken."""
+    return jsonify(token_metrics.snapshot())
+
+def get_tracing_stats():
+    """Return the trace exporter, sample rates, and span and export counters for this worker."""
+    return jsonify(tracing.stats())
+
+def get_llm_stats():
+    """Return LLM queue depth, wait times, call latencies per agent and the adaptive rate limits for this worker."""
+    return jsonify({**llm_limiter.stats(), "call_seconds": call_latencies.snapshot(), "models": model_router.stats()})
+
+def get_cache_stats():
+    """Return evaluation cache hit-rate statistics for this worker."""
+    return jsonify(evaluation_cache.stats())
+
+def convert_voice():
+    """
+    Process voice data for speech-to-text conversion.
+    Note: In a production app, you'd integrate with a real speech service.
+    This endpoint is a placeholder that simulates the functionality.
+    """
+    # In a real implementation, this would use a speech-to-text service
+    # For now, we'll just echo back the text if it's provided
+    data = request.get_json()
+    text = data.get("text", "")
+    
+    # Here you would call a speech-to-text service
+    # For example: Google Cloud Speech-to-Text, Azure Speech, etc.
+    
+    return jsonify({"text": text})
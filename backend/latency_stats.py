@@ -0,0 +1,66 @@
+"""
+Helpers for reporting latency distributions.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Linearly interpolated percentile of already sorted values.
+
+    Args:
+        sorted_values: Samples in ascending order
+        fraction: The percentile as a fraction (0.95 for p95)
+
+    Returns:
+        The percentile, or 0.0 when there are no samples
+    """
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize_latencies(values: Sequence[float]) -> Dict[str, float]:
+    """Return the count, mean, p50, p95, p99 and maximum of latency samples (in seconds)."""
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 0.50),
+        "p95": percentile(ordered, 0.95),
+        "p99": percentile(ordered, 0.99),
+        "max": ordered[-1] if ordered else 0.0
+    }
+
+class LatencyTracker:
+    """Rolling window of recent latencies per key (e.g. per agent), for percentile-based decisions."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self.lock = threading.Lock()
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        with self.lock:
+            samples = self.samples.get(key)
+            if samples is None:
+                samples = self.samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, key: str, fraction: float, min_samples: int = 20) -> Optional[float]:
+        """Return a percentile of the recent latencies, or None with fewer than min_samples samples."""
+        with self.lock:
+            samples = sorted(self.samples.get(key, ()))
+        if len(samples) < min_samples:
+            return None
+        return percentile(samples, fraction)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the latency summary of every key."""
+        with self.lock:
+            samples = {key: list(values) for key, values in self.samples.items()}
+        return {key: summarize_latencies(values) for key, values in samples.items()}
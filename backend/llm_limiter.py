@@ -0,0 +1,261 @@
+"""
+Admission control for LLM calls.
+
+Every agent call waits for a slot from the process-wide limiter before it is
+sent. A slot needs both a token from a token bucket (requests per second) and
+room under the in-flight cap. When the provider answers with 429s, both limits
+are scaled down multiplicatively and then grow back additively with each
+successful call (AIMD), instead of every waiting request retrying at once.
+
+Waiting calls are queued by priority (voice answers first, batch work last).
+Within a priority, sessions take turns, so one session with many queued calls
+cannot starve the others.
+
+The limiter runs on the shared event loop (see async_runtime.py); all of its
+state is touched from that loop only, apart from stats().
+"""
+
+import os
+import time
+import asyncio
+import threading
+from enum import IntEnum
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from latency_stats import summarize_latencies
+
+class Priority(IntEnum):
+    """Queueing priority of an LLM call; lower values are admitted first."""
+    VOICE = 0
+    INTERACTIVE = 1
+    FINAL = 2
+    BACKGROUND = 3
+    BATCH = 4
+
+class LLMOverloaded(Exception):
+    """Raised when an LLM call cannot be made now because of rate limits or a full queue."""
+
+    def __init__(self, message: str, retry_after: float = 5.0, retryable: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        # True when the provider rejected the call (429), so trying again later may succeed
+        self.retryable = retryable
+
+# Wait-time samples kept per priority for the queue metrics
+WAIT_SAMPLES = 1000
+
+class LLMLimiter:
+    """Token bucket plus in-flight cap with AIMD backoff and fair, prioritized queueing."""
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        max_in_flight: int = 16,
+        queue_timeout: float = 30.0,
+        min_scale: float = 0.05,
+        increase_step: float = 0.02,
+        decrease_factor: float = 0.5,
+        decrease_interval: float = 1.0
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.queue_timeout = queue_timeout
+        self.min_scale = min_scale
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.decrease_interval = decrease_interval
+
+        # AIMD multiplier applied to both the rate and the in-flight cap
+        self.scale = 1.0
+        self.last_decrease = 0.0
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+        self.in_flight = 0
+        # Per priority: session key -> its waiting futures, in round-robin order
+        self.queues: Dict[Priority, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            priority: OrderedDict() for priority in Priority
+        }
+        self.queued = {priority: 0 for priority in Priority}
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+        self.lock = threading.Lock()
+        self.wait_samples = {priority: deque(maxlen=WAIT_SAMPLES) for priority in Priority}
+        self.counters = {"admitted": 0, "rate_limited": 0, "timed_out": 0, "cancelled": 0}
+
+    @property
+    def in_flight_limit(self) -> int:
+        return max(1, int(self.max_in_flight * self.scale))
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a slot, across all priorities."""
+        return sum(self.queued.values())
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.refilled_at) * self.rate * self.scale)
+        self.refilled_at = now
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the next waiter: highest priority first, sessions in turn within a priority."""
+        for priority in Priority:
+            sessions = self.queues[priority]
+            while sessions:
+                key, waiters = next(iter(sessions.items()))
+                waiter = waiters.popleft()
+                if waiters:
+                    sessions.move_to_end(key)
+                else:
+                    del sessions[key]
+                self.queued[priority] -= 1
+                if not waiter.done():
+                    return waiter
+        return None
+
+    def _dispatch(self) -> None:
+        """Admit as many queued calls as the bucket and the in-flight cap allow."""
+        self.timer = None
+        while self.in_flight < self.in_flight_limit and any(self.queued.values()):
+            self._refill()
+            if self.tokens < 1:
+                delay = (1 - self.tokens) / (self.rate * self.scale)
+                self.timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self.tokens -= 1
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def _remove(self, priority: Priority, key: str, waiter: asyncio.Future) -> None:
+        waiters = self.queues[priority].get(key)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            self.queued[priority] -= 1
+            if not waiters:
+                del self.queues[priority][key]
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE, key: str = "", timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot to make one LLM call.
+
+        Args:
+            priority: The call's queueing priority
+            key: Fairness key, usually the session ID
+            timeout: Maximum wait in seconds; the limiter's queue timeout applies if it is shorter
+
+        Raises:
+            LLMOverloaded: If no slot became free within the timeout
+        """
+        if timeout is None or timeout > self.queue_timeout:
+            timeout = self.queue_timeout
+        waiter = asyncio.get_running_loop().create_future()
+        self.queues[priority].setdefault(key, deque()).append(waiter)
+        self.queued[priority] += 1
+        started = time.monotonic()
+        if self.timer is None:
+            self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), max(timeout, 0.0))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted just as the wait ended; hand it back
+                self.release()
+            else:
+                waiter.cancel()
+                self._remove(priority, key, waiter)
+            with self.lock:
+                self.counters["timed_out" if isinstance(e, asyncio.TimeoutError) else "cancelled"] += 1
+            if isinstance(e, asyncio.TimeoutError):
+                raise LLMOverloaded("Timed out waiting for LLM capacity") from e
+            raise
+
+        with self.lock:
+            self.counters["admitted"] += 1
+            self.wait_samples[priority].append(time.monotonic() - started)
+
+    def release(self, rate_limited: bool = False) -> None:
+        """
+        Return a slot after a call finishes and adapt the limits to its outcome.
+
+        Args:
+            rate_limited: Whether the provider rejected the call with a rate limit (429)
+        """
+        self.in_flight -= 1
+        now = time.monotonic()
+        if rate_limited:
+            with self.lock:
+                self.counters["rate_limited"] += 1
+            # Back off once per interval, not once per 429 of the same burst
+            if now - self.last_decrease >= self.decrease_interval:
+                self.scale = max(self.min_scale, self.scale * self.decrease_factor)
+                self.last_decrease = now
+                self.tokens = min(self.tokens, 0.0)
+        else:
+            self.scale = min(1.0, self.scale + self.increase_step)
+        if self.timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority = Priority.INTERACTIVE,
+        key: str = "",
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of a block; 429 errors raised in the block trigger backoff.
+
+        Rate-limit errors from the provider are re-raised as LLMOverloaded.
+        """
+        await self.acquire(priority, key, timeout)
+        rate_limited = False
+        try:
+            yield
+        except Exception as e:
+            if is_rate_limit_error(e):
+                rate_limited = True
+                raise LLMOverloaded("The LLM provider is rate limiting requests", retry_after_seconds(e), retryable=True) from e
+            raise
+        finally:
+            self.release(rate_limited)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, wait times and the current adaptive limits."""
+        with self.lock:
+            counters = dict(self.counters)
+            waits = {priority.name.lower(): list(samples) for priority, samples in self.wait_samples.items()}
+        return {
+            **counters,
+            "in_flight": self.in_flight,
+            "in_flight_limit": self.in_flight_limit,
+            "rate_limit": self.rate * self.scale,
+            "scale": self.scale,
+            "queue_depth": {priority.name.lower(): count for priority, count in self.queued.items()},
+            "wait_seconds": {name: summarize_latencies(samples) for name, samples in waits.items()}
+        }
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an exception is the provider's HTTP 429 response."""
+    return getattr(error, "status_code", None) == 429
+
+def retry_after_seconds(error: BaseException, default: float = 5.0) -> float:
+    """Read the Retry-After header of a provider error, if it has one."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return default
+
+llm_limiter = LLMLimiter(
+    rate=float(os.environ.get('LLM_RATE_LIMIT', '10')),
+    burst=int(os.environ.get('LLM_BURST', '20')),
+    max_in_flight=int(os.environ.get('LLM_MAX_IN_FLIGHT', '16')),
+    queue_timeout=float(os.environ.get('LLM_QUEUE_TIMEOUT', '30'))
+)
@@ -0,0 +1,134 @@
+"""
+Prometheus metrics for the API.
+
+init_app() adds a /metrics endpoint and times every request. The modules that
+call the LLM report their calls through observe_llm_call(), and error paths
+through record_error(). Exposed metrics:
+
+- http_request_duration_seconds: request latency by method, route and status
+  (for streamed responses, the time until the response starts)
+- llm_call_duration_seconds: LLM call latency by agent, model and outcome
+- llm_tokens_total: input and output tokens by agent and model
+- llm_prompt_tokens: prompt size histogram by agent
+- interview_active_sessions: sessions in the session store
+- app_errors_total: errors by where they happened and exception type
+
+Updating a metric costs a few microseconds, so they can stay on in production.
+With several gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers: each worker then writes its values to
+memory-mapped files there, and /metrics aggregates all of them (the child_exit
+hook in gunicorn.conf.py cleans up after exited workers).
+
+prometheus_client is optional; without it (or with METRICS_ENABLED=false)
+every function here is a no-op and /metrics answers 503.
+"""
+
+import os
+import time
+from typing import Any, Callable, Optional
+
+from flask import Flask, Response, g, jsonify, request
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+METRICS_ENABLED = PROMETHEUS_AVAILABLE and os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+MULTIPROCESS = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+if METRICS_ENABLED:
+    REQUEST_DURATION = Histogram(
+        "http_request_duration_seconds", "HTTP request latency",
+        ["method", "route", "status"],
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+    )
+    LLM_CALL_DURATION = Histogram(
+        "llm_call_duration_seconds", "LLM call latency, excluding queueing",
+        ["agent", "model", "outcome"],
+        buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+    )
+    LLM_TOKENS = Counter("llm_tokens", "LLM tokens used", ["agent", "model", "kind"])
+    PROMPT_TOKENS = Histogram(
+        "llm_prompt_tokens", "LLM prompt size in tokens",
+        ["agent"],
+        buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+    )
+    ACTIVE_SESSIONS = Gauge(
+        "interview_active_sessions", "Sessions in the session store",
+        multiprocess_mode="livemostrecent"
+    )
+    ERRORS = Counter("app_errors", "Errors by where they happened and exception type", ["source", "type"])
+
+def observe_llm_call(agent: str, model: str, seconds: float, outcome: str = "ok", usage: Any = None) -> None:
+    """
+    Record one LLM call.
+
+    Args:
+        agent: Agent name (e.g. "EvaluatorAgent")
+        model: Model the call used
+        seconds: Call latency, excluding time queued in the limiter
+        outcome: "ok" or the error type
+        usage: The run's agents.usage.Usage, for token counts
+    """
+    if not METRICS_ENABLED:
+        return
+    LLM_CALL_DURATION.labels(agent, model, outcome).observe(seconds)
+    if usage is not None and usage.requests:
+        LLM_TOKENS.labels(agent, model, "input").inc(usage.input_tokens)
+        LLM_TOKENS.labels(agent, model, "output").inc(usage.output_tokens)
+        PROMPT_TOKENS.labels(agent).observe(usage.input_tokens / usage.requests)
+
+def record_error(source: str, error: BaseException) -> None:
+    """Count an error, labelled with where it happened (e.g. "answer") and its exception type."""
+    if METRICS_ENABLED:
+        ERRORS.labels(source, type(error).__name__).inc()
+
+def set_active_sessions(count: int) -> None:
+    if METRICS_ENABLED:
+        ACTIVE_SESSIONS.set(count)
+
+def render() -> bytes:
+    """Return all metrics in the Prometheus text format, aggregated across workers in multiprocess mode."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return prometheus_client.generate_latest(registry)
+    return prometheus_client.generate_latest()
+
+def init_app(app: Flask, active_sessions: Optional[Callable[[], int]] = None) -> None:
+    """
+    Time every request of the app and add the /metrics endpoint.
+
+    Args:
+        app: The Flask app
+        active_sessions: Returns the current number of sessions; read on each scrape
+    """
+    @app.route('/metrics')
+    def get_metrics():
+        """Expose the metrics in the Prometheus text format."""
+        if not METRICS_ENABLED:
+            return jsonify({"error": "Metrics are disabled (install prometheus-client and set METRICS_ENABLED)."}), 503
+        if active_sessions is not None:
+            set_active_sessions(active_sessions())
+        return Response(render(), mimetype=prometheus_client.CONTENT_TYPE_LATEST)
+
+    if not METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            # The route pattern, not the URL, keeps the label set small
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            REQUEST_DURATION.labels(request.method, route, str(response.status_code)).observe(
+                time.perf_counter() - started
+            )
+        return response
@@ -0,0 +1,328 @@
+"""
+Local stand-in for the OpenAI models, for load testing without network or cost.
+
+Selected with LLM_BACKEND=mock (see agent_runner.py). The mock plugs into the
+Agents SDK as a model provider, so a load test still goes through the runner,
+structured output parsing and streaming events, and measures the server's own
+overhead and concurrency behaviour. Only the network call is replaced.
+
+Responses are schema-valid JSON for the agent's output type (EvaluationOutput,
+FinalFeedbackOutput, ...) and are deterministic for a given prompt. Latency is
+drawn from a configurable distribution (seeded, so runs are repeatable), and
+streamed responses arrive in fixed-size chunks spread over that latency.
+Provider errors can be injected at configurable rates:
+
+    LLM_MOCK_LATENCY          Latency distribution: "fixed:0.8", "uniform:0.5,2",
+                              "lognormal:0.8,0.5" (median, sigma) or "exponential:0.8" (mean)
+    LLM_MOCK_FIRST_CHUNK      Share of a streamed response's latency before its first chunk
+    LLM_MOCK_CHUNK_CHARS      Characters per streamed chunk
+    LLM_MOCK_OUTPUT_WORDS     Words in each generated text field
+    LLM_MOCK_RATE_LIMIT_RATE  Share of calls answered with a 429
+    LLM_MOCK_ERROR_RATE       Share of calls failing with a 500
+    LLM_MOCK_TIMEOUT_RATE     Share of calls that time out
+    LLM_MOCK_SEED             Seed of the latency and error draws
+"""
+
+import os
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+import httpx
+import openai
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from agents.items import ModelResponse
+from agents.models.interface import Model, ModelProvider
+from agents.usage import Usage
+
+# Vocabulary of the generated text
+WORDS = (
+    "candidate answer explains tradeoffs clearly structured approach considers scalability "
+    "latency consistency examples impact ownership communication depth edge cases design "
+    "requirements data model caching failure modes metrics improvement follow up strong "
+    "specific concise reasoning assumptions alternatives testing collaboration outcome"
+).split()
+
+# Request used to build the injected provider errors
+MOCK_REQUEST = httpx.Request("POST", "https://mock.invalid/v1/responses")
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution spec into a sampler.
+
+    Args:
+        spec: "fixed:S", "uniform:LOW,HIGH", "lognormal:MEDIAN,SIGMA" or "exponential:MEAN", in seconds
+
+    Returns:
+        Function drawing one latency from a random generator
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    try:
+        if kind == "fixed":
+            return lambda rng: values[0]
+        if kind == "uniform":
+            return lambda rng: rng.uniform(values[0], values[1])
+        if kind == "lognormal":
+            return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+        if kind == "exponential":
+            return lambda rng: rng.expovariate(1 / values[0])
+    except (IndexError, ZeroDivisionError):
+        pass
+    raise ValueError(f"Invalid LLM_MOCK_LATENCY: {spec!r}")
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+def input_text(system_instructions: Optional[str], input: Any) -> str:
+    """Flatten the instructions and input items into the text the response is derived from."""
+    parts = [system_instructions or ""]
+    if isinstance(input, str):
+        parts.append(input)
+    else:
+        for item in input:
+            content = item.get("content") if isinstance(item, dict) else None
+            if isinstance(content, str):
+                parts.append(content)
+            elif isinstance(content, list):
+                parts.extend(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return "\n".join(parts)
+
+class MockResponder:
+    """Builds deterministic, schema-valid output documents."""
+
+    def __init__(self, output_words: int):
+        self.output_words = output_words
+
+    def text(self, rng: random.Random, words: int) -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+    def value(self, schema: Dict[str, Any], definitions: Dict[str, Any], rng: random.Random, name: str) -> Any:
+        """Generate a value matching a JSON schema (the subset used by pydantic output types)."""
+        if "$ref" in schema:
+            return self.value(definitions[schema["$ref"].rsplit("/", 1)[-1]], definitions, rng, name)
+        if "anyOf" in schema:
+            options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+            return self.value(options[0], definitions, rng, name) if options else None
+        if "enum" in schema:
+            return schema["enum"][0]
+
+        kind = schema.get("type")
+        if kind == "object":
+            return {
+                field: self.value(field_schema, definitions, rng, field)
+                for field, field_schema in schema.get("properties", {}).items()
+            }
+        if kind == "array":
+            return [self.value(schema.get("items", {}), definitions, rng, name) for _ in range(3)]
+        if kind == "integer":
+            return rng.randint(1, 5)
+        if kind == "number":
+            return round(rng.uniform(1, 5), 1)
+        if kind == "boolean":
+            return rng.random() < 0.5
+        if "rating" in name:
+            return f"{rng.randint(1, 5)}/5"
+        # Long text for the main fields, short items for lists
+        return self.text(rng, self.output_words if name in ("evaluation", "feedback", "summary") else 12)
+
+    def document(self, output_schema: Any, prompt: str) -> str:
+        """Return the output text for a prompt: JSON for a structured output type, plain text otherwise."""
+        rng = random.Random(hashlib.blake2b(prompt.encode(), digest_size=8).digest())
+        if output_schema is None or output_schema.is_plain_text():
+            return self.text(rng, self.output_words)
+        schema = output_schema.json_schema()
+        return json.dumps(self.value(schema, schema.get("$defs", {}), rng, ""))
+
+class MockModel(Model):
+    """A model that answers locally after a simulated delay."""
+
+    def __init__(self, name: str, provider: "MockModelProvider"):
+        self.name = name
+        self.provider = provider
+
+    def _message(self, text: str) -> ResponseOutputMessage:
+        return ResponseOutputMessage(
+            id="msg_mock",
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=text, annotations=[], logprobs=[])]
+        )
+
+    async def get_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None
+    ) -> ModelResponse:
+        prompt_text = input_text(system_instructions, input)
+        latency, failure = self.provider.draw()
+        await self.provider.wait_or_fail(latency, failure)
+
+        text = self.provider.responder.document(output_schema, prompt_text)
+        input_tokens, output_tokens = estimate_tokens(prompt_text), estimate_tokens(text)
+        return ModelResponse(
+            output=[self._message(text)],
+            usage=Usage(
+                requests=1,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                total_tokens=input_tokens + output_tokens
+            ),
+            response_id=None
+        )
+
+    async def stream_response(
+        self,
+        system_instructions,
+        input,
+        model_settings,
+        tools,
+        output_schema,
+        handoffs,
+        tracing,
+        *,
+        previous_response_id=None,
+        conversation_id=None,
+        prompt=None
+    ) -> AsyncIterator[Any]:
+        prompt_text = input_text(system_instructions, input)
+        latency, failure = self.provider.draw()
+        first_chunk = latency * self.provider.first_chunk
+        await self.provider.wait_or_fail(first_chunk, failure)
+
+        response = Response(
+            id="resp_mock",
+            created_at=time.time(),
+            model=self.name,
+            object="response",
+            output=[],
+            tool_choice="auto",
+            tools=[],
+            parallel_tool_calls=False
+        )
+        sequence = 0
+        yield ResponseCreatedEvent(type="response.created", response=response, sequence_number=sequence)
+
+        text = self.provider.responder.document(output_schema, prompt_text)
+        size = self.provider.chunk_chars
+        chunks = [text[start:start + size] for start in range(0, len(text), size)]
+        interval = (latency - first_chunk) / max(1, len(chunks))
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(interval)
+            sequence += 1
+            yield ResponseTextDeltaEvent(
+                type="response.output_text.delta",
+                content_index=0,
+                delta=chunk,
+                item_id="msg_mock",
+                output_index=0,
+                logprobs=[],
+                sequence_number=sequence
+            )
+
+        input_tokens, output_tokens = estimate_tokens(prompt_text), estimate_tokens(text)
+        final = response.model_copy()
+        final.output = [self._message(text)]
+        final.usage = ResponseUsage(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+            # Constructed without validation: the required detail fields differ between openai versions
+            input_tokens_details=InputTokensDetails.model_construct(cached_tokens=0),
+            output_tokens_details=OutputTokensDetails.model_construct(reasoning_tokens=0)
+        )
+        yield ResponseCompletedEvent(type="response.completed", response=final, sequence_number=sequence + 1)
+
+class MockModelProvider(ModelProvider):
+    """Model provider returning MockModel for every model name."""
+
+    def __init__(
+        self,
+        latency: str = "lognormal:0.8,0.5",
+        first_chunk: float = 0.2,
+        chunk_chars: int = 16,
+        output_words: int = 120,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        seed: int = 0
+    ):
+        self.sample_latency = parse_latency(latency)
+        self.first_chunk = first_chunk
+        self.chunk_chars = max(1, chunk_chars)
+        self.responder = MockResponder(output_words)
+        self.failure_rates = [("rate_limit", rate_limit_rate), ("server_error", error_rate), ("timeout", timeout_rate)]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.models: Dict[str, MockModel] = {}
+
+    @classmethod
+    def from_env(cls) -> "MockModelProvider":
+        return cls(
+            latency=os.environ.get('LLM_MOCK_LATENCY', 'lognormal:0.8,0.5'),
+            first_chunk=float(os.environ.get('LLM_MOCK_FIRST_CHUNK', '0.2')),
+            chunk_chars=int(os.environ.get('LLM_MOCK_CHUNK_CHARS', '16')),
+            output_words=int(os.environ.get('LLM_MOCK_OUTPUT_WORDS', '120')),
+            rate_limit_rate=float(os.environ.get('LLM_MOCK_RATE_LIMIT_RATE', '0')),
+            error_rate=float(os.environ.get('LLM_MOCK_ERROR_RATE', '0')),
+            timeout_rate=float(os.environ.get('LLM_MOCK_TIMEOUT_RATE', '0')),
+            seed=int(os.environ.get('LLM_MOCK_SEED', '0'))
+        )
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        name = model_name or "mock"
+        model = self.models.get(name)
+        if model is None:
+            model = self.models.setdefault(name, MockModel(name, self))
+        return model
+
+    def draw(self) -> Tuple[float, Optional[str]]:
+        """Draw one call's latency and injected failure (None for success)."""
+        with self.lock:
+            latency = max(0.0, self.sample_latency(self.rng))
+            roll = self.rng.random()
+        for failure, rate in self.failure_rates:
+            if roll < rate:
+                return latency, failure
+            roll -= rate
+        return latency, None
+
+    async def wait_or_fail(self, latency: float, failure: Optional[str]) -> None:
+        """Sleep for the simulated latency, then raise the injected error, if any."""
+        if failure == "rate_limit":
+            # Rate limits are rejected quickly, before any generation
+            await asyncio.sleep(latency * 0.05)
+            response = httpx.Response(429, headers={"retry-after": "1"}, request=MOCK_REQUEST)
+            raise openai.RateLimitError("Mock rate limit", response=response, body=None)
+        await asyncio.sleep(latency)
+        if failure == "server_error":
+            response = httpx.Response(500, request=MOCK_REQUEST)
+            raise openai.InternalServerError("Mock server error", response=response, body=None)
+        if failure == "timeout":
+            raise openai.APITimeoutError(request=MOCK_REQUEST)
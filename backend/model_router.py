@@ -0,0 +1,139 @@
+"""
+Model routing for the interview agents.
+
+Each agent role ("evaluator", "feedback", "summarizer") has a default model set
+through environment variables. Per-answer evaluations are numerous and
+latency-sensitive, so they default to a fast model; final feedback is rare and
+quality-sensitive, so it defaults to the strong one. A company's data file can
+override the model per interview type and role (the "models" section, see
+question_registry.py).
+
+When a call is likely to miss its latency budget, because the LLM queue is deep
+or the routed model's recent p95 latency takes up most of the remaining budget,
+the role's fallback model is used instead. Sessions that have used most of
+their token budget (see token_budget.py) are also sent to the fallback model.
+The fallbacks default to a smaller model than each role's default, so that
+falling back actually sheds load. A role whose fallback is empty, or the same
+as the model a call is routed to, never falls back.
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from agents import Agent
+
+from agent_runner import call_latencies, latency_key
+from llm_limiter import llm_limiter
+from question_registry import registry
+
+DEFAULT_MODELS = {
+    "evaluator": os.environ.get('MODEL_EVALUATOR', 'gpt-4o-mini'),
+    "feedback": os.environ.get('MODEL_FEEDBACK', 'gpt-4o'),
+    "summarizer": os.environ.get('MODEL_SUMMARIZER', 'gpt-4o-mini')
+}
+
+FALLBACK_MODELS = {
+    "evaluator": os.environ.get('MODEL_FALLBACK_EVALUATOR', 'gpt-4.1-nano'),
+    "feedback": os.environ.get('MODEL_FALLBACK_FEEDBACK', 'gpt-4o-mini'),
+    "summarizer": os.environ.get('MODEL_FALLBACK_SUMMARIZER', 'gpt-4.1-nano')
+}
+
+class ModelRouter:
+    """Chooses the model of each agent call and falls back to a faster one under load."""
+
+    def __init__(
+        self,
+        defaults: Dict[str, str],
+        fallbacks: Dict[str, str],
+        queue_depth_threshold: int = 8,
+        slo_fraction: float = 0.8
+    ):
+        self.defaults = defaults
+        self.fallbacks = fallbacks
+        # Fall back when at least this many calls are waiting for a slot
+        self.queue_depth_threshold = queue_depth_threshold
+        # Fall back when the model's p95 latency exceeds this share of the remaining budget
+        self.slo_fraction = slo_fraction
+
+        # Copies of the agents with another model, by (agent name, model)
+        self.agents: Dict[Tuple[str, str], Agent] = {}
+        self.lock = threading.Lock()
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def model_for(self, role: str, company: str, interview_type: str) -> str:
+        """Return the configured model of a role for a company and interview type, ignoring load."""
+        return registry.get_model_override(company, interview_type, role) or self.defaults[role]
+
+    def fallback_reason(self, agent: Agent, deadline: Optional[float]) -> Optional[str]:
+        """Return why a call to the agent should use the fallback model now, or None."""
+        if llm_limiter.queue_depth >= self.queue_depth_threshold:
+            return "queue_depth"
+        if deadline is not None:
+            p95 = call_latencies.percentile(latency_key(agent), 0.95)
+            if p95 is not None and p95 > (deadline - time.monotonic()) * self.slo_fraction:
+                return "latency"
+        return None
+
+    def with_model(self, agent: Agent, model: str) -> Agent:
+        """Return the agent set up to use the model (the agent itself if it already does)."""
+        if agent.model == model:
+            return agent
+        key = (agent.name, model)
+        routed = self.agents.get(key)
+        if routed is None:
+            with self.lock:
+                routed = self.agents.setdefault(key, agent.clone(model=model))
+        return routed
+
+    def route(
+        self,
+        agent: Agent,
+        role: str,
+        company: str,
+        interview_type: str,
+        deadline: Optional[float] = None,
+        over_budget: bool = False
+    ) -> Agent:
+        """
+        Pick the model for one agent call.
+
+        Args:
+            agent: The agent to run
+            role: The agent's role ("evaluator", "feedback" or "summarizer")
+            company: The interview's company
+            interview_type: The interview type
+            deadline: time.monotonic() deadline of the call, if it has one
+            over_budget: The call's session is low on tokens, so use the fallback model
+
+        Returns:
+            The agent, set up with the chosen model
+        """
+        routed = self.with_model(agent, self.model_for(role, company, interview_type))
+        fallback = self.fallbacks.get(role)
+        reason = None
+        if fallback and fallback != routed.model:
+            reason = "token_budget" if over_budget else self.fallback_reason(routed, deadline)
+            if reason:
+                routed = self.with_model(agent, fallback)
+
+        with self.lock:
+            counters = self.counters.setdefault(f"{role}/{routed.model}", {"calls": 0, "fallbacks": 0})
+            counters["calls"] += 1
+            if reason:
+                counters["fallbacks"] += 1
+        return routed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the configured models and the number of calls (and fallbacks) routed to each."""
+        with self.lock:
+            routed = {key: dict(counters) for key, counters in self.counters.items()}
+        return {"defaults": self.defaults, "fallbacks": self.fallbacks, "routed": routed}
+
+model_router = ModelRouter(
+    DEFAULT_MODELS,
+    FALLBACK_MODELS,
+    queue_depth_threshold=int(os.environ.get('MODEL_FALLBACK_QUEUE_DEPTH', '8')),
+    slo_fraction=float(os.environ.get('MODEL_FALLBACK_SLO_FRACTION', '0.8'))
+)
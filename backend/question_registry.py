@@ -0,0 +1,338 @@
+"""
+Registry of company question banks and evaluation configurations.
+
+Each company is described by one JSON data file in the question banks directory,
+named after the company (e.g. question_banks/Google.json):
+
+    {
+        "questions": {"technical": [{"question": ..., "evaluation_prompt": ...}], ...},
+        "evaluation": {"technical": {"criteria": [...], "structure": {...}}, ...},
+        "models": {"system_design": {"evaluator": "gpt-4o"}, ...}
+    }
+
+The optional "models" section overrides the model used per agent role for the
+company's interview types (see model_router.py).
+
+Files are loaded lazily the first time a company is used and indexed by
+canonical company name and interview type, so lookups are dictionary hits.
+Interview types are resolved through a precomputed alias table ("System Design",
+"systems_design" and "design" all map to "system_design"). Changed files are
+picked up without restarting workers: a company's file is re-checked at most
+once per reload interval and reloaded when its modification time changes.
+
+Each interview type's questions carry a version, a hash of their content that
+is the same in every worker. Interviews pin the version they started with
+(get_questions_version()), so an edited bank only applies to new interviews.
+Versions replaced by a reload are kept for the life of the process; an edit
+costs a few kilobytes.
+
+Loaded data is frozen (see freeze()): questions become BankQuestion tuples and
+configurations read-only mappings and tuples, with every string interned. Data
+loaded in a gunicorn master before it forks (preload, see gunicorn.conf.py) is
+then shared by the workers, since nothing writes to it and the garbage
+collector does not track it.
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from event_log import log_event
+
+DEFAULT_BANKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'question_banks')
+
+# Canonical interview types and the names they are also known by
+INTERVIEW_TYPE_ALIASES = {
+    "general": (),
+    "technical": ("tech", "coding"),
+    "behavioral": ("behavior", "behaviour", "behavioural", "leadership"),
+    "system_design": ("systems_design", "design")
+}
+
+@lru_cache(maxsize=4096)
+def normalize_name(name: str) -> str:
+    """Case-fold a name and join its words with underscores ("System Design" -> "system_design")."""
+    return "_".join((name or "").casefold().replace("-", " ").replace("_", " ").split())
+
+_INTERVIEW_TYPE_TABLE = MappingProxyType({
+    normalize_name(alias): canonical
+    for canonical, aliases in INTERVIEW_TYPE_ALIASES.items()
+    for alias in (canonical,) + aliases
+})
+
+def canonical_interview_type(interview_type: str) -> str:
+    """
+    Resolve an interview type to its canonical name.
+
+    Args:
+        interview_type: The interview type as requested (e.g. "System Design")
+
+    Returns:
+        The canonical interview type, or the normalized name if it has no alias
+    """
+    key = normalize_name(interview_type)
+    return _INTERVIEW_TYPE_TABLE.get(key, key)
+
+class QuestionBankChanged(LookupError):
+    """Raised when an interview's pinned question bank version is not available in this process."""
+
+class BankQuestion(NamedTuple):
+    """A question of a question bank and the prompt its answers are evaluated with."""
+    question: str
+    evaluation_prompt: str
+
+def freeze(value: Any) -> Any:
+    """
+    Return a read-only copy of JSON data with its strings interned.
+
+    Dicts become read-only mappings and lists tuples, so the data cannot be
+    changed in place and identical strings (keys, criteria names) are stored once.
+    json.dumps() needs default=dict to render the mappings.
+    """
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(key): freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+class CompanyBank:
+    """The loaded data file of one company, frozen."""
+
+    __slots__ = ("name", "path", "signature", "checked_at", "questions", "versions", "evaluation", "prompts", "models")
+
+    def __init__(self, name: str, path: str, signature: Tuple[int, int], data: Dict[str, Any]):
+        self.name = name
+        self.path = path
+        self.signature = signature
+        self.checked_at = time.monotonic()
+        self.questions: Mapping[str, Tuple[BankQuestion, ...]] = MappingProxyType({
+            sys.intern(canonical_interview_type(interview_type)): tuple(
+                BankQuestion(sys.intern(question["question"]), sys.intern(question["evaluation_prompt"]))
+                for question in questions
+            )
+            for interview_type, questions in data.get("questions", {}).items()
+        })
+        # Content hash of each interview type's questions, identical across processes
+        self.versions: Mapping[str, str] = MappingProxyType({
+            interview_type: _questions_version(questions) for interview_type, questions in self.questions.items()
+        })
+        self.evaluation: Mapping[str, Mapping[str, Any]] = MappingProxyType({
+            sys.intern(canonical_interview_type(interview_type)): freeze(config)
+            for interview_type, config in data.get("evaluation", {}).items()
+        })
+        # Evaluation prompt by (interview type, question text)
+        self.prompts: Mapping[Tuple[str, str], str] = MappingProxyType({
+            (interview_type, question.question): question.evaluation_prompt
+            for interview_type, questions in self.questions.items()
+            for question in questions
+        })
+        # Model overrides by interview type, then agent role
+        self.models: Mapping[str, Mapping[str, str]] = MappingProxyType({
+            sys.intern(canonical_interview_type(interview_type)): freeze(models)
+            for interview_type, models in data.get("models", {}).items()
+        })
+
+def _questions_version(questions: Tuple[BankQuestion, ...]) -> str:
+    encoded = json.dumps(questions, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+class QuestionRegistry:
+    """Lazily loaded, hot-reloaded index of company question banks."""
+
+    def __init__(self, directory: str, reload_interval: float = 5.0):
+        self.directory = directory
+        self.reload_interval = reload_interval
+        self.lock = threading.RLock()
+        self.files: Dict[str, Tuple[str, str]] = {}  # normalized name -> (company name, path)
+        self.scanned_at: Optional[float] = None
+        self.banks: Dict[str, CompanyBank] = {}
+        # Questions replaced by reloads, by (normalized name, interview type, version)
+        self.retired: Dict[Tuple[str, str, str], Tuple[BankQuestion, ...]] = {}
+        self.listeners: List[Callable[[str], None]] = []
+        self.counters = {"loads": 0, "reloads": 0, "errors": 0}
+
+    def add_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback that receives the company name whenever its data is (re)loaded."""
+        self.listeners.append(callback)
+
+    def _stale(self, checked_at: Optional[float]) -> bool:
+        if checked_at is None:
+            return True
+        return self.reload_interval > 0 and time.monotonic() - checked_at > self.reload_interval
+
+    def _scan(self) -> Dict[str, Tuple[str, str]]:
+        """Index the data files by normalized company name, re-listing the directory when stale."""
+        if not self._stale(self.scanned_at):
+            return self.files
+        with self.lock:
+            if self._stale(self.scanned_at):
+                files = {}
+                try:
+                    with os.scandir(self.directory) as entries:
+                        for entry in entries:
+                            name, extension = os.path.splitext(entry.name)
+                            if extension == ".json" and entry.is_file():
+                                files[normalize_name(name)] = (name, entry.path)
+                except OSError as e:
+                    log_event("question_banks_list_failed", level=logging.ERROR, directory=self.directory, error=str(e))
+                    self.counters["errors"] += 1
+                    files = self.files
+                self.files = files
+                self.scanned_at = time.monotonic()
+            return self.files
+
+    def companies(self) -> List[str]:
+        """Return the names of all companies with a question bank, without loading them."""
+        return sorted(name for name, _ in self._scan().values())
+
+    def canonical_company(self, company: str) -> Optional[str]:
+        """Resolve a company name case-insensitively, or return None if it has no question bank."""
+        found = self._scan().get(normalize_name(company))
+        return found[0] if found else None
+
+    def get_company(self, company: str) -> Optional[CompanyBank]:
+        """
+        Get a company's loaded data, loading or reloading its file as needed.
+
+        Args:
+            company: The company name (any capitalization)
+
+        Returns:
+            The company's data, or None if it has no question bank
+        """
+        key = normalize_name(company)
+        bank = self.banks.get(key)
+        if bank is not None and not self._stale(bank.checked_at):
+            return bank
+
+        found = self._scan().get(key)
+        if found is None:
+            return bank
+        name, path = found
+
+        with self.lock:
+            bank = self.banks.get(key)
+            if bank is not None and not self._stale(bank.checked_at):
+                return bank
+            try:
+                signature = _file_signature(path)
+                if bank is not None and bank.signature == signature:
+                    bank.checked_at = time.monotonic()
+                    return bank
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                # Keep serving the last good version of the file
+                log_event("question_bank_load_failed", level=logging.ERROR, path=path, error=str(e))
+                self.counters["errors"] += 1
+                if bank is not None:
+                    bank.checked_at = time.monotonic()
+                return bank
+
+            reloaded = bank is not None
+            previous, bank = bank, CompanyBank(name, path, signature, data)
+            if previous is not None:
+                # Interviews that started on the old questions keep being served them
+                for interview_type, version in previous.versions.items():
+                    if bank.versions.get(interview_type) != version:
+                        self.retired[(key, interview_type, version)] = previous.questions[interview_type]
+            self.banks[key] = bank
+            self.counters["reloads" if reloaded else "loads"] += 1
+
+        if reloaded:
+            log_event("question_bank_reloaded", company=name)
+        for listener in self.listeners:
+            listener(name)
+        return bank
+
+    def get_questions(self, company: str, interview_type: str) -> Tuple[BankQuestion, ...]:
+        """
+        Get the questions for a company and interview type.
+
+        Returns:
+            The questions, or an empty tuple if there are none
+        """
+        bank = self.get_company(company)
+        if bank is None:
+            return ()
+        return bank.questions.get(canonical_interview_type(interview_type), ())
+
+    def get_questions_version(self, company: str, interview_type: str, version: str) -> Tuple[BankQuestion, ...]:
+        """
+        Get a specific version of the questions for a company and interview type.
+
+        Args:
+            company: The company name
+            interview_type: The interview type
+            version: The version from CompanyBank.versions, as pinned when the interview started
+
+        Returns:
+            The questions of that version, whether or not the file has changed since
+
+        Raises:
+            QuestionBankChanged: If this process never loaded that version (e.g. it
+                first loaded the company's file after the change)
+        """
+        interview_type = canonical_interview_type(interview_type)
+        bank = self.get_company(company)
+        if bank is not None and bank.versions.get(interview_type) == version:
+            return bank.questions[interview_type]
+        questions = self.retired.get((normalize_name(company), interview_type, version))
+        if questions is None:
+            raise QuestionBankChanged(f"Version {version} of the {company} {interview_type} questions is not available")
+        return questions
+
+    def get_evaluation_prompt(self, company: str, interview_type: str, question: str) -> Optional[str]:
+        """Get the evaluation prompt of a question in the company's bank, if the question is in it."""
+        bank = self.get_company(company)
+        if bank is None:
+            return None
+        return bank.prompts.get((canonical_interview_type(interview_type), question))
+
+    def get_evaluation_config(self, company: str, interview_type: str) -> Optional[Mapping[str, Any]]:
+        """Get the company's evaluation configuration for an interview type, if it defines one."""
+        bank = self.get_company(company)
+        if bank is None:
+            return None
+        return bank.evaluation.get(canonical_interview_type(interview_type))
+
+    def get_model_override(self, company: str, interview_type: str, role: str) -> Optional[str]:
+        """Get the model the company's data file sets for an agent role, for the interview type or in general."""
+        bank = self.get_company(company)
+        if bank is None or not bank.models:
+            return None
+        models = bank.models.get(canonical_interview_type(interview_type)) or {}
+        return models.get(role) or bank.models.get("general", {}).get(role)
+
+    def preload(self) -> int:
+        """Load every company's data file now instead of on first use; returns the number loaded."""
+        return sum(1 for company in self.companies() if self.get_company(company) is not None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load counters and the number of known and loaded companies."""
+        with self.lock:
+            return {
+                **self.counters,
+                "companies": len(self.files),
+                "loaded": len(self.banks),
+                "retired_versions": len(self.retired),
+                "reload_interval": self.reload_interval
+            }
+
+registry = QuestionRegistry(
+    directory=os.environ.get('QUESTION_BANKS_DIR', DEFAULT_BANKS_DIR),
+    reload_interval=float(os.environ.get('QUESTION_BANK_RELOAD_INTERVAL', '5'))
+)
@@ -0,0 +1,367 @@
+"""
+Pluggable storage for interview sessions.
+
+The in-memory store keeps sessions in a dict inside the worker process, which
+only works with a single gunicorn worker. The SQLite store (WAL mode) keeps
+them in a file shared by every worker on the host, so requests for the same
+interview can land on any process.
+
+Session data must be JSON-serializable. Values returned by get() are
+snapshots: all changes go through update(), which applies a callback to the
+latest state atomically.
+
+Abandoned sessions are removed after an idle TTL by a background sweeper, and
+hard caps on the number of sessions and their total size evict the least
+recently used sessions first.
+"""
+
+import os
+import copy
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from event_log import log_event
+
+T = TypeVar("T")
+
+DEFAULT_SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sessions.sqlite3')
+
+class SessionNotFound(KeyError):
+    """Raised when updating a session that does not exist."""
+
+class SessionConflict(Exception):
+    """Raised by update callbacks when the session changed since the request read it."""
+
+class SessionStore:
+    """
+    Interface for session stores.
+    
+    Args:
+        idle_ttl: Seconds without access after which a session expires
+        max_sessions: Maximum number of live sessions
+        max_bytes: Maximum approximate total size of session data (serialized)
+    """
+
+    def __init__(self, idle_ttl: float = 7200, max_sessions: int = 10000, max_bytes: int = 256 * 1024 * 1024):
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.counters = {"expired": 0, "evicted": 0}
+        self.counters_lock = threading.Lock()
+        self.sweeper_pid: Optional[int] = None
+
+    def _count(self, name: str, amount: int) -> None:
+        with self.counters_lock:
+            self.counters[name] += amount
+
+    def start_sweeper(self, interval: float) -> None:
+        """
+        Start a daemon thread that expires idle sessions every `interval` seconds.
+        
+        Safe to call repeatedly; the thread is restarted in forked worker processes.
+        """
+        if self.sweeper_pid == os.getpid() or interval <= 0:
+            return
+        self.sweeper_pid = os.getpid()
+        
+        def sweep_forever():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception as e:
+                    log_event("session_sweep_failed", level=logging.ERROR, exc_info=True, error=str(e))
+        
+        threading.Thread(target=sweep_forever, name="session-sweeper", daemon=True).start()
+
+    def sweep(self) -> int:
+        """Remove expired sessions and enforce the size caps. Returns the number removed."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the live session count, approximate memory use and eviction counters."""
+        raise NotImplementedError
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Store a new session."""
+        raise NotImplementedError
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of a session, or None if it does not exist."""
+        raise NotImplementedError
+
+    def update(self, session_id: str, mutate: Callable[[Dict[str, Any]], T]) -> T:
+        """
+        Atomically apply a change to a session.
+
+        Args:
+            session_id: The session to change
+            mutate: Callback that modifies the session data in place
+
+        Returns:
+            Whatever the callback returns
+
+        Raises:
+            SessionNotFound: If the session does not exist
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        """Remove a session if it exists."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+class InMemorySessionStore(SessionStore):
+    """Sessions in an LRU-ordered dict local to this process (single-worker deployments)."""
+
+    def __init__(self, **limits):
+        super().__init__(**limits)
+        # session ID -> (data, approximate size in bytes, last access time), least recently used first
+        self.sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.RLock()
+
+    def _store(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Insert or replace a session as the most recently used one, then enforce the caps."""
+        size = len(json.dumps(data))
+        previous = self.sessions.pop(session_id, None)
+        if previous is not None:
+            self.total_bytes -= previous[1]
+        self.sessions[session_id] = (data, size, time.time())
+        self.total_bytes += size
+        self._enforce_caps(keep=session_id)
+
+    def _remove(self, session_id: str) -> None:
+        entry = self.sessions.pop(session_id, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def _enforce_caps(self, keep: Optional[str] = None) -> int:
+        """Evict least recently used sessions until both caps hold (never evicting `keep`)."""
+        evicted = 0
+        while len(self.sessions) > self.max_sessions or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self.sessions))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+            evicted += 1
+        if evicted:
+            self._count("evicted", evicted)
+        return evicted
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        with self.lock:
+            self._store(session_id, copy.deepcopy(data))
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                return None
+            data, size, _ = entry
+            self.sessions[session_id] = (data, size, time.time())
+            self.sessions.move_to_end(session_id)
+            return copy.deepcopy(data)
+
+    def update(self, session_id: str, mutate: Callable[[Dict[str, Any]], T]) -> T:
+        with self.lock:
+            entry = self.sessions.get(session_id)
+            if entry is None:
+                raise SessionNotFound(session_id)
+            # Mutate a copy so a failing callback leaves the session untouched
+            updated = copy.deepcopy(entry[0])
+            result = mutate(updated)
+            self._store(session_id, updated)
+            return result
+
+    def delete(self, session_id: str) -> None:
+        with self.lock:
+            self._remove(session_id)
+
+    def sweep(self) -> int:
+        cutoff = time.time() - self.idle_ttl
+        with self.lock:
+            # Sessions are kept in access order, so the expired ones form a prefix
+            expired = []
+            for session_id, (_, _, accessed) in self.sessions.items():
+                if accessed >= cutoff:
+                    break
+                expired.append(session_id)
+            for session_id in expired:
+                self._remove(session_id)
+            evicted = self._enforce_caps()
+        if expired:
+            self._count("expired", len(expired))
+        return len(expired) + evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            live, total_bytes = len(self.sessions), self.total_bytes
+        with self.counters_lock:
+            counters = dict(self.counters)
+        return {
+            "backend": "memory",
+            "sessions": live,
+            "approximate_bytes": total_bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl,
+            **counters
+        }
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+class SQLiteSessionStore(SessionStore):
+    """Sessions in a SQLite database in WAL mode, shared by all worker processes on a host."""
+
+    def __init__(self, path: str, **limits):
+        super().__init__(**limits)
+        self.path = path
+        self.local = threading.local()
+        # Seconds a read may leave the last-access time stale
+        self.touch_interval = min(60.0, self.idle_ttl / 10)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, creating the database on first use."""
+        connection = getattr(self.local, "connection", None)
+        if connection is None or getattr(self.local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        self._connection().execute(
+            "INSERT INTO sessions (id, data, updated_at) VALUES (?, ?, ?)",
+            (session_id, json.dumps(data), time.time())
+        )
+        if len(self) > self.max_sessions:
+            self._count("evicted", self._evict_over_caps())
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        connection = self._connection()
+        row = connection.execute("SELECT data, updated_at FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        if row is None:
+            return None
+        # Reads count as access for the idle TTL and LRU eviction, as in the in-memory store;
+        # the timestamp is refreshed at most once per touch interval to keep reads off the write lock
+        now = time.time()
+        if now - row[1] > self.touch_interval:
+            connection.execute("UPDATE sessions SET updated_at = ? WHERE id = ? AND updated_at < ?", (now, session_id, now))
+        return json.loads(row[0])
+
+    def update(self, session_id: str, mutate: Callable[[Dict[str, Any]], T]) -> T:
+        connection = self._connection()
+        # BEGIN IMMEDIATE takes the write lock up front, serializing updates across processes
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                raise SessionNotFound(session_id)
+            data = json.loads(row[0])
+            result = mutate(data)
+            connection.execute(
+                "UPDATE sessions SET data = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(data), time.time(), session_id)
+            )
+            connection.execute("COMMIT")
+            return result
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def delete(self, session_id: str) -> None:
+        self._connection().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def _evict_over_caps(self) -> int:
+        """Delete the least recently used sessions until both caps hold."""
+        connection = self._connection()
+        evicted = connection.execute(
+            "DELETE FROM sessions WHERE id IN ("
+            "SELECT id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,)
+        ).rowcount
+        total_bytes = connection.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM sessions").fetchone()[0]
+        if total_bytes > self.max_bytes:
+            # Walk from the oldest session until enough bytes are freed
+            excess = total_bytes - self.max_bytes
+            doomed = []
+            for session_id, size in connection.execute("SELECT id, LENGTH(data) FROM sessions ORDER BY updated_at"):
+                if excess <= 0:
+                    break
+                doomed.append((session_id,))
+                excess -= size
+            connection.executemany("DELETE FROM sessions WHERE id = ?", doomed)
+            evicted += len(doomed)
+        return evicted
+
+    def sweep(self) -> int:
+        expired = self._connection().execute(
+            "DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.idle_ttl,)
+        ).rowcount
+        evicted = self._evict_over_caps()
+        self._count("expired", expired)
+        self._count("evicted", evicted)
+        return expired + evicted
+
+    def stats(self) -> Dict[str, Any]:
+        live, total_bytes = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions"
+        ).fetchone()
+        with self.counters_lock:
+            counters = dict(self.counters)
+        return {
+            "backend": "sqlite",
+            "sessions": live,
+            "approximate_bytes": total_bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "idle_ttl_seconds": self.idle_ttl,
+            **counters
+        }
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+def create_session_store() -> SessionStore:
+    """
+    Create the session store selected by the SESSION_STORE environment variable.
+
+    SESSION_STORE=memory (default) keeps sessions in this process.
+    SESSION_STORE=sqlite shares them through the file at SESSION_STORE_PATH.
+    Limits come from SESSION_IDLE_TTL_SECONDS, SESSION_MAX_COUNT and
+    SESSION_MAX_BYTES; SESSION_SWEEP_INTERVAL sets how often idle sessions expire.
+    """
+    limits = {
+        "idle_ttl": float(os.environ.get('SESSION_IDLE_TTL_SECONDS', '7200')),
+        "max_sessions": int(os.environ.get('SESSION_MAX_COUNT', '10000')),
+        "max_bytes": int(os.environ.get('SESSION_MAX_BYTES', str(256 * 1024 * 1024)))
+    }
+    backend = os.environ.get('SESSION_STORE', 'memory').lower()
+    if backend == 'sqlite':
+        store = SQLiteSessionStore(os.environ.get('SESSION_STORE_PATH', DEFAULT_SQLITE_PATH), **limits)
+    else:
+        if backend != 'memory':
+            log_event("unknown_session_store", level=logging.WARNING, backend=backend)
+        store = InMemorySessionStore(**limits)
+    return store
@@ -0,0 +1,114 @@
+"""
+Helpers for streaming agent output to the frontend over Server-Sent Events.
+"""
+
+import json
+from typing import Any, Optional
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Format a single Server-Sent Event.
+
+    Args:
+        event: The event name
+        data: JSON-serializable payload
+
+    Returns:
+        The encoded event, terminated by a blank line
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+class JsonStringFieldExtractor:
+    """
+    Incrementally extracts the value of one string field from streamed JSON.
+
+    Agents with a structured output type stream their answer as raw JSON
+    (e.g. '{"evaluation": "The candidate ...", "follow_up_questions": [...]}').
+    Feeding the text deltas to this extractor returns the newly decoded
+    characters of the chosen field as they arrive, so they can be shown to
+    the candidate before the full object has been parsed.
+    """
+
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    def __init__(self, field: str):
+        self.key = json.dumps(field)
+        self.buffer = ""
+        self.position = 0
+        self.state = "key"  # key -> colon -> value -> done
+        self.pending_escape = ""
+        self.high_surrogate = ""
+
+    def feed(self, chunk: str) -> str:
+        """
+        Consume a chunk of the JSON document.
+
+        Args:
+            chunk: The next text delta from the model
+
+        Returns:
+            Newly decoded characters of the field value (may be empty)
+        """
+        self.buffer += chunk
+        decoded = []
+
+        while self.position < len(self.buffer) and self.state != "done":
+            if self.state == "key":
+                index = self.buffer.find(self.key, self.position)
+                if index < 0:
+                    # Keep enough of the tail to match a key split across chunks
+                    self.position = max(self.position, len(self.buffer) - len(self.key) + 1)
+                    break
+                self.position = index + len(self.key)
+                self.state = "colon"
+            elif self.state == "colon":
+                char = self.buffer[self.position]
+                self.position += 1
+                if char == '"':
+                    self.state = "value"
+                elif char not in ' \t\r\n:':
+                    # The key matched something other than a string field; keep looking
+                    self.state = "key"
+            else:
+                char = self.buffer[self.position]
+                if self.pending_escape:
+                    self.pending_escape += char
+                    self.position += 1
+                    text = self._decode_escape()
+                    if text is not None:
+                        decoded.append(text)
+                elif char == '\\':
+                    self.pending_escape = char
+                    self.position += 1
+                elif char == '"':
+                    self.position += 1
+                    self.state = "done"
+                else:
+                    decoded.append(char)
+                    self.position += 1
+
+        return "".join(decoded)
+
+    def _decode_escape(self) -> Optional[str]:
+        """Decode the pending escape sequence once it is complete."""
+        escape = self.pending_escape
+        if escape[1] == 'u':
+            if len(escape) < 6:
+                return None
+            self.pending_escape = ""
+            char = chr(int(escape[2:6], 16))
+            if '\ud800' <= char <= '\udbff':
+                # Hold the first half of a surrogate pair until the second arrives
+                self.high_surrogate = char
+                return None
+            if self.high_surrogate:
+                char = (self.high_surrogate + char).encode('utf-16', 'surrogatepass').decode('utf-16')
+                self.high_surrogate = ""
+            return char
+        self.pending_escape = ""
+        return self._ESCAPES.get(escape[1], escape[1])
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing quote of the field has been seen."""
+        return self.state == "done"
@@ -0,0 +1,254 @@
+"""
+Per-session token accounting and budgets.
+
+Every agent call made for an interview adds its prompt and completion tokens
+(from the run's usage) to the session. A session with a token budget degrades
+in steps as it uses the budget up, so a long or chatty interview gets cheaper
+before anything is refused:
+
+- trim: past TOKEN_BUDGET_TRIM_AT of the budget, evaluator prompts keep fewer
+  turns verbatim and no speculative feedback drafts are written
+- fallback: past TOKEN_BUDGET_FALLBACK_AT, calls use the role's fallback model
+- exhausted: once the budget is used up, new answers are rejected. Ending the
+  interview is always allowed, so the candidate still gets final feedback.
+
+Background work done for a session (speculative feedback drafts, conversation
+summaries) is counted separately as its background tokens and does not use up
+the budget, so it never degrades the candidate's own evaluations.
+
+The budget is SESSION_TOKEN_BUDGET tokens (0, the default, means unlimited),
+and can be overridden per company and interview type with a "token_budget"
+key in the evaluation configuration, e.g. {"session_tokens": 60000}.
+"""
+
+import os
+import threading
+from enum import IntEnum
+from typing import Any, Dict, Optional, Tuple
+
+from evaluation_configs import get_evaluation_config
+
+SESSION_TOKEN_BUDGET = int(os.environ.get('SESSION_TOKEN_BUDGET', '0'))
+TOKEN_BUDGET_TRIM_AT = float(os.environ.get('TOKEN_BUDGET_TRIM_AT', '0.6'))
+TOKEN_BUDGET_FALLBACK_AT = float(os.environ.get('TOKEN_BUDGET_FALLBACK_AT', '0.8'))
+
+# Default budget settings; "trimmed_recent_turns" is how many history entries
+# evaluator prompts keep verbatim once the session is trimmed
+default_budget_config = {
+    "session_tokens": SESSION_TOKEN_BUDGET,
+    "trimmed_recent_turns": 3
+}
+
+class BudgetLevel(IntEnum):
+    """How far a session is into its token budget, in increasing order of severity."""
+    OK = 0
+    TRIM = 1
+    FALLBACK = 2
+    EXHAUSTED = 3
+
+class TokenBudgetExceeded(Exception):
+    """Raised when a session has used up its token budget."""
+
+    def __init__(self, account: "TokenAccount"):
+        super().__init__("The session has used up its token budget")
+        self.account = account
+
+def get_budget_config(company: str, interview_type: str) -> Dict[str, Any]:
+    """Return the default budget settings merged with any configured overrides."""
+    config = get_evaluation_config(company, interview_type)
+    return {**default_budget_config, **config.get('token_budget', {})}
+
+def new_token_usage() -> Dict[str, int]:
+    """Return empty token counters, in the form stored on sessions."""
+    return {"requests": 0, "input_tokens": 0, "output_tokens": 0}
+
+def add_token_usage(counters: Dict[str, int], usage: Any) -> None:
+    """Add a run's usage (an agents.usage.Usage or token counters) to token counters."""
+    if isinstance(usage, dict):
+        for name, value in usage.items():
+            counters[name] = counters.get(name, 0) + value
+        return
+    counters["requests"] += usage.requests
+    counters["input_tokens"] += usage.input_tokens
+    counters["output_tokens"] += usage.output_tokens
+
+class TokenAccount:
+    """
+    Token use of one session's agent calls, checked against its budget.
+
+    Holds the session's usage when the account was opened plus the usage of the
+    calls made through it since; only the latter is written back to the session
+    (see `usage` and `background_usage`), so concurrent requests of a session
+    never overwrite each other. Background usage is not charged to the budget.
+    """
+
+    def __init__(
+        self,
+        company: str,
+        interview_type: str,
+        session_usage: Optional[Dict[str, int]],
+        budget: int,
+        trimmed_recent_turns: int,
+        session_background_usage: Optional[Dict[str, int]] = None
+    ):
+        self.company = company
+        self.interview_type = interview_type
+        self.previous = dict(session_usage or new_token_usage())
+        self.usage = new_token_usage()
+        self.previous_background = dict(session_background_usage or new_token_usage())
+        self.background_usage = new_token_usage()
+        self.budget = budget
+        self.trimmed_recent_turns = trimmed_recent_turns
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_session(cls, session_data: Dict[str, Any]) -> "TokenAccount":
+        company, interview_type = session_data["company"], session_data["interview_type"]
+        config = get_budget_config(company, interview_type)
+        return cls(
+            company, interview_type, session_data.get("tokens"), config["session_tokens"],
+            config["trimmed_recent_turns"], session_data.get("background_tokens")
+        )
+
+    def add(self, usage: Any, background: bool = False) -> None:
+        with self.lock:
+            add_token_usage(self.background_usage if background else self.usage, usage)
+
+    @property
+    def total_tokens(self) -> int:
+        return (
+            self.previous["input_tokens"] + self.previous["output_tokens"]
+            + self.usage["input_tokens"] + self.usage["output_tokens"]
+        )
+
+    @property
+    def background_tokens(self) -> int:
+        return (
+            self.previous_background["input_tokens"] + self.previous_background["output_tokens"]
+            + self.background_usage["input_tokens"] + self.background_usage["output_tokens"]
+        )
+
+    @property
+    def level(self) -> BudgetLevel:
+        if self.budget <= 0:
+            return BudgetLevel.OK
+        used = self.total_tokens / self.budget
+        if used >= 1:
+            return BudgetLevel.EXHAUSTED
+        if used >= TOKEN_BUDGET_FALLBACK_AT:
+            return BudgetLevel.FALLBACK
+        if used >= TOKEN_BUDGET_TRIM_AT:
+            return BudgetLevel.TRIM
+        return BudgetLevel.OK
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the session's token use and budget, for API responses."""
+        input_tokens = self.previous["input_tokens"] + self.usage["input_tokens"]
+        output_tokens = self.previous["output_tokens"] + self.usage["output_tokens"]
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "background_tokens": self.background_tokens,
+            "budget": self.budget or None,
+            "budget_level": self.level.name.lower()
+        }
+
+class TokenMetrics:
+    """Thread-safe token counters per company, interview type and agent role."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_interview: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _counters(self, company: str, interview_type: str) -> Dict[str, Any]:
+        key = (company, interview_type.lower())
+        if key not in self.by_interview:
+            self.by_interview[key] = {
+                "roles": {},
+                "sessions": 0,
+                "session_tokens": 0,
+                "trimmed": 0,
+                "fallbacks": 0,
+                "rejected": 0
+            }
+        return self.by_interview[key]
+
+    def record_call(self, company: str, interview_type: str, role: str, usage: Any) -> None:
+        """Record the usage of one agent call."""
+        with self.lock:
+            roles = self._counters(company, interview_type)["roles"]
+            add_token_usage(roles.setdefault(role, new_token_usage()), usage)
+
+    def record_session(self, company: str, interview_type: str, total_tokens: int) -> None:
+        """Record the total tokens of a finished interview."""
+        with self.lock:
+            counters = self._counters(company, interview_type)
+            counters["sessions"] += 1
+            counters["session_tokens"] += total_tokens
+
+    def record_budget_action(self, company: str, interview_type: str, level: BudgetLevel) -> None:
+        """Count a call that was trimmed, sent to the fallback model or rejected because of the budget."""
+        name = {BudgetLevel.TRIM: "trimmed", BudgetLevel.FALLBACK: "fallbacks", BudgetLevel.EXHAUSTED: "rejected"}.get(level)
+        if name:
+            with self.lock:
+                self._counters(company, interview_type)[name] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the per-interview breakdown, with tokens per finished session."""
+        with self.lock:
+            breakdown = []
+            for (company, interview_type), counters in sorted(self.by_interview.items()):
+                roles = {role: dict(usage) for role, usage in counters["roles"].items()}
+                total = new_token_usage()
+                for usage in roles.values():
+                    add_token_usage(total, usage)
+                breakdown.append({
+                    "company": company,
+                    "interview_type": interview_type,
+                    **total,
+                    "roles": roles,
+                    "sessions": counters["sessions"],
+                    "tokens_per_session": counters["session_tokens"] / counters["sessions"] if counters["sessions"] else None,
+                    "trimmed": counters["trimmed"],
+                    "fallbacks": counters["fallbacks"],
+                    "rejected": counters["rejected"]
+                })
+        return {"by_interview": breakdown}
+
+token_metrics = TokenMetrics()
+
+def record_usage(
+    usage: Any,
+    role: str,
+    company: str,
+    interview_type: str,
+    account: Optional[TokenAccount] = None,
+    background: bool = False
+) -> None:
+    """
+    Account for the usage of one agent call.
+
+    Args:
+        usage: The run's agents.usage.Usage (result.context_wrapper.usage)
+        role: The agent's role ("evaluator", "feedback" or "summarizer")
+        company: The interview's company
+        interview_type: The interview type
+        account: The session's token account, if the call was made for a session
+        background: The call was background work for the session, which is kept out of its budget
+    """
+    token_metrics.record_call(company, interview_type, role, usage)
+    if account is not None:
+        account.add(usage, background)
+
+def budget_level_for_call(account: Optional[TokenAccount]) -> BudgetLevel:
+    """
+    Return how much an agent call has to economize for its session's budget, counting the adjustment.
+
+    Requests are refused before their calls start, so this is at most BudgetLevel.FALLBACK.
+    """
+    if account is None:
+        return BudgetLevel.OK
+    level = min(account.level, BudgetLevel.FALLBACK)
+    token_metrics.record_budget_action(account.company, account.interview_type, level)
+    return level
@@ -0,0 +1,488 @@
+"""
+Sampled, batched tracing for the request paths.
+
+Spans are recorded in-process and never exported inline: when every span of a
+trace has ended, the trace is put on a bounded queue, and a background thread
+exports the queued traces in batches. If the exporter falls behind and the
+queue is full, traces are dropped and counted instead of blocking requests.
+
+Sampling is decided once per trace, when its root span starts (head-based), so
+a trace is either recorded completely or not at all. Every Flask request is the
+root of a trace (see init_app()); spans opened while it runs, including those of
+background work it schedules on the shared event loop, join its trace. The rate
+is TRACE_SAMPLE_RATE, overridable per route with TRACE_ROUTE_SAMPLE_RATES, e.g.
+"/api/answer=0.1,/api/evaluate/batch=0.01". Agents SDK traces started through
+sdk_trace() follow the same decision.
+
+TRACE_EXPORTER selects where traces go: "agentops" (the default; spans are
+replayed into AgentOps with their recorded timestamps), "log" (one JSON line
+per trace through event_log.py) or "none". AgentOps is initialized by the
+export thread before its first export, so neither importing the app nor
+serving requests waits for it, and the Agents SDK is only imported by
+sdk_trace().
+"""
+
+import os
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+import contextvars
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+from event_log import log_event
+
+if TYPE_CHECKING:
+    from agents.tracing import Trace
+
+TRACE_EXPORTER = os.environ.get('TRACE_EXPORTER', 'agentops').lower()
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '1.0'))
+TRACE_EXPORT_INTERVAL = float(os.environ.get('TRACE_EXPORT_INTERVAL', '5'))
+TRACE_BATCH_SIZE = int(os.environ.get('TRACE_BATCH_SIZE', '64'))
+TRACE_QUEUE_SIZE = int(os.environ.get('TRACE_QUEUE_SIZE', '1000'))
+TRACE_MAX_SPANS = int(os.environ.get('TRACE_MAX_SPANS', '200'))
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "route=rate,route=rate" into a dict of sample rates."""
+    rates = {}
+    for item in spec.split(","):
+        if "=" in item:
+            route, rate = item.rsplit("=", 1)
+            rates[route.strip()] = float(rate)
+    return rates
+
+TRACE_ROUTE_SAMPLE_RATES = parse_sample_rates(os.environ.get('TRACE_ROUTE_SAMPLE_RATES', ''))
+
+def sample_rate(route: str) -> float:
+    """Return the share of traces rooted at a route (or root span name) that are recorded."""
+    return TRACE_ROUTE_SAMPLE_RATES.get(route, TRACE_SAMPLE_RATE)
+
+class _Trace:
+    """The spans of one trace, collected until the last open span ends."""
+    __slots__ = ("trace_id", "route", "spans", "open", "queued")
+
+    def __init__(self, route: str):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.route = route
+        self.spans: List["Span"] = []
+        self.open = 0
+        self.queued = False
+
+class Span:
+    """A recorded span. Attributes should be plain JSON values."""
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start", "started", "duration", "attributes", "error")
+
+    sampled = True
+    recording = True
+
+    def __init__(self, name: str, trace: _Trace, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+class _NoopSpan:
+    """Stands in for the spans of traces that are not recorded."""
+    __slots__ = ("sampled",)
+
+    recording = False
+
+    def __init__(self, sampled: bool):
+        # Sampled but not recorded when no exporter is configured; SDK traces still run then
+        self.sampled = sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, error: BaseException) -> None:
+        pass
+
+_UNSAMPLED = _NoopSpan(False)
+_UNRECORDED = _NoopSpan(True)
+
+AnySpan = Union[Span, _NoopSpan]
+
+_current: contextvars.ContextVar[Optional[AnySpan]] = contextvars.ContextVar("current_span", default=None)
+
+def current_span() -> Optional[AnySpan]:
+    """Return the innermost open span of this thread or task, if any."""
+    return _current.get()
+
+class LogExporter:
+    """Writes each trace as one "trace" event through the event log."""
+    name = "log"
+
+    def export(self, traces: List[_Trace]) -> None:
+        for finished in traces:
+            log_event(
+                "trace", trace_id=finished.trace_id, trace_route=finished.route,
+                spans=[span.to_dict() for span in finished.spans]
+            )
+
+class AgentOpsExporter:
+    """
+    Replays traces into AgentOps' OpenTelemetry tracer, keeping the recorded timestamps.
+
+    AgentOps is imported and initialized by the first export, on the export thread of
+    the worker, since agentops.init() may reach the network and its own threads do not
+    survive a fork.
+    """
+    name = "agentops"
+
+    def __init__(self):
+        self.tracer = None
+        self.error: Optional[str] = None
+
+    def setup(self) -> None:
+        try:
+            import agentops
+            from agentops.semconv import SpanAttributes, SpanKind
+            from opentelemetry import context, trace as otel_trace
+            from opentelemetry.trace import Status, StatusCode
+            agentops.init()
+            self.tracer = agentops.tracer.get_tracer()
+            log_event("agentops_initialized")
+        except Exception as e:
+            self.error = f"AgentOps initialization failed: {e}"
+            log_event("agentops_init_failed", level=logging.ERROR, error=str(e))
+            return
+        self.SpanAttributes, self.SpanKind = SpanAttributes, SpanKind
+        self.context, self.otel_trace = context, otel_trace
+        self.Status, self.StatusCode = Status, StatusCode
+        # Registered after agentops.init(), so queued traces are exported before AgentOps shuts down
+        atexit.register(shutdown)
+
+    @staticmethod
+    def _attribute(value: Any) -> Any:
+        return value if isinstance(value, (str, bool, int, float)) else str(value)
+
+    def export(self, traces: List[_Trace]) -> None:
+        if self.tracer is None and self.error is None:
+            self.setup()
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        for finished in traces:
+            # Parents start before their children, so their contexts exist when children are created
+            contexts = {}
+            for span in sorted(finished.spans, key=lambda span: span.started):
+                kind = self.SpanKind.WORKFLOW if span.parent_id is None else self.SpanKind.TASK
+                attributes = {key: self._attribute(value) for key, value in span.attributes.items() if value is not None}
+                attributes.update({
+                    self.SpanAttributes.AGENTOPS_SPAN_KIND: kind,
+                    self.SpanAttributes.OPERATION_NAME: span.name,
+                    "trace.route": finished.route
+                })
+                otel_span = self.tracer.start_span(
+                    f"{span.name}.{kind}",
+                    context=contexts.get(span.parent_id, self.context.Context()),
+                    attributes=attributes,
+                    start_time=int(span.start * 1e9)
+                )
+                if span.error:
+                    otel_span.set_status(self.Status(self.StatusCode.ERROR, span.error))
+                otel_span.end(end_time=int((span.start + span.duration) * 1e9))
+                contexts[span.span_id] = self.otel_trace.set_span_in_context(otel_span)
+
+class BatchSpanProcessor:
+    """Queues finished traces and exports them in batches from a background thread."""
+
+    def __init__(self, exporter: Any):
+        self.exporter = exporter
+        self.lock = threading.Lock()
+        self.queue: Optional[queue.Queue] = None
+        self.thread: Optional[threading.Thread] = None
+        self.owner_pid: Optional[int] = None
+        self.counters = {
+            "traces_started": 0,
+            "traces_sampled": 0,
+            "traces_exported": 0,
+            "traces_dropped": 0,
+            "spans_recorded": 0,
+            "spans_dropped": 0,
+            "batches": 0,
+            "export_errors": 0,
+            "export_seconds": 0.0
+        }
+
+    def _ensure_started(self) -> None:
+        """Start the export thread for this process (again, in forked workers)."""
+        if self.owner_pid == os.getpid():
+            return
+        with self.lock:
+            if self.owner_pid == os.getpid():
+                return
+            self.queue = queue.Queue(TRACE_QUEUE_SIZE)
+            self.thread = threading.Thread(target=self._run, args=(self.queue,), name="trace-exporter", daemon=True)
+            self.thread.start()
+            self.owner_pid = os.getpid()
+
+    def _run(self, traces: queue.Queue) -> None:
+        while True:
+            first = traces.get()
+            if first is None:
+                return
+            # Collect a batch: up to TRACE_BATCH_SIZE traces or TRACE_EXPORT_INTERVAL after the first
+            batch = [first]
+            deadline = time.monotonic() + TRACE_EXPORT_INTERVAL
+            stop = False
+            while len(batch) < TRACE_BATCH_SIZE:
+                try:
+                    item = traces.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._export(batch)
+            if stop:
+                return
+
+    def _export(self, batch: List[_Trace]) -> None:
+        started = time.perf_counter()
+        try:
+            self.exporter.export(batch)
+            exported, errors = len(batch), 0
+        except Exception as e:
+            log_event("trace_export_failed", level=logging.WARNING, error=str(e))
+            exported, errors = 0, 1
+        with self.lock:
+            self.counters["batches"] += 1
+            self.counters["traces_exported"] += exported
+            self.counters["export_errors"] += errors
+            self.counters["export_seconds"] += time.perf_counter() - started
+
+    def count_trace(self, sampled: bool) -> None:
+        with self.lock:
+            self.counters["traces_started"] += 1
+            if sampled:
+                self.counters["traces_sampled"] += 1
+
+    def start_span(self, name: str, parent: Optional[Span], route: str, attributes: Dict[str, Any]) -> Span:
+        """Open a span in the parent's trace, or in a new trace if there is no parent."""
+        with self.lock:
+            if parent is not None and parent.trace.queued:
+                # Background work outliving its request: the request's trace is already queued,
+                # so the span starts a trace of its own, linked to the request's
+                attributes["parent_trace_id"] = parent.trace.trace_id
+                route, parent = parent.trace.route, None
+                self.counters["traces_started"] += 1
+                self.counters["traces_sampled"] += 1
+            trace_ = parent.trace if parent is not None else _Trace(route)
+            trace_.open += 1
+        return Span(name, trace_, parent.span_id if parent is not None else None, attributes)
+
+    def end_span(self, span: Span) -> None:
+        """Close a span, and queue its trace for export once no span of the trace is open."""
+        span.duration = time.perf_counter() - span.started
+        trace_ = span.trace
+        with self.lock:
+            if len(trace_.spans) < TRACE_MAX_SPANS:
+                trace_.spans.append(span)
+                self.counters["spans_recorded"] += 1
+            else:
+                self.counters["spans_dropped"] += 1
+            trace_.open -= 1
+            if trace_.open:
+                return
+            trace_.queued = True
+        self._ensure_started()
+        try:
+            self.queue.put_nowait(trace_)
+        except queue.Full:
+            with self.lock:
+                self.counters["traces_dropped"] += 1
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export the queued traces and stop the export thread (called at exit)."""
+        if self.owner_pid != os.getpid():
+            return
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            counters = dict(self.counters)
+        counters["queue_depth"] = self.queue.qsize() if self.queue is not None and self.owner_pid == os.getpid() else 0
+        return counters
+
+# Set by configure(); spans are not recorded without one
+_processor: Optional[BatchSpanProcessor] = None
+_configured = False
+
+def configure() -> Optional[str]:
+    """
+    Set up the exporter selected by TRACE_EXPORTER (once per process; later calls keep it).
+
+    Returns:
+        The name of the exporter in use, or None if traces are not exported
+    """
+    global _processor, _configured
+    if not _configured:
+        exporter = None
+        if TRACE_EXPORTER == "agentops":
+            exporter = AgentOpsExporter()
+        elif TRACE_EXPORTER == "log":
+            exporter = LogExporter()
+        _processor = BatchSpanProcessor(exporter) if exporter is not None else None
+        _configured = True
+        if _processor is not None:
+            atexit.register(shutdown)
+    return _processor.exporter.name if _processor is not None else None
+
+def shutdown() -> None:
+    """Export the queued traces and stop the export thread (registered to run at exit)."""
+    if _processor is not None:
+        _processor.shutdown()
+
+def _open(name: str, route: Optional[str], attributes: Dict[str, Any]) -> AnySpan:
+    parent = _current.get()
+    if parent is not None:
+        if not parent.recording:
+            return parent
+        return _processor.start_span(name, parent, parent.trace.route, attributes)
+
+    route = route or name
+    sampled = random.random() < sample_rate(route)
+    if _processor is None:
+        return _UNRECORDED if sampled else _UNSAMPLED
+    _processor.count_trace(sampled)
+    if not sampled:
+        return _UNSAMPLED
+    return _processor.start_span(name, None, route, attributes)
+
+def _close(span: AnySpan, error: Optional[BaseException]) -> None:
+    if span.recording:
+        if error is not None:
+            span.set_error(error)
+        _processor.end_span(span)
+
+class SpanScope:
+    """Context manager that opens a span, makes it current and closes it on exit (see span())."""
+    __slots__ = ("name", "route", "attributes", "span", "token")
+
+    def __init__(self, name: str, route: Optional[str] = None, **attributes: Any):
+        self.name = name
+        self.route = route
+        self.attributes = attributes
+        self.span: Optional[AnySpan] = None
+        self.token = None
+
+    def __enter__(self) -> AnySpan:
+        self.span = _open(self.name, self.route, self.attributes)
+        if self.span is not _current.get():
+            self.token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if self.token is not None:
+            try:
+                _current.reset(self.token)
+            except ValueError:
+                # Exited from another context, e.g. an abandoned generator closed elsewhere
+                pass
+        _close(self.span, exc_val)
+
+def span(name: str, route: Optional[str] = None, **attributes: Any) -> SpanScope:
+    """
+    Record a span, as a child of the current span or as the root of a new trace.
+
+        with tracing.span("evaluate_answer", company=company) as current:
+            current.set_attribute("cache_hit", True)
+
+    Args:
+        name: Span name
+        route: Sampling key if the span starts a trace (defaults to the name)
+        **attributes: Initial span attributes
+
+    Returns:
+        A context manager yielding the span
+    """
+    return SpanScope(name, route, **attributes)
+
+def sdk_trace(workflow_name: str) -> "Trace":
+    """
+    Start an Agents SDK trace that is disabled unless the current trace is sampled.
+
+    The SDK trace ID is recorded on the current span, linking the two.
+    """
+    from agents import trace, gen_trace_id
+
+    current = _current.get()
+    sampled = current.sampled if current is not None else random.random() < sample_rate(workflow_name)
+    if not sampled:
+        return trace(workflow_name, disabled=True)
+    trace_id = gen_trace_id()
+    if current is not None:
+        current.set_attribute("sdk_trace_id", trace_id)
+    return trace(workflow_name, trace_id=trace_id)
+
+def init_app(app: Any) -> None:
+    """Make every request of a Flask app the root span of a trace, sampled by route."""
+    from flask import g, request
+
+    def end_request_span(current: AnySpan, error: Optional[BaseException]) -> None:
+        _current.set(None)
+        _close(current, error)
+
+    @app.before_request
+    def start_request_span():
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        # Requests run one at a time per thread, so the span is made current without a
+        # reset token, and cleared when the request ends
+        g.trace_span = _open(f"{request.method} {route}", route, {"http.method": request.method})
+        _current.set(g.trace_span)
+
+    @app.after_request
+    def record_status(response):
+        current = g.get("trace_span")
+        if current is not None:
+            current.set_attribute("http.status_code", response.status_code)
+            if response.is_streamed:
+                # A streamed body is produced after teardown, in the same thread, so the
+                # span stays current until the response is closed
+                g.trace_span = None
+                response.call_on_close(lambda: end_request_span(current, None))
+        return response
+
+    @app.teardown_request
+    def end_request(error):
+        current = g.pop("trace_span", None)
+        if current is not None:
+            end_request_span(current, error)
+
+def stats() -> Dict[str, Any]:
+    """Return the exporter, sample rates and span and export counters for this worker."""
+    return {
+        "exporter": _processor.exporter.name if _processor is not None else None,
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "route_sample_rates": TRACE_ROUTE_SAMPLE_RATES,
+        **(_processor.stats() if _processor is not None else {})
+    }
@@ -0,0 +1,225 @@
+"""
+Compact conversation transcripts for interview sessions.
+
+A session's history is stored as two parallel arrays instead of one dict per
+turn: a string with one role code per turn and a list of turn texts. This keeps
+sessions small in memory and in serialized stores, and the transcript is
+append-only, so turn positions never shift.
+
+Prompts are built from an index kept beside the turns: the transcript already
+formatted for prompts ("Interviewer: ...\n\nCandidate: ...\n\n"), the offset of
+each turn in that text and each turn's estimated token count. Building a prompt
+from any range of turns is then a single string slice and its token count a
+sum, instead of re-formatting and re-counting the whole history on every
+answer. The index is not part of the stored session: views created with a key
+(the session ID) share a per-process LRU cache of indexes
+(TRANSCRIPT_INDEX_CACHE_SIZE sessions), which only formats the turns added or
+replaced since it was last used. Views without a key index themselves on first
+use.
+"""
+
+import os
+import threading
+from enum import Enum
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Sessions whose prompt index is kept in this process
+TRANSCRIPT_INDEX_CACHE_SIZE = int(os.environ.get('TRANSCRIPT_INDEX_CACHE_SIZE', '1000'))
+
+class Role(str, Enum):
+    """Role code of a transcript turn."""
+    INTERVIEWER = "I"
+    CANDIDATE = "C"
+    # A deferred evaluation that has not completed; the text holds the question number
+    PENDING = "P"
+    # A deferred evaluation that failed; kept so later positions do not shift
+    DROPPED = "D"
+
+# Prompt prefix of each role's turns; pending and dropped evaluations are left out of prompts
+TURN_PREFIXES = {Role.INTERVIEWER: "Interviewer: ", Role.CANDIDATE: "Candidate: "}
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a text (roughly 4 characters per token in English)."""
+    return (len(text) + 3) // 4
+
+def format_turn(role: Role, text: str) -> str:
+    """Format one turn as it appears in prompts (empty for turns left out of prompts)."""
+    prefix = TURN_PREFIXES.get(role)
+    return f"{prefix}{text}\n\n" if prefix else ""
+
+def new_transcript() -> Dict[str, Any]:
+    """Return the JSON-serializable storage for an empty transcript."""
+    return {"roles": "", "texts": []}
+
+class TranscriptIndex:
+    """
+    The prompt formatting of a transcript's turns, for the role codes in `roles`.
+
+    Never changed once built, so views of the same session in different threads can share it.
+    """
+
+    __slots__ = ("roles", "formatted", "offsets", "tokens")
+
+    def __init__(self, roles: str = "", formatted: str = "", offsets: Optional[List[int]] = None, tokens: Optional[List[int]] = None):
+        self.roles = roles
+        self.formatted = formatted
+        self.offsets = offsets if offsets is not None else [0]
+        self.tokens = tokens if tokens is not None else []
+
+    def synced(self, roles: str, texts: List[str]) -> "TranscriptIndex":
+        """
+        Return the index for the given turns, reusing the prefix of turns this index already covers.
+
+        Turns are only appended or, when a deferred evaluation completes, replaced along
+        with their role, so turns whose role code is unchanged are taken to be unchanged.
+        """
+        if roles == self.roles:
+            return self
+        if roles.startswith(self.roles):
+            kept = len(self.roles)
+        else:
+            kept = 0
+            for kept, (old, new) in enumerate(zip(self.roles, roles)):
+                if old != new:
+                    break
+            else:
+                kept = min(len(self.roles), len(roles))
+        lines = [format_turn(Role(code), text) for code, text in zip(roles[kept:], texts[kept:])]
+        offsets = self.offsets[:kept + 1]
+        for line in lines:
+            offsets.append(offsets[-1] + len(line))
+        return TranscriptIndex(
+            roles,
+            self.formatted[:self.offsets[kept]] + "".join(lines),
+            offsets,
+            self.tokens[:kept] + [estimate_tokens(line) for line in lines]
+        )
+
+    def sliced(self, start: int, stop: int) -> "TranscriptIndex":
+        base = self.offsets[start]
+        return TranscriptIndex(
+            self.roles[start:stop],
+            self.formatted[base:self.offsets[stop]],
+            [offset - base for offset in self.offsets[start:stop + 1]],
+            self.tokens[start:stop]
+        )
+
+_index_cache: "OrderedDict[str, TranscriptIndex]" = OrderedDict()
+_index_cache_lock = threading.Lock()
+
+def _cached_index(key: str) -> Optional[TranscriptIndex]:
+    with _index_cache_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+        return index
+
+def _cache_index(key: str, index: TranscriptIndex) -> None:
+    with _index_cache_lock:
+        _index_cache[key] = index
+        _index_cache.move_to_end(key)
+        while len(_index_cache) > TRANSCRIPT_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+
+class Transcript:
+    """
+    View over a transcript's storage ({"roles": str, "texts": list}).
+
+    Appending through the view updates the underlying storage, so a view over
+    session data can be used inside SessionStore.update() callbacks. Pass the
+    session ID as `key` to share this process's prompt index of the session.
+    """
+
+    __slots__ = ("data", "key", "index")
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, key: Optional[str] = None, index: Optional[TranscriptIndex] = None):
+        self.data = data if data is not None else new_transcript()
+        self.key = key
+        self.index = index
+
+    @property
+    def roles(self) -> str:
+        return self.data["roles"]
+
+    @property
+    def texts(self) -> List[str]:
+        return self.data["texts"]
+
+    def __len__(self) -> int:
+        return len(self.data["roles"])
+
+    def __iter__(self) -> Iterator[Tuple[Role, str]]:
+        for code, text in zip(self.data["roles"], self.data["texts"]):
+            yield Role(code), text
+
+    def __getitem__(self, index: slice) -> "Transcript":
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("Transcript only supports contiguous slicing")
+        data = self.data
+        start, stop, _ = index.indices(len(self))
+        stop = max(start, stop)
+        sliced = {"roles": data["roles"][start:stop], "texts": data["texts"][start:stop]}
+        # Slices are prompt material, so they take the matching part of an available index along
+        if self.index is None and self.key is None:
+            return Transcript(sliced)
+        return Transcript(sliced, index=self._indexed().sliced(start, stop))
+
+    def _indexed(self) -> TranscriptIndex:
+        """Return the prompt index, bringing it up to date with the turns (and caching it under the key)."""
+        index = self.index
+        if index is None and self.key is not None:
+            index = _cached_index(self.key)
+        if index is None:
+            index = TranscriptIndex()
+        synced = index.synced(self.data["roles"], self.data["texts"])
+        if self.key is not None and synced is not index:
+            _cache_index(self.key, synced)
+        self.index = synced
+        return synced
+
+    def append(self, role: Role, text: str) -> int:
+        """Append a turn and return its position."""
+        self.data["roles"] += role.value
+        self.data["texts"].append(text)
+        return len(self) - 1
+
+    def text(self, position: int) -> str:
+        return self.data["texts"][position]
+
+    def role(self, position: int) -> Role:
+        return Role(self.data["roles"][position])
+
+    def finished_length(self) -> int:
+        """Length of the prefix that contains no pending (deferred) evaluations."""
+        position = self.data["roles"].find(Role.PENDING.value)
+        return len(self) if position < 0 else position
+
+    def find_pending(self, question_number: int) -> Optional[int]:
+        """Return the position of the pending evaluation for a question, if any."""
+        roles, texts = self.data["roles"], self.data["texts"]
+        marker = str(question_number)
+        position = roles.find(Role.PENDING.value)
+        while position >= 0:
+            if texts[position] == marker:
+                return position
+            position = roles.find(Role.PENDING.value, position + 1)
+        return None
+
+    def replace(self, position: int, role: Role, text: str) -> None:
+        """Overwrite a turn in place (used to resolve pending evaluations)."""
+        roles = self.data["roles"]
+        self.data["roles"] = roles[:position] + role.value + roles[position + 1:]
+        self.data["texts"][position] = text
+
+    def formatted_text(self) -> str:
+        """Return the turns formatted for a prompt."""
+        return self._indexed().formatted
+
+    def token_count(self) -> int:
+        """Return the estimated token count of formatted_text()."""
+        return sum(self._indexed().tokens)
+
+    def candidate_answers(self) -> List[str]:
+        """Return the texts of all candidate turns."""
+        return [text for role, text in self if role is Role.CANDIDATE]